@@ -0,0 +1,15 @@
+"""
+Performance analytics for backtest results and trade journals.
+"""
+
+from .performance import (
+    load_journal,
+    equity_curve,
+    max_drawdown,
+    summarize,
+    breakdown,
+    StreamingPerformance,
+    analyze_journal
+)
+from .robustness import run_monte_carlo, generate_paths, path_statistics
+from .downsample import aggregate_ohlc, lttb, minmax_reduce, SeriesPyramid
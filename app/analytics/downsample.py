@@ -0,0 +1,197 @@
+# downsample.py - 차트용 서버 측 다운샘플링 (캔들 OHLC 집계 / 선 그래프 LTTB / 해상도 피라미드)
+#
+# 긴 구간 차트를 그대로 보내면 수십만 점이 브라우저로 가므로, 요청한 점 수 이하로 줄여서 보냅니다.
+#   - 캔들: 연속된 캔들을 묶어 시가=첫 시가, 고가=최고, 저가=최저, 종가=마지막 종가, 거래량=합계
+#   - 선 (자산 곡선 등): LTTB (Largest-Triangle-Three-Buckets) - 모양을 결정하는 꼭짓점을 우선 보존
+# SeriesPyramid 는 원본을 factor 배씩 줄인 단계들을 미리 만들어 두고, 요청 구간에 맞는 가장 거친 단계에서
+# 최종 축소만 수행하므로 축소 화면(전체 구간) 요청도 원본 크기와 무관하게 target * factor 점만 처리합니다.
+# 선 피라미드의 중간 단계는 구간별 최저/최고점만 남기는 벡터 연산으로 만듭니다 (LTTB 는 구간 수만큼
+# 파이썬 반복이라 원본 전체에 단계마다 돌리기엔 느림 - 최종 축소에만 사용).
+
+from collections import OrderedDict
+
+import numpy as np
+
+# 피라미드 단계 간 축소 배율 / 이 점 수 이하가 되면 단계 생성 중단
+PYRAMID_FACTOR = 4
+PYRAMID_MIN_POINTS = 256
+
+# 피라미드별로 보관할 구간 응답 수
+RANGE_CACHE_SIZE = 128
+
+
+def aggregate_ohlc(candles, target):
+    """
+    캔들 OHLC 집계
+
+    Args:
+        candles: (n, 6) 배열 [t, o, h, l, c, v] (시간순)
+        target: 최대 캔들 수
+
+    Returns:
+        ndarray: (<= target, 6) 배열 - t 는 각 묶음의 첫 캔들 시각
+    """
+    candles = np.asarray(candles, dtype=float)
+    n = len(candles)
+    if n <= target:
+        return candles
+
+    size = -(-n // target)
+    starts = np.arange(0, n, size)
+    ends = np.append(starts[1:], n) - 1
+    return np.column_stack([
+        candles[starts, 0],
+        candles[starts, 1],
+        np.maximum.reduceat(candles[:, 2], starts),
+        np.minimum.reduceat(candles[:, 3], starts),
+        candles[ends, 4],
+        np.add.reduceat(candles[:, 5], starts)
+    ])
+
+
+def lttb_indices(x, y, target):
+    """
+    LTTB 로 남길 점의 인덱스 (첫 점과 마지막 점은 항상 포함)
+
+    각 구간에서 (이전에 고른 점, 다음 구간 평균점) 과 만드는 삼각형 넓이가 가장 큰 점을 고릅니다.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if target >= n or target < 3:
+        return np.arange(n)
+
+    # 첫/마지막 점을 제외한 구간 경계 (target - 2 개 구간)
+    edges = np.linspace(1, n - 1, target - 1).astype(np.int64)
+    index = np.empty(target, dtype=np.int64)
+    index[0] = 0
+    index[-1] = n - 1
+
+    a = 0
+    for i in range(target - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        index[i + 1] = a
+
+    return index
+
+
+def minmax_reduce(points, target, y_column=1):
+    """
+    구간별 최저/최고점만 남겨 약 target 점으로 축소 (시간순 유지, 극값과 첫/마지막 점 보존)
+
+    Args:
+        points: (n, k) 배열 - 0열은 시각, y_column 열 기준
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n <= target:
+        return points
+
+    size = -(-n // max(target // 2, 1))
+    buckets = -(-n // size)
+    # 마지막 구간은 마지막 값으로 채워 (buckets, size) 모양으로 만듦
+    y = np.empty(buckets * size)
+    y[:n] = points[:, y_column]
+    y[n:] = points[-1, y_column]
+    y = y.reshape(buckets, size)
+
+    offsets = np.arange(buckets) * size
+    lo = np.minimum(offsets + np.minimum(y.argmin(axis=1), y.argmax(axis=1)), n - 1)
+    hi = np.minimum(offsets + np.maximum(y.argmin(axis=1), y.argmax(axis=1)), n - 1)
+    index = np.column_stack([lo, hi]).ravel()
+    # 최저/최고가 같은 점이면 한 번만
+    keep = np.ones(len(index), dtype=bool)
+    keep[1::2] = hi != lo
+    index = index[keep]
+    # 첫/마지막 점은 극값이 아니어도 항상 포함 (거친 단계에서도 실제 시작/최종 값을 반환)
+    if index[0] != 0:
+        index = np.concatenate([[0], index])
+    if index[-1] != n - 1:
+        index = np.concatenate([index, [n - 1]])
+    return points[index]
+
+
+def lttb(points, target, y_column=1):
+    """
+    LTTB 다운샘플링
+
+    Args:
+        points: (n, k) 배열 - 0열은 x(시각), y_column 열로 모양을 판단 (나머지 열은 같은 행을 따라감)
+        target: 최대 점 수
+    """
+    points = np.asarray(points, dtype=float)
+    return points[lttb_indices(points[:, 0], points[:, y_column], target)]
+
+
+class SeriesPyramid:
+    """
+    다운샘플링 피라미드 (단계 0 = 원본, 단계 k = 원본을 factor^k 배 축소)
+
+    query(start, end, target) 결과는 구간별로 캐시하며, 원본이 바뀌면 새 피라미드를 만들어야 합니다.
+    """
+
+    def __init__(self, points, kind="line", factor=PYRAMID_FACTOR, min_points=PYRAMID_MIN_POINTS,
+                 cache_size=RANGE_CACHE_SIZE):
+        """
+        Args:
+            points: (n, k) 배열 (0열 = 시각, 시간순) - kind="ohlc" 면 [t, o, h, l, c, v]
+            kind: "ohlc" (캔들 집계) 또는 "line" (LTTB, 1열 기준)
+        """
+        if kind not in ("ohlc", "line"):
+            raise ValueError(f"지원하지 않는 다운샘플링 방식: {kind}")
+        self.kind = kind
+        self.factor = factor
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+        level = np.asarray(points, dtype=float)
+        self.levels = [level]
+        while len(level) > min_points:
+            if kind == "ohlc":
+                level = aggregate_ohlc(level, len(level) // factor)
+            else:
+                level = minmax_reduce(level, len(level) // factor)
+            self.levels.append(level)
+
+    def __len__(self):
+        return len(self.levels[0])
+
+    def query(self, start=None, end=None, target=1000):
+        """
+        [start, end] 구간 (0열 기준, None 이면 끝까지) 을 target 점 이하로 축소
+
+        Returns:
+            (ndarray, level): 결과 배열과 사용한 피라미드 단계
+        """
+        key = (start, end, target)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        # 구간 안의 점이 target * factor 이하인 가장 세밀한 단계에서 최종 축소
+        for level, points in enumerate(self.levels):
+            times = points[:, 0]
+            lo = 0 if start is None else np.searchsorted(times, start, side="left")
+            hi = len(points) if end is None else np.searchsorted(times, end, side="right")
+            if hi - lo <= target * self.factor or level == len(self.levels) - 1:
+                break
+
+        if self.kind == "ohlc":
+            reduced = aggregate_ohlc(points[lo:hi], target)
+        else:
+            reduced = lttb(points[lo:hi], target)
+        result = (reduced, level)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
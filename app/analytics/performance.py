@@ -0,0 +1,284 @@
+# performance.py - 거래/포지션 저널 성과 분석 (벡터화 + 청크 스트리밍)
+#
+# phase1.3_*_trades.csv / phase1.3_*_positions.csv, BacktestEngine 결과, 라이브 저널을
+# 같은 방식으로 읽어 배열로 만든 뒤 지표를 계산합니다.
+
+import numpy as np
+import pandas as pd
+
+# 분류별 성과를 계산할 컬럼 (저널에 있는 컬럼만 사용)
+BREAKDOWN_COLUMNS = ['vol_regime', 'regime', 'quality_bucket', 'reason']
+
+# 품질 점수 구간 크기 (60-65, 65-70, ...)
+QUALITY_BUCKET_SIZE = 5
+
+# 지표 계산에 필요한 컬럼만 읽어 메모리 사용량을 줄임
+_USECOLS = {
+    'net_ret_1x', 'portion', 'net_pos_1x', 'entry_time', 'exit_time',
+    'vol_regime', 'regime', 'quality', 'reason'
+}
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+def _journal_arrays(df):
+    """
+    저널 DataFrame 을 배열 dict 로 변환
+    
+    trades 저널은 portion * net_ret_1x 를, positions 저널은 net_pos_1x 를 거래별 수익률로 사용합니다.
+    """
+    if 'net_pos_1x' in df.columns:
+        returns = df['net_pos_1x'].to_numpy(dtype=float)
+    elif 'net_ret_1x' in df.columns:
+        portion = df['portion'].to_numpy(dtype=float) if 'portion' in df.columns else 1.0
+        returns = df['net_ret_1x'].to_numpy(dtype=float) * portion
+    else:
+        raise ValueError("저널에 net_pos_1x 또는 net_ret_1x 컬럼이 없습니다")
+    
+    arrays = {'returns': np.nan_to_num(returns)}
+    
+    time_col = 'exit_time' if 'exit_time' in df.columns else 'entry_time'
+    if time_col in df.columns:
+        times = pd.to_datetime(df[time_col], utc=True)
+        arrays['time'] = times.to_numpy(dtype='datetime64[ns]').astype('int64')
+    
+    for col in ('vol_regime', 'regime', 'reason'):
+        if col in df.columns:
+            arrays[col] = df[col].fillna('UNKNOWN').astype(str).to_numpy()
+    
+    if 'quality' in df.columns:
+        quality = df['quality'].to_numpy(dtype=float)
+        lower = (np.floor(quality / QUALITY_BUCKET_SIZE) * QUALITY_BUCKET_SIZE).astype(int)
+        arrays['quality_bucket'] = np.char.add(
+            np.char.add(lower.astype(str), '-'), (lower + QUALITY_BUCKET_SIZE).astype(str)
+        )
+    
+    return arrays
+
+
+def load_journal(source):
+    """
+    저널을 배열로 로드
+    
+    Args:
+        source: CSV 경로 또는 DataFrame (trades/positions 스키마)
+        
+    Returns:
+        dict: 'returns' 와 (있으면) 'time', 'vol_regime', 'regime', 'quality_bucket', 'reason' 배열
+    """
+    if isinstance(source, pd.DataFrame):
+        df = source
+    else:
+        df = pd.read_csv(source, usecols=lambda c: c in _USECOLS)
+    return _journal_arrays(df)
+
+
+def equity_curve(returns, initial=1.0):
+    """복리 자산 곡선"""
+    return initial * np.cumprod(1.0 + np.asarray(returns, dtype=float))
+
+
+def max_drawdown(equity, initial=1.0):
+    """
+    최대 낙폭 (음수 비율, 예: -0.12 = -12%)
+    
+    Args:
+        equity: 첫 거래 이후의 자산 곡선 (equity_curve 결과)
+        initial: 첫 거래 전 자산 - 첫 고점으로 사용 (equity_curve 와 같은 값을 넘길 것)
+    """
+    equity = np.asarray(equity, dtype=float)
+    if equity.size == 0:
+        return 0.0
+    peaks = np.maximum.accumulate(np.maximum(equity, initial))
+    return float(np.min(equity / peaks - 1.0))
+
+
+def _ratios(count, total, total_sq, downside_sq, periods_per_year):
+    """합계 통계로부터 Sharpe/Sortino 계산 (거래 단위, 연환산 가능 시 연환산)"""
+    if count < 2:
+        return 0.0, 0.0
+    
+    mean = total / count
+    variance = max(total_sq / count - mean * mean, 0.0) * count / (count - 1)
+    std = np.sqrt(variance)
+    downside = np.sqrt(downside_sq / count)
+    scale = np.sqrt(periods_per_year) if periods_per_year else 1.0
+    
+    sharpe = mean / std * scale if std > 0 else 0.0
+    sortino = mean / downside * scale if downside > 0 else 0.0
+    return float(sharpe), float(sortino)
+
+
+def _periods_per_year(count, first_time, last_time):
+    """관측 기간 동안의 연간 거래 횟수 (시간 정보 없으면 None)"""
+    if first_time is None or last_time is None or last_time <= first_time:
+        return None
+    years = (last_time - first_time) / 1e9 / SECONDS_PER_YEAR
+    return count / years if years > 0 else None
+
+
+def _summary(count, total, total_sq, downside_sq, wins, gross_profit, gross_loss,
+             periods_per_year=None):
+    sharpe, sortino = _ratios(count, total, total_sq, downside_sq, periods_per_year)
+    return {
+        'trades': int(count),
+        'total_return': float(total),
+        'win_rate': float(wins / count) if count else 0.0,
+        'expectancy': float(total / count) if count else 0.0,
+        'avg_win': float(gross_profit / wins) if wins else 0.0,
+        'avg_loss': float(gross_loss / (count - wins)) if count - wins else 0.0,
+        'profit_factor': float(gross_profit / -gross_loss) if gross_loss < 0 else float('inf') if gross_profit > 0 else 0.0,
+        'sharpe': sharpe,
+        'sortino': sortino
+    }
+
+
+def summarize(returns, times=None):
+    """
+    수익률 배열의 전체 성과 지표
+    
+    Args:
+        returns: 거래별 수익률 배열
+        times: 거래 시각 (int64 ns) - 있으면 Sharpe/Sortino 를 연환산
+    """
+    r = np.asarray(returns, dtype=float)
+    periods = None
+    if times is not None and len(times):
+        periods = _periods_per_year(r.size, int(np.min(times)), int(np.max(times)))
+    
+    summary = _summary(
+        r.size, r.sum(), np.dot(r, r), np.square(np.minimum(r, 0.0)).sum(),
+        np.count_nonzero(r > 0), r[r > 0].sum(), r[r <= 0].sum(), periods
+    )
+    equity = equity_curve(r)
+    summary['final_equity'] = float(equity[-1]) if equity.size else 1.0
+    summary['max_drawdown'] = max_drawdown(equity)
+    return summary
+
+
+def _group_sums(returns, labels):
+    """라벨별 합계 통계를 bincount 로 한 번에 계산"""
+    keys, inverse = np.unique(labels, return_inverse=True)
+    n = len(keys)
+    positive = returns > 0
+    sums = np.vstack([
+        np.bincount(inverse, minlength=n),
+        np.bincount(inverse, weights=returns, minlength=n),
+        np.bincount(inverse, weights=returns * returns, minlength=n),
+        np.bincount(inverse, weights=np.square(np.minimum(returns, 0.0)), minlength=n),
+        np.bincount(inverse, weights=positive, minlength=n),
+        np.bincount(inverse, weights=np.where(positive, returns, 0.0), minlength=n),
+        np.bincount(inverse, weights=np.where(positive, 0.0, returns), minlength=n)
+    ])
+    return keys, sums
+
+
+def breakdown(returns, labels):
+    """
+    분류 라벨별 성과 (vol_regime, regime, quality_bucket, reason 등)
+    
+    Returns:
+        dict: 라벨 -> summarize 와 같은 형식의 지표 (max_drawdown 제외)
+    """
+    keys, sums = _group_sums(np.asarray(returns, dtype=float), np.asarray(labels))
+    return {str(key): _summary(*sums[:, i]) for i, key in enumerate(keys)}
+
+
+class StreamingPerformance:
+    """
+    청크 단위로 누적하는 성과 계산기
+    
+    합계 통계와 자산 곡선의 마지막 값/고점만 유지하므로 저널 크기와 관계없이
+    메모리 사용량이 일정합니다.
+    """
+    
+    def __init__(self, breakdown_columns=None):
+        self.breakdown_columns = breakdown_columns or BREAKDOWN_COLUMNS
+        self.totals = np.zeros(7)
+        self.groups = {col: {} for col in self.breakdown_columns}
+        self.equity = 1.0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+        self.first_time = None
+        self.last_time = None
+    
+    def update(self, arrays):
+        """load_journal 형식의 배열 dict 한 청크를 누적"""
+        r = arrays['returns']
+        if r.size == 0:
+            return
+        
+        # 전체 합계
+        positive = r > 0
+        self.totals += [
+            r.size, r.sum(), np.dot(r, r), np.square(np.minimum(r, 0.0)).sum(),
+            np.count_nonzero(positive), r[positive].sum(), r[~positive].sum()
+        ]
+        
+        # 청크 경계를 넘어 자산 곡선/낙폭 이어서 계산
+        equity = self.equity * np.cumprod(1.0 + r)
+        peaks = np.maximum(self.peak, np.maximum.accumulate(equity))
+        self.max_drawdown = min(self.max_drawdown, float(np.min(equity / peaks - 1.0)))
+        self.equity = float(equity[-1])
+        self.peak = float(peaks[-1])
+        
+        if 'time' in arrays:
+            t_min, t_max = int(arrays['time'].min()), int(arrays['time'].max())
+            self.first_time = t_min if self.first_time is None else min(self.first_time, t_min)
+            self.last_time = t_max if self.last_time is None else max(self.last_time, t_max)
+        
+        # 분류별 합계
+        for col in self.breakdown_columns:
+            if col not in arrays:
+                continue
+            keys, sums = _group_sums(r, arrays[col])
+            acc = self.groups[col]
+            for i, key in enumerate(keys):
+                key = str(key)
+                if key in acc:
+                    acc[key] += sums[:, i]
+                else:
+                    acc[key] = sums[:, i].copy()
+    
+    def result(self):
+        """누적 결과 (summarize/breakdown 과 같은 형식)"""
+        count = int(self.totals[0])
+        periods = _periods_per_year(count, self.first_time, self.last_time)
+        summary = _summary(*self.totals, periods_per_year=periods)
+        summary['final_equity'] = self.equity
+        summary['max_drawdown'] = self.max_drawdown
+        
+        return {
+            'summary': summary,
+            'breakdowns': {
+                col: {key: _summary(*sums) for key, sums in sorted(acc.items())}
+                for col, acc in self.groups.items() if acc
+            }
+        }
+
+
+def analyze_journal(source, chunksize=None, include_equity=False):
+    """
+    저널 성과 분석
+    
+    Args:
+        source: CSV 경로 또는 DataFrame
+        chunksize: 지정 시 CSV 를 청크 단위로 스트리밍 (대용량 저널용, 메모리 일정)
+        include_equity: True면 자산 곡선 배열도 반환 (청크 모드에서는 무시)
+        
+    Returns:
+        dict: 'summary', 'breakdowns' (+ 'equity_curve')
+    """
+    stats = StreamingPerformance()
+    
+    if chunksize and not isinstance(source, pd.DataFrame):
+        for chunk in pd.read_csv(source, usecols=lambda c: c in _USECOLS, chunksize=chunksize):
+            stats.update(_journal_arrays(chunk))
+        return stats.result()
+    
+    arrays = load_journal(source)
+    stats.update(arrays)
+    result = stats.result()
+    if include_equity:
+        result['equity_curve'] = equity_curve(arrays['returns'])
+    return result
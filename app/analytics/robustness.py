@@ -0,0 +1,158 @@
+# robustness.py - 부트스트랩/몬테카를로 강건성 검증 (거래 저널 재표본)
+#
+# positions CSV 의 net_pos_1x 시계열을 재표본해 수만 개의 경로를 하나의 행렬로 만들고,
+# 경로별 최대 낙폭/최종 수익/파산 여부 분포를 계산합니다.
+# 경로는 고정 크기 청크로 나누어 코어별로 생성하며, 청크마다 SeedSequence 에서 파생된
+# 시드를 쓰므로 워커 수와 관계없이 같은 seed 면 같은 결과가 나옵니다.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .performance import load_journal
+
+METHODS = ('block_bootstrap', 'shuffle', 'drop')
+
+# 한 청크(= 한 작업 단위)에서 생성하는 경로 수
+PATHS_PER_CHUNK = 5000
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def block_bootstrap_paths(returns, n_paths, rng, block_size=5):
+    """
+    순환 블록 부트스트랩 - 연속된 block_size 거래를 묶어 복원 추출
+    
+    Returns:
+        ndarray: (n_paths, len(returns)) 수익률 행렬
+    """
+    n = returns.size
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_paths, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)) % n
+    return returns[index.reshape(n_paths, -1)[:, :n]]
+
+
+def shuffle_paths(returns, n_paths, rng):
+    """거래 순서만 무작위로 섞은 경로 (최종 수익은 같고 낙폭 분포만 달라짐)"""
+    return rng.permuted(np.broadcast_to(returns, (n_paths, returns.size)), axis=1)
+
+
+def drop_paths(returns, n_paths, rng, drop_rate=0.1):
+    """각 거래를 drop_rate 확률로 누락시킨 경로 (누락된 거래는 수익률 0)"""
+    keep = rng.random((n_paths, returns.size)) >= drop_rate
+    return np.where(keep, returns, 0.0)
+
+
+def generate_paths(returns, method, n_paths, rng, block_size=5, drop_rate=0.1):
+    """method 에 따라 경로 행렬 생성"""
+    if method == 'block_bootstrap':
+        return block_bootstrap_paths(returns, n_paths, rng, block_size)
+    if method == 'shuffle':
+        return shuffle_paths(returns, n_paths, rng)
+    if method == 'drop':
+        return drop_paths(returns, n_paths, rng, drop_rate)
+    raise ValueError(f"지원하지 않는 방법: {method} (가능: {', '.join(METHODS)})")
+
+
+def path_statistics(paths, ruin_level=0.5):
+    """
+    경로 행렬의 경로별 통계
+    
+    Args:
+        paths: (n_paths, n_trades) 수익률 행렬
+        ruin_level: 자산이 초기 대비 이 비율 이상 줄면 파산으로 간주 (0.5 = -50%)
+        
+    Returns:
+        tuple: (max_drawdown, final_return, ruined) 각각 길이 n_paths 배열
+    """
+    equity = np.cumprod(1.0 + paths, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    max_dd = np.min(equity / peaks - 1.0, axis=1)
+    final_return = equity[:, -1] - 1.0
+    ruined = np.any(equity <= 1.0 - ruin_level, axis=1)
+    return max_dd, final_return, ruined
+
+
+def _simulate_chunk(returns, method, n_paths, seed, block_size, drop_rate, ruin_level):
+    """청크 하나 생성 및 통계 계산 (프로세스 풀 작업 단위)"""
+    rng = np.random.default_rng(seed)
+    paths = generate_paths(returns, method, n_paths, rng, block_size, drop_rate)
+    return path_statistics(paths, ruin_level)
+
+
+def _distribution(values):
+    return {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def run_monte_carlo(source, method='block_bootstrap', n_paths=20000, seed=42, workers=None,
+                    block_size=5, drop_rate=0.1, ruin_level=0.5, leverage=1.0):
+    """
+    몬테카를로 강건성 검증 실행
+    
+    Args:
+        source: positions/trades CSV 경로, DataFrame 또는 수익률 배열
+        method: 'block_bootstrap' | 'shuffle' | 'drop'
+        n_paths: 생성할 경로 수
+        seed: 난수 시드 (같은 seed 면 워커 수와 관계없이 같은 결과)
+        workers: 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 실행)
+        block_size: 블록 부트스트랩 블록 길이
+        drop_rate: 거래 누락 확률 (method='drop')
+        ruin_level: 파산 기준 손실 비율
+        leverage: 수익률 배수 (net_pos_1x 는 1배 기준)
+        
+    Returns:
+        dict: 최대 낙폭/최종 수익 분포, 파산 확률과 원본 경로 통계 배열
+    """
+    if isinstance(n_paths, bool) or not isinstance(n_paths, (int, np.integer)) or n_paths < 1:
+        raise ValueError(f"n_paths 는 1 이상의 정수여야 합니다: {n_paths!r}")
+    
+    if isinstance(source, np.ndarray):
+        returns = source.astype(float)
+    else:
+        returns = load_journal(source)['returns']
+    returns = returns * leverage
+    
+    if returns.size == 0:
+        raise ValueError("수익률 데이터가 비어 있습니다")
+    if method not in METHODS:
+        raise ValueError(f"지원하지 않는 방법: {method} (가능: {', '.join(METHODS)})")
+    
+    # 청크 분할은 n_paths 로만 결정 -> 워커 수가 결과에 영향 없음
+    chunk_sizes = [PATHS_PER_CHUNK] * (n_paths // PATHS_PER_CHUNK)
+    if n_paths % PATHS_PER_CHUNK:
+        chunk_sizes.append(n_paths % PATHS_PER_CHUNK)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    args = [
+        (returns, method, size, child, block_size, drop_rate, ruin_level)
+        for size, child in zip(chunk_sizes, seeds)
+    ]
+    
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(args))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_chunk, *zip(*args)))
+    else:
+        results = [_simulate_chunk(*a) for a in args]
+    
+    max_dd = np.concatenate([r[0] for r in results])
+    final_return = np.concatenate([r[1] for r in results])
+    ruined = np.concatenate([r[2] for r in results])
+    
+    return {
+        'method': method,
+        'n_paths': int(max_dd.size),
+        'n_trades': int(returns.size),
+        'seed': seed,
+        'max_drawdown': _distribution(max_dd),
+        'final_return': _distribution(final_return),
+        'ruin_probability': float(ruined.mean()),
+        'ruin_level': ruin_level,
+        'paths': {
+            'max_drawdown': max_dd,
+            'final_return': final_return,
+            'ruined': ruined
+        }
+    }
@@ -2,10 +2,12 @@
 API 라우터 설정
 """
 from fastapi import APIRouter
-from .endpoints import trading
+from .endpoints import trading, market, analytics
 
 # API 라우터 생성
 api_router = APIRouter()
 
 # 라우터 등록
 api_router.include_router(trading.router, prefix="/trading", tags=["trading"])
+api_router.include_router(market.router, prefix="/market", tags=["market"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
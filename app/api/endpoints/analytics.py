@@ -0,0 +1,93 @@
+"""
+성과 분석 API - 거래 저널 자산 곡선 (서버 측 다운샘플링), 라이브 거래/포지션 저널 조회
+"""
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional
+import asyncio
+import logging
+
+from ...services.equity_data import equity_store
+from ...data.trade_journal import journal_reader
+from ...services.market_data import etag_matches
+from ..responses import FastJSONResponse
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/journals")
+async def list_journals() -> FastJSONResponse:
+    """
+    자산 곡선을 조회할 수 있는 저널 목록
+    """
+    return FastJSONResponse({"journals": equity_store.journals()})
+
+
+@router.get("/equity/{journal}")
+async def get_equity_curve(
+    request: Request,
+    journal: str,
+    start: Optional[int] = Query(default=None, description="구간 시작 (ms)"),
+    end: Optional[int] = Query(default=None, description="구간 끝 (ms)"),
+    points: int = Query(default=1000, ge=3, le=20000, description="최대 점 수 (초과 시 LTTB)")
+) -> Response:
+    """
+    저널 자산 곡선 (t, equity) - 구간/점 수별 결과는 캐시되며 If-None-Match 가 일치하면 304
+    """
+    etag = equity_store.etag(journal, start, end, points)
+    if etag is None:
+        raise HTTPException(status_code=404, detail=f"저널이 없습니다: {journal}")
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        # CSV 읽기/피라미드 생성은 이벤트 루프 밖에서 (웹소켓 전송 지연 방지)
+        body = await asyncio.to_thread(equity_store.body, journal, start, end, points)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _journal_page(table: str, limit: int, cursor: Optional[str], start: Optional[int],
+                        end: Optional[int], **filters: Optional[str]) -> FastJSONResponse:
+    """저널 DB 조회는 스레드에서 실행 (인덱스 범위 스캔 1회)"""
+    try:
+        page = await asyncio.to_thread(journal_reader.page, table, limit, cursor, start, end, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"잘못된 cursor 입니다: {cursor}") from e
+    return FastJSONResponse(page)
+
+
+@router.get("/trades")
+async def get_trades(
+    symbol: Optional[str] = None,
+    reason: Optional[str] = Query(default=None, description="청산 사유 (TP1, TP2, SL, TIMEOUT, TRAIL-*)"),
+    start: Optional[int] = Query(default=None, description="청산 시각 시작 (ms)"),
+    end: Optional[int] = Query(default=None, description="청산 시각 끝 (ms)"),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 next_cursor")
+) -> FastJSONResponse:
+    """
+    라이브 청산 내역 (phase1.3 trades 스키마 + symbol/env/가격/수량/손익), 최신순 커서 페이지
+    """
+    return await _journal_page("trades", limit, cursor, start, end,
+                               symbol=symbol.upper() if symbol else None, reason=reason)
+
+
+@router.get("/positions")
+async def get_positions(
+    symbol: Optional[str] = None,
+    start: Optional[int] = Query(default=None, description="진입 시각 시작 (ms)"),
+    end: Optional[int] = Query(default=None, description="진입 시각 끝 (ms)"),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 next_cursor")
+) -> FastJSONResponse:
+    """
+    라이브 포지션별 합계 (phase1.3 positions 스키마 + symbol/env/청산 시각/수량/손익), 최신순 커서 페이지
+    """
+    return await _journal_page("positions", limit, cursor, start, end,
+                               symbol=symbol.upper() if symbol else None)
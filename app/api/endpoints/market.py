@@ -0,0 +1,79 @@
+"""
+시장 데이터 조회 API - 봇이 계산한 캔들/지표 시계열 (거래소를 직접 호출하지 않음)
+"""
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional, Sequence
+import logging
+
+from ...services.market_data import market_data_cache, etag_matches, KLINE_COLUMNS, INDICATOR_COLUMNS, FORMATS
+from ...data.single_flight import exchange_reads
+from ..responses import FastJSONResponse
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _respond(request: Request, topic: str, columns: Sequence[str], fmt: str,
+             since: Optional[int], limit: Optional[int], points: Optional[int], method: str) -> Response:
+    """캐시된 본문으로 응답 (If-None-Match 가 일치하면 본문 없이 304)"""
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {fmt} ({', '.join(FORMATS)})")
+
+    cached = market_data_cache.get(topic, columns, fmt, since, limit, points, method)
+    if cached is None:
+        raise HTTPException(status_code=404, detail=f"데이터가 없습니다: {topic} (봇 실행 여부 확인)")
+
+    etag, body = cached
+    # no-cache: 브라우저가 저장하되 매번 ETag 로 재검증
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        market_data_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/stats")
+async def get_market_data_stats() -> FastJSONResponse:
+    """
+    조회 캐시 통계 (응답 캐시 hit/miss/304, 이 프로세스의 거래소 조회 공유 hit/miss/coalesce 비율)
+    """
+    return FastJSONResponse({
+        "response_cache": market_data_cache.get_stats(),
+        "exchange_reads": exchange_reads.get_stats()
+    })
+
+
+@router.get("/{symbol}/candles")
+async def get_candles(
+    request: Request,
+    symbol: str,
+    interval: str = "1h",
+    since: Optional[int] = Query(default=None, description="이 시각(ms) 이후 캔들만 (이전 응답의 next_since)"),
+    limit: Optional[int] = Query(default=None, ge=1),
+    points: Optional[int] = Query(default=None, ge=3, description="최대 캔들 수 (초과 시 OHLC 집계)"),
+    format: str = Query(default="rows", description="rows | columnar")
+) -> Response:
+    """
+    마감 캔들 조회 (t, open, high, low, close, volume)
+    """
+    return _respond(request, f"{symbol.upper()}.kline.{interval}", KLINE_COLUMNS, format, since, limit,
+                    points, "ohlc")
+
+
+@router.get("/{symbol}/indicators")
+async def get_indicators(
+    request: Request,
+    symbol: str,
+    interval: str = "1h",
+    since: Optional[int] = Query(default=None, description="이 시각(ms) 이후 값만 (이전 응답의 next_since)"),
+    limit: Optional[int] = Query(default=None, ge=1),
+    points: Optional[int] = Query(default=None, ge=3, description="최대 점 수 (초과 시 close 기준 LTTB)"),
+    format: str = Query(default="rows", description="rows | columnar")
+) -> Response:
+    """
+    마감 캔들별 지표 시계열 조회 (t, close, ema20, ema50, ema200, rsi14, atr_pct, vol_ma20)
+    """
+    return _respond(request, f"{symbol.upper()}.indicator_series.{interval}", INDICATOR_COLUMNS,
+                    format, since, limit, points, "lttb")
@@ -0,0 +1,89 @@
+"""
+메트릭 API - Prometheus 텍스트 형식 (/metrics)
+
+API 프로세스의 메트릭(로그/웹소켓 큐, 응답 캐시, 신호 조회의 거래소 호출)과
+봇 워커가 사이클마다 보내는 메트릭 스냅샷(사이클 시간, 거래소 호출, 주문 체결)을 worker 레이블로 함께 출력합니다.
+큐 크기처럼 다른 객체가 이미 들고 있는 값은 콜백으로 등록해 조회 시점에만 읽습니다.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+import logging
+
+from ...data.single_flight import exchange_reads
+from ...services.bot_supervisor import bot_supervisor
+from ...services.market_data import market_data_cache
+from ...utils.metrics import metrics, render
+from ...websocket.connection_manager import manager
+from ...websocket.log_manager import log_manager
+from ...websocket.market_stream import market_stream
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _log_stat(key):
+    return lambda: log_manager.get_stats()[key]
+
+
+def _ws_stat(key):
+    return lambda: manager.get_stats()[key]
+
+
+def _worker_stat(attr):
+    return lambda: {w.worker_id: getattr(w, attr) for w in list(bot_supervisor.workers.values())}
+
+
+# 로그 웹소켓 (LogWebSocketManager)
+metrics.callback("log_queue_size", "gauge", "로그 전송 대기 건수", _log_stat("queue_size"))
+metrics.callback("log_queue_max", "gauge", "로그 전송 큐 최대 크기", _log_stat("queue_max"))
+metrics.callback("log_history_size", "gauge", "재전송용 로그 기록 건수", _log_stat("history"))
+metrics.callback("log_history_bytes", "gauge", "재전송용 로그 기록 크기 (bytes)", _log_stat("history_bytes"))
+metrics.callback("log_received_total", "counter", "수신한 로그 건수", _log_stat("received"))
+metrics.callback("log_dropped_total", "counter", "큐가 가득 차 버린 로그 건수", _log_stat("dropped"))
+metrics.callback("log_client_pending", "gauge", "로그 클라이언트 전송 대기 프레임 수", _log_stat("client_pending"))
+metrics.callback("log_slow_disconnects_total", "counter", "느린 로그 클라이언트 연결 종료 수", _log_stat("slow_disconnects"))
+
+# 웹소켓 클라이언트
+metrics.callback(
+    "websocket_clients", "gauge", "웹소켓 연결 수", lambda: {
+        "trading": len(manager.clients),
+        "logs": len(log_manager.active_connections)
+    }, ("endpoint",)
+)
+metrics.callback("websocket_send_pending", "gauge", "클라이언트 전송 대기 메시지 수", _ws_stat("pending"))
+metrics.callback("websocket_send_dropped_total", "counter", "느린 클라이언트로 버린 메시지 수", _ws_stat("dropped"))
+metrics.callback("market_stream_pending", "gauge", "시장 스트림 발행 대기 건수",
+                 lambda: market_stream.get_stats()["pending"])
+
+# 응답 캐시 / 거래소 조회 공유 (API 프로세스)
+metrics.callback(
+    "market_data_cache_requests_total", "counter", "시장 데이터 응답 캐시 조회 수", lambda: {
+        result: market_data_cache.get_stats()[result] for result in ("hits", "misses", "not_modified")
+    }, ("result",)
+)
+metrics.callback(
+    "exchange_reads_total", "counter", "거래소 조회 공유 결과", lambda: {
+        result: exchange_reads.get_stats()[result] for result in ("hits", "misses", "coalesced", "shared_hits")
+    }, ("result",)
+)
+
+# 봇 워커 프로세스 (감독자가 측정)
+metrics.callback("bot_worker_restarts_total", "counter", "봇 워커 재시작 횟수", _worker_stat("restarts"), ("worker",))
+metrics.callback("bot_worker_cpu_percent", "gauge", "봇 워커 CPU 사용률", _worker_stat("cpu_percent"), ("worker",))
+metrics.callback("bot_worker_memory_rss_bytes", "gauge", "봇 워커 메모리 (RSS)", _worker_stat("memory_rss"), ("worker",))
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Prometheus 수집용 메트릭 - 워커 메트릭은 마지막 상태 메시지 기준 (worker 레이블)
+    """
+    sources = [({}, metrics.collect())]
+    for worker in list(bot_supervisor.workers.values()):
+        if worker.metrics:
+            sources.append(({"worker": worker.worker_id}, worker.metrics))
+    return PlainTextResponse(render(sources), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,49 +1,37 @@
 """
 트레이딩 봇 상태 확인 API
 """
-import os
-import sys
-import psutil
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi.responses import JSONResponse
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from typing import Optional
 from datetime import datetime
+import hmac
 import logging
+from ...config import settings
 from ...services.trading_bot_service import get_trading_bot_service, TradingBotService
+from ...services.bot_registry import bot_registry
+from ...services.signal_service import signal_service, SignalUnavailable
+from ..responses import FastJSONResponse
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
 def is_bot_running() -> bool:
-    """Check if live_trading_bot.py is running as a separate process"""
-    try:
-        current_pid = os.getpid()
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                # Skip current process
-                if proc.info['pid'] == current_pid:
-                    continue
-                    
-                cmdline = proc.info.get('cmdline', [])
-                if not cmdline:  # Skip if no command line
-                    continue
-                    
-                # Convert cmdline to string for case-insensitive search
-                cmdline_str = ' '.join(cmdline).lower()
-                if ('python' in cmdline[0].lower() and 
-                    'live_trading_bot.py' in cmdline_str):
-                    return True
-                    
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-            except Exception as e:
-                logger.warning(f"Error checking process {proc.info.get('pid')}: {e}")
-                continue
-                
-    except Exception as e:
-        logger.error(f"Error in is_bot_running: {e}")
-        
-    return False
+    """봇 레지스트리 기준 실행 여부 (서비스 내 봇 + 하트비트 파일, 프로세스 목록 순회 없음)"""
+    return bot_registry.is_running()
+
+def require_bot_control(x_bot_token: Optional[str] = Header(default=None)):
+    """
+    봇 시작/중지 권한 확인
+
+    BOT_CONTROL_TOKEN 이 설정되어 있으면 X-Bot-Token 헤더가 일치해야 하며,
+    실거래(BOT_LIVE_TRADING) 서버에서 토큰이 없으면 제어 API 자체를 막습니다.
+    """
+    if not settings.BOT_CONTROL_TOKEN:
+        if settings.BOT_LIVE_TRADING:
+            raise HTTPException(status_code=503, detail="BOT_CONTROL_TOKEN 이 설정되지 않아 실거래 봇을 제어할 수 없습니다.")
+        return
+    if not x_bot_token or not hmac.compare_digest(x_bot_token, settings.BOT_CONTROL_TOKEN):
+        raise HTTPException(status_code=401, detail="봇 제어 토큰이 올바르지 않습니다.")
 
 router = APIRouter()
 
@@ -51,7 +39,7 @@ router = APIRouter()
 async def get_trading_status(
     request: Request,
     bot_service: TradingBotService = Depends(get_trading_bot_service)
-) -> JSONResponse:
+) -> FastJSONResponse:
     """
     트레이딩 봇 상태 조회
     """
@@ -65,33 +53,87 @@ async def get_trading_status(
             "Access-Control-Allow-Headers": "*"
         }
         
-        # Check if live_trading_bot.py is running as a separate process
-        bot_process_running = is_bot_running()
-        
-        # 응답 데이터 준비
+        # 봇 레지스트리 조회 (서비스 내 봇 + 별도 프로세스 봇의 하트비트, 프로세스 목록 순회 없음)
         response_data = {
-            "is_running": bot_process_running,
-            "status": "running" if bot_process_running else "stopped",
+            **bot_registry.status(),
             "last_updated": datetime.utcnow().isoformat() + "Z"
         }
         
-        return JSONResponse(
+        return FastJSONResponse(
             content=response_data,
             headers=headers
         )
         
     except Exception as e:
         logger.error(f"Error in get_trading_status: {str(e)}", exc_info=True)
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"detail": f"상태 확인 중 오류 발생: {str(e)}"},
             headers=headers
         )
 
+@router.post("/bot/start", dependencies=[Depends(require_bot_control)])
+async def start_trading_bot(
+    symbol: str = "ETHUSDT",
+    leverage: int = 2,
+    worker_id: Optional[str] = None,
+    bot_service: TradingBotService = Depends(get_trading_bot_service)
+) -> FastJSONResponse:
+    """
+    트레이딩 봇 워커 시작 (봇은 자식 프로세스에서 실행되고 요청은 즉시 반환)
+    
+    worker_id 를 지정하면 같은 심볼을 다른 설정으로 여러 개 실행할 수 있습니다 (기본값: 심볼).
+    실거래 여부(BOT_LIVE_TRADING)와 테스트넷 여부(BYBIT_TESTNET)는 요청이 아닌 서버 설정을 따릅니다.
+    """
+    result = await bot_service.start(symbol=symbol, leverage=leverage, dry_run=not settings.BOT_LIVE_TRADING,
+                                     testnet=settings.BYBIT_TESTNET, worker_id=worker_id)
+    if result["status"] == "error":
+        raise HTTPException(status_code=409, detail=result["message"])
+    return FastJSONResponse(result)
+
+@router.post("/bot/stop", dependencies=[Depends(require_bot_control)])
+async def stop_trading_bot(
+    worker_id: Optional[str] = None,
+    bot_service: TradingBotService = Depends(get_trading_bot_service)
+) -> FastJSONResponse:
+    """
+    트레이딩 봇 워커 중지 (worker_id 가 없으면 전체, 대기 중이면 즉시, 사이클 중이면 사이클 완료 후 종료)
+    """
+    result = await bot_service.stop(worker_id)
+    if result["status"] == "error":
+        raise HTTPException(status_code=409, detail=result["message"])
+    return FastJSONResponse(result)
+
+@router.get("/bot")
+async def get_trading_bot(
+    bot_service: TradingBotService = Depends(get_trading_bot_service)
+) -> FastJSONResponse:
+    """
+    트레이딩 봇 워커 상세 상태 (워커별 사이클 수, 포지션, 재시작 횟수, CPU/메모리)
+    """
+    return FastJSONResponse(bot_service.get_status())
+
+@router.get("/signal")
+async def get_trading_signal(symbol: str = "ETHUSDT") -> FastJSONResponse:
+    """
+    현재 진입 시그널 진단 (check_entry_signal 결과, 품질 점수 내역, 변동성/시장 레짐, 목표가)
+
+    봇이 실행 중인 심볼은 봇이 마지막 사이클에 발행한 진단을 그대로 (source=bot), 아니면 마감 캔들
+    최근 200개를 market_stream(source=stream) 또는 거래소(source=exchange)에서 가져와 평가합니다.
+    평가는 마감 캔들마다 한 번이며, 같은 캔들의 요청은 메모된 결과를 받습니다.
+    """
+    try:
+        return FastJSONResponse(await signal_service.get_signal(symbol))
+    except SignalUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"시그널 평가 실패 ({symbol}): {e}")
+        raise HTTPException(status_code=502, detail=f"시그널 평가 실패: {e}")
+
 # OPTIONS 메서드 핸들러 추가
 @router.options("/status")
 async def options_status():
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=200,
         headers={
             "Access-Control-Allow-Origin": "*",
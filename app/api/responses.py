@@ -0,0 +1,225 @@
+"""
+API 응답 직렬화/압축 (responses.py)
+
+FastJSONResponse : orjson 으로 직렬화하는 JSONResponse (앱 기본 응답 클래스)
+    numpy 스칼라/배열, pandas Timestamp/Series/DataFrame, datetime 을 변환 없이 처리하고 NaN 은 null 로 씁니다.
+    엔드포인트가 dict 를 반환하면 FastAPI 가 jsonable_encoder 로 한 번 더 순회하므로,
+    자주 호출되는 엔드포인트는 FastJSONResponse 를 직접 반환합니다.
+    orjson 이 설치되어 있지 않으면 표준 json 으로 대체됩니다 (NaN/Infinity 는 마찬가지로 null).
+
+CompressionMiddleware : Accept-Encoding 에 따라 brotli(설치 시) 또는 gzip 으로 응답 본문 압축
+    API_COMPRESS_MIN_SIZE 이상인 JSON/텍스트 응답만 압축하고, ETag 가 있는 응답(캐시된 본문)은
+    (ETag, 인코딩) 별로 압축 결과를 보관해 같은 본문을 다시 압축하지 않습니다.
+    THREAD_COMPRESS_SIZE 이상인 본문은 이벤트 루프를 막지 않도록 스레드에서 압축합니다 (zlib/brotli 는 GIL 해제).
+    스트리밍 응답과 WebSocket 은 그대로 통과합니다.
+"""
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Optional
+import asyncio
+import gzip
+import json
+import math
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+from ..config import settings
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+# 압축할 Content-Type (접두사)
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+# (ETag, 인코딩) 별 압축 본문 보관 개수
+COMPRESSED_CACHE_SIZE = 256
+# 이 크기 이상인 본문은 스레드에서 압축
+THREAD_COMPRESS_SIZE = 256 * 1024
+
+
+def _default(value: Any) -> Any:
+    """orjson/json 이 직접 처리하지 못하는 값 변환"""
+    if value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):  # orjson 이 처리하지 못하는 비연속/object 배열
+        return value.tolist()
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.tolist()
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient="records")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"JSON 으로 직렬화할 수 없는 타입: {type(value).__name__}")
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(content: Any) -> bytes:
+        """JSON 직렬화 (bytes)"""
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+else:
+    def _floatstr(value: float) -> str:
+        return float.__repr__(value) if math.isfinite(value) else "null"
+
+    class _Encoder(json.JSONEncoder):
+        """표준 json 인코더 - NaN/Infinity 를 (유효하지 않은 JSON 인 NaN 대신) orjson 처럼 null 로 씀"""
+
+        def iterencode(self, o, _one_shot=False):
+            return json.encoder._make_iterencode(
+                {}, self.default, json.encoder.encode_basestring, None, _floatstr,
+                self.key_separator, self.item_separator, False, False, _one_shot
+            )(o, 0)
+
+    _encoder = _Encoder(default=_default, ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(content: Any) -> bytes:
+        """JSON 직렬화 (bytes)"""
+        return "".join(_encoder.iterencode(content)).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 직렬화 JSONResponse"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding 중 사용할 압축 방식 (br > gzip, q=0 은 제외, 없으면 None)"""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """응답 본문 압축 ASGI 미들웨어 (br/gzip)"""
+
+    def __init__(self, app, minimum_size: int = None, gzip_level: int = None, brotli_quality: int = None):
+        self.app = app
+        self.minimum_size = settings.API_COMPRESS_MIN_SIZE if minimum_size is None else minimum_size
+        self.gzip_level = settings.API_GZIP_LEVEL if gzip_level is None else gzip_level
+        self.brotli_quality = settings.API_BROTLI_QUALITY if brotli_quality is None else brotli_quality
+        self._cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def _compressed_body(self, body: bytes, encoding: str, etag: Optional[bytes]) -> bytes:
+        key = (etag, encoding)
+        if etag is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        if len(body) >= THREAD_COMPRESS_SIZE:
+            compressed = await asyncio.to_thread(self.compress, body, encoding)
+        else:
+            compressed = self.compress(body, encoding)
+        if etag is None:
+            return compressed
+        self._cache[key] = compressed
+        if len(self._cache) > COMPRESSED_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return compressed
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept)
+
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            # 첫 본문 메시지 - 스트리밍이면 그대로 통과
+            body = message.get("body", b"")
+            if message.get("more_body", False) or not self._eligible(start, body):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers = [(k, v) for k, v in start["headers"] if k not in (b"content-length", b"vary", b"etag")]
+            vary = [v for k, v in start["headers"] if k == b"vary"]
+            etag = next((v for k, v in start["headers"] if k == b"etag"), None)
+            headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+
+            if encoding is not None:
+                body = await self._compressed_body(body, encoding, etag)
+                headers.append((b"content-encoding", encoding.encode()))
+                if etag is not None and not etag.startswith(b"W/"):
+                    # 압축 표현은 바이트가 다르므로 약한 ETag (If-None-Match 비교는 W/ 를 무시)
+                    etag = b"W/" + etag
+            if etag is not None:
+                headers.append((b"etag", etag))
+            headers.append((b"content-length", str(len(body)).encode()))
+
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _eligible(self, start, body: bytes) -> bool:
+        if start is None or start["status"] < 200 or start["status"] in (204, 304) or len(body) < self.minimum_size:
+            return False
+        content_type = b""
+        for name, value in start["headers"]:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        return content_type.decode("latin-1").startswith(COMPRESSIBLE_TYPES)
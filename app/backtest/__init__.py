@@ -0,0 +1,6 @@
+"""
+Backtesting package for the trading system.
+"""
+
+from .engine import BacktestEngine, ENGINE_VERSION
+from .cache import BacktestCache
@@ -0,0 +1,162 @@
+# cache.py - 콘텐츠 주소 기반 백테스트 결과 캐시 (LRU + 디스크 용량 제한)
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / '.cache' / 'backtest'
+
+
+class BacktestCache:
+    """
+    백테스트 단계별 결과를 디스크에 저장하는 캐시
+    
+    키는 (엔진 버전, 데이터 지문, 전략 파라미터)의 해시이며, 단계(stage)마다
+    하위 디렉토리를 따로 둡니다. 전체 용량이 max_bytes 를 넘으면 가장 오래 사용하지
+    않은 항목부터 삭제합니다.
+    """
+    
+    def __init__(self, cache_dir=None, max_bytes=512 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리 (기본값: 프로젝트 루트의 .cache/backtest)
+            max_bytes: 디스크 사용량 상한 (바이트)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        
+        # 경로 -> 파일 크기 (앞쪽이 가장 오래 사용하지 않은 항목)
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load_index()
+        self._evict()
+    
+    def _load_index(self):
+        """디스크의 기존 캐시 파일을 마지막 사용 시각 순으로 색인"""
+        if not self.cache_dir.exists():
+            return
+        
+        files = []
+        for path in self.cache_dir.glob('*/*.pkl'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path, stat.st_size))
+        
+        for _, path, size in sorted(files):
+            self._entries[path] = size
+            self._total_bytes += size
+    
+    @staticmethod
+    def make_key(*parts):
+        """파라미터들을 정규화(JSON)한 뒤 SHA-256 해시로 키 생성"""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def data_fingerprint(df):
+        """캔들 데이터 구간의 지문 (행 수, 시작/끝 시각, 전체 값 해시)"""
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        
+        start = str(df['timestamp'].iloc[0]) if len(df) else ''
+        end = str(df['timestamp'].iloc[-1]) if len(df) else ''
+        return f"{len(df)}:{start}:{end}:{digest.hexdigest()}"
+    
+    def _path(self, stage, key):
+        return self.cache_dir / stage / f"{key}.pkl"
+    
+    def get(self, stage, key):
+        """캐시 조회 (없으면 None)"""
+        path = self._path(stage, key)
+        with self._lock:
+            if path not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+        
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)  # LRU 순서를 재시작 후에도 유지
+        except (OSError, pickle.UnpicklingError, EOFError):
+            with self._lock:
+                self._forget(path)
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return value
+    
+    def put(self, stage, key, value):
+        """캐시 저장 (원자적 쓰기 후 용량 초과분 정리)"""
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+        
+        with self._lock:
+            self._forget(path)
+            self._entries[path] = size
+            self._total_bytes += size
+            self._evict()
+    
+    def get_or_compute(self, stage, key, compute):
+        """캐시에 있으면 반환하고, 없으면 compute() 결과를 저장 후 반환"""
+        value = self.get(stage, key)
+        if value is None:
+            value = compute()
+            self.put(stage, key, value)
+        return value
+    
+    def _forget(self, path):
+        size = self._entries.pop(path, None)
+        if size is not None:
+            self._total_bytes -= size
+    
+    def _evict(self):
+        """용량 상한을 넘는 동안 가장 오래 사용하지 않은 항목 삭제 (방금 저장한 항목은 유지)"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            path, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            for path in list(self._entries):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+    
+    def stats(self):
+        """캐시 사용 통계"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,235 @@
+# engine.py - Phase 1.3 백테스트 엔진 (지표 → 시그널 → 거래 3단계)
+#
+# 단계별 결과를 BacktestCache 에 따로 저장하므로, 청산 파라미터만 바꾼 재실행은
+# 캐시된 지표/시그널을 그대로 재사용하고 거래 시뮬레이션만 다시 수행합니다.
+
+import numpy as np
+import pandas as pd
+
+from ..trading.strategy import TradingStrategy
+# 거래/포지션 컬럼과 트레일링 사유 라벨은 라이브 거래 저널과 공유 (phase1.3 CSV 스키마)
+from ..data.trade_journal import TRADE_COLUMNS, POSITION_COLUMNS, TRAILING_LABELS
+
+# 엔진 로직(시그널 생성/청산 시뮬레이션)이 바뀌면 반드시 올릴 것 - 캐시 키에 포함됨
+ENGINE_VERSION = "1.3.0"
+
+# 시그널 평가 시 사용하는 최근 구간 길이 (check_entry_signal 의 최소 200봉 + 여유)
+SIGNAL_WINDOW = 250
+
+
+class BacktestEngine:
+    """1시간봉 기반 Phase 1.3 백테스트 엔진"""
+    
+    def __init__(self, strategy=None, cache=None, engine_name='P1.3',
+                 fee_rate=0.0, tp1_portion=0.5, max_holding_days=30):
+        """
+        Args:
+            strategy: TradingStrategy 인스턴스 (기본값: 새 인스턴스)
+            cache: BacktestCache 인스턴스 (None이면 캐시 사용 안 함)
+            engine_name: 결과 CSV 의 engine 컬럼 값
+            fee_rate: 편도 수수료율 (net_ret_1x 에서 왕복으로 차감)
+            tp1_portion: TP1 도달 시 청산 비율
+            max_holding_days: 최대 보유 기간 (초과 시 TIMEOUT 청산)
+        """
+        self.strategy = strategy or TradingStrategy()
+        self.cache = cache
+        self.engine_name = engine_name
+        self.fee_rate = fee_rate
+        self.tp1_portion = tp1_portion
+        self.max_holding_days = max_holding_days
+    
+    def get_exit_params(self):
+        """거래 시뮬레이션 단계에만 영향을 주는 파라미터"""
+        params = dict(self.strategy.get_params()['exit'])
+        params.update({
+            'engine_name': self.engine_name,
+            'fee_rate': self.fee_rate,
+            'tp1_portion': self.tp1_portion,
+            'max_holding_days': self.max_holding_days
+        })
+        return params
+    
+    def compute_indicators(self, df_1h):
+        """1단계: 지표 계산"""
+        df = self.strategy.calculate_indicators(df_1h)
+        return df.reset_index(drop=True)
+    
+    def generate_signals(self, df_ind):
+        """
+        2단계: 봉마다 check_entry_signal 평가
+        
+        지표는 이미 전체 구간에서 계산되어 있으므로 각 시점에는 최근 SIGNAL_WINDOW 봉만
+        잘라서 넘깁니다 (전략이 참조하는 최대 lookback 은 50봉).
+        백테스트는 1시간봉만 사용하므로 df_15m/df_5m 자리에도 1시간봉을 넘깁니다.
+        
+        Returns:
+            DataFrame: 시그널이 발생한 봉마다 한 행 (bar_index 포함)
+        """
+        # EMA 정배열이 아닌 봉은 check_entry_signal 이 바로 None 을 반환하므로 미리 제외
+        aligned = (df_ind['ema20'] > df_ind['ema50']) & (df_ind['ema50'] > df_ind['ema200'])
+        candidates = np.flatnonzero(aligned.to_numpy())
+        
+        rows = []
+        for i in candidates[candidates >= 199]:
+            i = int(i)
+            window = df_ind.iloc[max(0, i + 1 - SIGNAL_WINDOW):i + 1]
+            signal = self.strategy.check_entry_signal(window, window, window)
+            if signal:
+                signal['bar_index'] = i
+                rows.append(signal)
+        
+        columns = [
+            'bar_index', 'timestamp', 'action', 'entry_price', 'tp1_price', 'tp2_price', 'sl_price',
+            'tp1_pct', 'tp2_pct', 'sl_pct', 'quality', 'vol_regime', 'atr_ratio', 'market_regime'
+        ]
+        return pd.DataFrame(rows, columns=columns)
+    
+    def simulate_trades(self, df_ind, signals):
+        """
+        3단계: 시그널을 따라 진입/청산 시뮬레이션 (동시에 한 포지션만 보유)
+        
+        각 봉에서 저가 기준 손절을 먼저 확인하고(보수적), 그 다음 고가 기준 TP1/TP2,
+        TP1 이후에는 트레일링 스톱을 확인합니다. live_trading_bot.monitor_position 과 같은 규칙입니다.
+        
+        Returns:
+            tuple: (trades DataFrame, positions DataFrame) - phase1.3 CSV 와 같은 스키마
+        """
+        timestamps = df_ind['timestamp'].to_numpy()
+        highs = df_ind['high'].to_numpy(dtype=float)
+        lows = df_ind['low'].to_numpy(dtype=float)
+        closes = df_ind['close'].to_numpy(dtype=float)
+        max_holding = np.timedelta64(self.max_holding_days, 'D')
+        
+        trades = []
+        positions = []
+        next_free_bar = 0
+        
+        for signal in signals.itertuples(index=False):
+            start = int(signal.bar_index)
+            if start < next_free_bar:
+                continue
+            
+            entry_price = float(signal.entry_price)
+            entry_time = signal.timestamp
+            tp1_pct = signal.tp1_pct / 100
+            tp2_price = float(signal.tp2_price)
+            tp1_price = float(signal.tp1_price)
+            sl_price = float(signal.sl_price)
+            
+            remaining = 1.0
+            tp1_hit = False
+            highest = entry_price
+            exits = []
+            exit_bar = len(df_ind) - 1
+            
+            for j in range(start + 1, len(df_ind)):
+                highest = max(highest, highs[j])
+                
+                if lows[j] <= sl_price:
+                    exits.append((j, remaining, sl_price, 'SL', np.nan))
+                    remaining = 0.0
+                elif not tp1_hit and highs[j] >= tp1_price:
+                    portion = remaining * self.tp1_portion
+                    exits.append((j, portion, tp1_price, 'TP1', np.nan))
+                    remaining -= portion
+                    tp1_hit = True
+                elif highs[j] >= tp2_price:
+                    exits.append((j, remaining, tp2_price, 'TP2', np.nan))
+                    remaining = 0.0
+                elif tp1_hit:
+                    trailing_price = self.strategy.calculate_trailing_stop(
+                        entry_price, highest, signal.vol_regime
+                    )
+                    if trailing_price and lows[j] <= trailing_price:
+                        trailing_pct = 1 - trailing_price / highest
+                        label = TRAILING_LABELS.get(signal.vol_regime, "TRAIL-고변동")
+                        exits.append((j, remaining, trailing_price, label, trailing_pct))
+                        remaining = 0.0
+                
+                if remaining > 0 and timestamps[j] - timestamps[start] >= max_holding:
+                    exits.append((j, remaining, closes[j], 'TIMEOUT', np.nan))
+                    remaining = 0.0
+                
+                if remaining <= 0:
+                    exit_bar = j
+                    break
+            
+            if remaining > 0:
+                # 데이터 끝까지 청산되지 않은 포지션은 집계에서 제외
+                break
+            
+            net_pos = 0.0
+            for j, portion, exit_price, reason, trailing_pct in exits:
+                net_ret = exit_price / entry_price - 1 - 2 * self.fee_rate
+                net_pos += portion * net_ret
+                trades.append({
+                    'entry_time': entry_time,
+                    'exit_time': timestamps[j],
+                    'engine': self.engine_name,
+                    'portion': portion,
+                    'net_ret_1x': net_ret,
+                    'reason': reason,
+                    'tp1_pct': tp1_pct,
+                    'size': 1.0,
+                    'regime': signal.market_regime,
+                    'quality': signal.quality,
+                    'vol_regime': signal.vol_regime,
+                    'atr_ratio': signal.atr_ratio,
+                    'trailing_pct': trailing_pct
+                })
+            
+            positions.append({
+                'engine': self.engine_name,
+                'net_pos_1x': net_pos,
+                'entry_time': entry_time,
+                'size': 1.0,
+                'regime': signal.market_regime,
+                'quality': signal.quality,
+                'vol_regime': signal.vol_regime,
+                'atr_ratio': signal.atr_ratio
+            })
+            next_free_bar = exit_bar + 1
+        
+        trades_df = pd.DataFrame(trades, columns=TRADE_COLUMNS)
+        trades_df['exit_time'] = pd.to_datetime(trades_df['exit_time'])
+        return trades_df, pd.DataFrame(positions, columns=POSITION_COLUMNS)
+    
+    def run(self, df_1h):
+        """
+        백테스트 실행 (캐시가 있으면 단계별로 재사용)
+        
+        Args:
+            df_1h: 1시간봉 OHLCV DataFrame (timestamp, open, high, low, close, volume)
+            
+        Returns:
+            dict: 'indicators', 'signals', 'trades', 'positions'
+        """
+        if self.cache is None:
+            indicators = self.compute_indicators(df_1h)
+            signals = self.generate_signals(indicators)
+            trades, positions = self.simulate_trades(indicators, signals)
+        else:
+            params = self.strategy.get_params()
+            fingerprint = self.cache.data_fingerprint(df_1h)
+            
+            # 키는 이전 단계 키를 포함하는 체인 구조 - 뒤 단계 파라미터 변경은 앞 단계 캐시에 영향 없음
+            indicators_key = self.cache.make_key(ENGINE_VERSION, fingerprint, params['indicators'])
+            signals_key = self.cache.make_key(indicators_key, params['entry'])
+            trades_key = self.cache.make_key(signals_key, self.get_exit_params())
+            
+            indicators = self.cache.get_or_compute(
+                'indicators', indicators_key, lambda: self.compute_indicators(df_1h)
+            )
+            signals = self.cache.get_or_compute(
+                'signals', signals_key, lambda: self.generate_signals(indicators)
+            )
+            trades, positions = self.cache.get_or_compute(
+                'trades', trades_key, lambda: self.simulate_trades(indicators, signals)
+            )
+        
+        return {
+            'indicators': indicators,
+            'signals': signals,
+            'trades': trades,
+            'positions': positions
+        }
@@ -30,6 +30,44 @@ class Settings(BaseSettings):
     TRADING_CATEGORY: str = os.getenv("TRADING_CATEGORY", "linear")
     LEVERAGE: int = int(os.getenv("LEVERAGE", "2"))
     
+    # WebSocket 설정
+    WS_SEND_QUEUE_SIZE: int = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))  # 클라이언트별 전송 대기열 크기
+    WS_SLOW_CONSUMER_POLICY: str = os.getenv("WS_SLOW_CONSUMER_POLICY", "drop_oldest")  # drop_oldest | coalesce | disconnect
+    WS_PER_MESSAGE_DEFLATE: bool = os.getenv("WS_PER_MESSAGE_DEFLATE", "True").lower() == "true"  # permessage-deflate 압축 협상
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # 로그 대기열 크기 (초과 시 오래된 로그 버림)
+    LOG_BATCH_SIZE: int = int(os.getenv("LOG_BATCH_SIZE", "500"))  # 로그 프레임 하나에 담을 최대 줄 수
+    LOG_BATCH_INTERVAL: float = float(os.getenv("LOG_BATCH_INTERVAL", "0.05"))  # 배치 수집 대기 시간 (초)
+    LOG_HISTORY_SIZE: int = int(os.getenv("LOG_HISTORY_SIZE", "5000"))  # 재전송용 최근 로그 보관 줄 수
+    LOG_HISTORY_MAX_BYTES: int = int(os.getenv("LOG_HISTORY_MAX_BYTES", str(4 * 1024 * 1024)))  # 보관 로그 최대 용량
+    LOG_CLIENT_QUEUE_SIZE: int = int(os.getenv("LOG_CLIENT_QUEUE_SIZE", "256"))  # 클라이언트별 전송 대기 프레임 수 (초과 시 연결 종료)
+    LOG_SEND_TIMEOUT: float = float(os.getenv("LOG_SEND_TIMEOUT", "5"))  # 프레임 하나 전송 제한 시간 (초과 시 연결 종료)
+    LOG_REPLAY_LINES: int = int(os.getenv("LOG_REPLAY_LINES", "200"))  # 새 클라이언트에 기본으로 재전송할 줄 수
+    
+    # 워커/pub-sub 설정 (WEB_WORKERS > 1 이면 PUBSUB_BACKEND=unix 필요)
+    WEB_WORKERS: int = int(os.getenv("WEB_WORKERS", "1"))
+    PUBSUB_BACKEND: str = os.getenv("PUBSUB_BACKEND", "memory")  # memory | unix
+    PUBSUB_SOCKET: str = os.getenv("PUBSUB_SOCKET", "/tmp/trading_system_pubsub.sock")
+    
+    # 봇 워커 설정 (연속 비정상 종료가 한도를 넘으면 재시작 중단)
+    BOT_RESTART_LIMIT: int = int(os.getenv("BOT_RESTART_LIMIT", "5"))
+    # 봇을 실행할 uvicorn 워커 선출용 잠금 파일 (잡은 워커 하나만 봇 실행, 나머지는 버스로 요청 전달)
+    BOT_SUPERVISOR_LOCK: str = os.getenv("BOT_SUPERVISOR_LOCK", "/tmp/trading_system_supervisor.lock")
+    # 실거래 주문은 서버 설정으로만 허용 (False 면 API 로 시작한 봇은 항상 dry-run, 네트워크는 BYBIT_TESTNET)
+    BOT_LIVE_TRADING: bool = os.getenv("BOT_LIVE_TRADING", "False").lower() == "true"
+    # 봇 시작/중지 API 토큰 (X-Bot-Token 헤더) - BOT_LIVE_TRADING 이면 필수
+    BOT_CONTROL_TOKEN: str = os.getenv("BOT_CONTROL_TOKEN", "")
+    # 별도 프로세스로 실행한 봇의 하트비트 파일 디렉토리 (/trading/status 레지스트리가 읽음, 기본값: 프로젝트 루트/.run/bots)
+    BOT_HEARTBEAT_DIR: str = os.getenv("BOT_HEARTBEAT_DIR", os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".run", "bots"))
+    
+    # 거래 저널 CSV 디렉토리 (/api/analytics 자산 곡선, 기본값: 프로젝트 루트의 phase1.3_*.csv)
+    JOURNAL_DIR: str = os.getenv("JOURNAL_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    
+    # HTTP 응답 압축 (이 크기 이상인 JSON/텍스트 응답만, brotli 는 선택 의존성)
+    API_COMPRESS_MIN_SIZE: int = int(os.getenv("API_COMPRESS_MIN_SIZE", "1024"))
+    API_GZIP_LEVEL: int = int(os.getenv("API_GZIP_LEVEL", "4"))  # 실수 배열 위주 본문은 6 과 압축률 차이가 작고 2배 이상 빠름
+    API_BROTLI_QUALITY: int = int(os.getenv("API_BROTLI_QUALITY", "4"))
+    
     # 데이터베이스 설정
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./trading.db")
     
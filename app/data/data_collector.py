@@ -6,6 +6,8 @@ from typing import Dict, Optional, Union
 import pandas as pd
 from pybit.unified_trading import HTTP
 
+from .single_flight import exchange_reads, session_key
+
 class DataCollector:
     """Class for collecting and processing trading data."""
     
@@ -26,6 +28,11 @@ class DataCollector:
         """
         Get kline/candlestick data.
         
+        Concurrent identical requests (in this process and, through the shared
+        cache directory, in other processes) share one exchange call, and a
+        successful result is reused for a short freshness window
+        (see single_flight.py). Each caller gets its own copy of the frame.
+        
         Args:
             interval: Kline interval (e.g., '1', '5', '15', '60', 'D')
             limit: Number of candles to return (max 200)
@@ -33,6 +40,14 @@ class DataCollector:
         Returns:
             DataFrame with OHLCV data or None if request fails
         """
+        namespace = session_key(self.session)
+        key = None if namespace is None else (namespace, 'kline', self.symbol, interval, limit)
+        df = exchange_reads.do(key, lambda: self._fetch_klines(interval, limit),
+                               cache_if=lambda result: result is not None)
+        return df.copy() if df is not None and key is not None else df
+    
+    def _fetch_klines(self, interval: str, limit: int) -> Optional[pd.DataFrame]:
+        """Fetch klines from the exchange (no coalescing)."""
         try:
             response = self.session.get_kline(
                 category="linear",
@@ -50,7 +65,8 @@ class DataCollector:
                 for col in ['open', 'high', 'low', 'close', 'volume', 'turnover']:
                     df[col] = pd.to_numeric(df[col])
                 df['timestamp'] = pd.to_datetime(df['timestamp'].astype('int64'), unit='ms')
-                return df
+                # Bybit returns newest first; indicators expect oldest -> newest
+                return df.sort_values('timestamp').reset_index(drop=True)
             return None
             
         except Exception as e:
@@ -0,0 +1,217 @@
+"""
+Single-flight coalescing for exchange reads.
+
+When several callers ask for the same klines or ticker at the same time, only
+the first one goes to the exchange; the others wait for that in-flight call and
+share its result. Successful results are also kept for a short freshness
+window, so a burst of identical requests right after a fetch costs nothing.
+
+Two levels:
+    in-process  : threads of one process wait on a shared _Call.
+    cross-process: the API, bot workers and tooling scripts are separate
+                   processes, so the leader of each process also takes a
+                   per-key file lock in EXCHANGE_READ_SHARED_DIR. One process
+                   fetches while the others block on the lock, then read the
+                   pickled result it left behind (if still fresh).
+The shared directory must be private to the current user (mode 0700, owned by
+us) because results are unpickled; otherwise cross-process sharing is off.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows - in-process coalescing only
+    fcntl = None
+
+from pybit.unified_trading import HTTP
+
+# Freshness window for successful reads (seconds)
+DEFAULT_TTL = float(os.getenv('EXCHANGE_READ_TTL', '1.0'))
+# Result cache shared between processes ('' disables cross-process sharing)
+DEFAULT_SHARED_DIR = os.getenv('EXCHANGE_READ_SHARED_DIR', os.path.join(
+    tempfile.gettempdir(), f"trading_system_reads_{os.getuid() if hasattr(os, 'getuid') else 'user'}"))
+
+
+def session_key(session) -> Optional[tuple]:
+    """
+    Cache namespace for a session.
+
+    Only live pybit sessions are shared; anything else (e.g. the replay
+    SimulatedExchange, whose answers depend on a virtual clock) returns None
+    and bypasses coalescing.
+    """
+    if not isinstance(session, HTTP):
+        return None
+    return (session.testnet, session.demo, session.domain, session.tld)
+
+
+class _Call:
+    """One in-flight call that other callers can wait on."""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight group with a short result cache, optionally shared across processes."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = 256,
+                 clock: Callable[[], float] = time.monotonic,
+                 shared_dir: Optional[str] = DEFAULT_SHARED_DIR):
+        """
+        Args:
+            ttl: How long a successful result is served without a new call (seconds)
+            max_entries: Maximum number of cached results (oldest evicted first)
+            clock: Monotonic time source
+            shared_dir: Directory for the cross-process lock/result files (None or '' = this process only)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.shared_dir = shared_dir or None
+        self._shared_ok: Optional[bool] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Call] = {}
+        self._results: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.shared_hits = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any],
+           cache_if: Callable[[Any], bool] = bool) -> Any:
+        """
+        Run fn() once for all concurrent callers with the same key.
+
+        Args:
+            key: Request identity (None disables coalescing for this call)
+            fn: The actual exchange call
+            cache_if: Whether a result may be reused (failures such as None/0
+                      are shared with waiting callers but never cached)
+
+        Defaults to bool, which would also refuse legitimate falsy results,
+        so callers whose failure value is not simply "falsy" should pass it.
+        """
+        if key is None:
+            return fn()
+
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and self.clock() - cached[0] < self.ttl:
+                self.hits += 1
+                return cached[1]
+
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = self._shared(key, fn, cache_if) if self._use_shared() else fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if call.error is None and cache_if(call.value):
+                    self._results[key] = (self.clock(), call.value)
+                    self._results.move_to_end(key)
+                    if len(self._results) > self.max_entries:
+                        self._results.popitem(last=False)
+            call.done.set()
+        return call.value
+
+    def _use_shared(self) -> bool:
+        """Whether the shared directory exists (created on first use) and is private to us."""
+        if self._shared_ok is None:
+            ok = False
+            if self.shared_dir and fcntl is not None:
+                try:
+                    os.makedirs(self.shared_dir, mode=0o700, exist_ok=True)
+                    st = os.stat(self.shared_dir)
+                    ok = st.st_uid == os.getuid() and not st.st_mode & 0o077
+                except OSError:
+                    pass
+            self._shared_ok = ok
+        return self._shared_ok
+
+    def _shared(self, key: Hashable, fn: Callable[[], Any], cache_if: Callable[[Any], bool]) -> Any:
+        """
+        Cross-process single flight for one key (called by the in-process leader only).
+
+        Holds the key's file lock while checking the shared result and, on a
+        miss, while calling fn(), so other processes asking for the same key
+        wait and then reuse the stored result instead of calling the exchange.
+        """
+        path = os.path.join(self.shared_dir, hashlib.sha1(repr(key).encode()).hexdigest())
+        try:
+            lock = open(path + '.lock', 'a')
+        except OSError:
+            return fn()
+
+        with lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(path, 'rb') as f:
+                    stored_at, value = pickle.load(f)
+                if 0 <= time.time() - stored_at < self.ttl:
+                    with self._lock:
+                        self.shared_hits += 1
+                    return value
+            except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+                pass
+
+            value = fn()
+            if cache_if(value):
+                tmp = f'{path}.{os.getpid()}.tmp'
+                try:
+                    with open(tmp, 'wb') as f:
+                        pickle.dump((time.time(), value), f, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(tmp, path)
+                except OSError:
+                    pass
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses + self.coalesced
+        return {
+            'requests': total,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'shared_hits': self.shared_hits,
+            'hit_rate': self.hits / total if total else 0.0,
+            'coalesce_rate': self.coalesced / total if total else 0.0,
+            'cached': len(self._results),
+            'inflight': len(self._inflight)
+        }
+
+
+# Shared by every DataCollector / OrderManager in this process (and, through
+# EXCHANGE_READ_SHARED_DIR, with the other processes of this user)
+exchange_reads = SingleFlight()
@@ -0,0 +1,346 @@
+"""
+Append-only trade and position journal (SQLite).
+
+Rows use the same columns as phase1.3_*_trades.csv / phase1.3_*_positions.csv
+(and BacktestEngine output), plus a few live-only fields (symbol, env, prices,
+quantity, PnL). Times are stored as UTC epoch milliseconds so that range
+filters and cursors are plain integer index scans.
+
+Writers (the bot) only append to an in-memory queue; a background thread
+drains it and inserts whatever has accumulated in one transaction, so the
+exit path never waits on disk. Readers (the API) open their own connections;
+the database runs in WAL mode so reads never block the writer and several
+bot processes can share one file.
+"""
+import base64
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Default database file (project root/.run/trade_journal.db, override with TRADE_JOURNAL_PATH)
+DEFAULT_PATH = Path(__file__).resolve().parent.parent.parent / ".run" / "trade_journal.db"
+
+# phase1.3 CSV schema (BacktestEngine writes the same columns)
+TRADE_COLUMNS = [
+    'entry_time', 'exit_time', 'engine', 'portion', 'net_ret_1x', 'reason', 'tp1_pct',
+    'size', 'regime', 'quality', 'vol_regime', 'atr_ratio', 'trailing_pct'
+]
+POSITION_COLUMNS = [
+    'engine', 'net_pos_1x', 'entry_time', 'size', 'regime', 'quality', 'vol_regime', 'atr_ratio'
+]
+
+# Trailing-stop exit reason labels (same as phase1.3 CSV)
+TRAILING_LABELS = {
+    "ULTRA_LOW": "TRAIL-저변동",
+    "LOW": "TRAIL-저변동",
+    "NORMAL": "TRAIL-중변동",
+    "HIGH": "TRAIL-고변동",
+    "ULTRA_HIGH": "TRAIL-고변동"
+}
+
+# Live-only columns appended after the CSV schema
+TRADE_EXTRA_COLUMNS = ['symbol', 'env', 'qty', 'entry_price', 'exit_price', 'pnl']
+POSITION_EXTRA_COLUMNS = ['symbol', 'env', 'exit_time', 'qty', 'entry_price', 'pnl']
+
+TABLES = {
+    'trades': {
+        'columns': TRADE_COLUMNS + TRADE_EXTRA_COLUMNS,
+        'time': 'exit_time',
+        'filters': ('symbol', 'reason'),
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS trades (
+                id INTEGER PRIMARY KEY,
+                entry_time INTEGER, exit_time INTEGER NOT NULL, engine TEXT, portion REAL,
+                net_ret_1x REAL, reason TEXT, tp1_pct REAL, size REAL, regime TEXT, quality REAL,
+                vol_regime TEXT, atr_ratio REAL, trailing_pct REAL,
+                symbol TEXT, env TEXT, qty REAL, entry_price REAL, exit_price REAL, pnl REAL
+            );
+            CREATE INDEX IF NOT EXISTS trades_time ON trades (exit_time, id);
+            CREATE INDEX IF NOT EXISTS trades_symbol_time ON trades (symbol, exit_time, id);
+            CREATE INDEX IF NOT EXISTS trades_reason_time ON trades (reason, exit_time, id);
+        """
+    },
+    'positions': {
+        'columns': POSITION_COLUMNS + POSITION_EXTRA_COLUMNS,
+        'time': 'entry_time',
+        'filters': ('symbol',),
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS positions (
+                id INTEGER PRIMARY KEY,
+                engine TEXT, net_pos_1x REAL, entry_time INTEGER NOT NULL, size REAL, regime TEXT,
+                quality REAL, vol_regime TEXT, atr_ratio REAL,
+                symbol TEXT, env TEXT, exit_time INTEGER, qty REAL, entry_price REAL, pnl REAL
+            );
+            CREATE INDEX IF NOT EXISTS positions_time ON positions (entry_time, id);
+            CREATE INDEX IF NOT EXISTS positions_symbol_time ON positions (symbol, entry_time, id);
+        """
+    }
+}
+
+TIME_COLUMNS = ('entry_time', 'exit_time')
+
+
+def journal_path() -> Path:
+    return Path(os.getenv('TRADE_JOURNAL_PATH', str(DEFAULT_PATH)))
+
+
+def to_ms(value) -> Optional[int]:
+    """
+    datetime / pandas Timestamp / epoch ms -> epoch ms.
+
+    Naive datetimes follow datetime.timestamp() (local time, which is what
+    SystemClock.now() returns); naive pandas Timestamps are UTC.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(value.timestamp() * 1000)
+
+
+def format_time(ms: Optional[int]) -> Optional[str]:
+    """epoch ms -> '2024-01-10 15:00:00+00:00' (the CSV format)."""
+    if ms is None:
+        return None
+    return str(datetime.fromtimestamp(ms / 1000, tz=timezone.utc))
+
+
+def _sql_value(value):
+    """numpy scalars -> Python values (sqlite3 cannot bind np.int64)."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def connect(path=None, readonly: bool = False) -> sqlite3.Connection:
+    """Open the journal database, creating the schema when writable."""
+    path = Path(path or journal_path())
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for table in TABLES.values():
+            conn.executescript(table['ddl'])
+    return conn
+
+
+class TradeJournal:
+    """
+    Non-blocking journal writer.
+
+    record_trade()/record_position() only enqueue the row; a daemon thread
+    started on first use inserts queued rows in batches.
+    """
+
+    def __init__(self, path=None, batch_size: int = 1000, retry_delay: float = 1.0, max_retries: int = 5):
+        """
+        Args:
+            path: Database file (None uses TRADE_JOURNAL_PATH / DEFAULT_PATH)
+            batch_size: Maximum rows per transaction
+            retry_delay: Wait before retrying a failed batch (seconds)
+            max_retries: Attempts per batch before it is dropped
+        """
+        self.path = Path(path or journal_path())
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.dropped = 0
+
+    def record_trade(self, row: Dict[str, Any]):
+        """Queue one exit (a full or partial close)."""
+        self._put('trades', row)
+
+    def record_position(self, row: Dict[str, Any]):
+        """Queue one closed position (sum of its exits)."""
+        self._put('positions', row)
+
+    def _put(self, table: str, row: Dict[str, Any]):
+        if self._thread is None:
+            self._start()
+        with self._idle:
+            self._pending += 1
+        self._queue.put((table, row))
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trade-journal", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        conn = None
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    if conn is None:
+                        conn = connect(self.path)
+                    self._write(conn, batch)
+                    break
+                except Exception as e:
+                    # Keep the batch and retry (e.g. the file is locked by another writer)
+                    self.errors += 1
+                    print(f"Trade journal write failed ({attempt}/{self.max_retries}): {e}", flush=True)
+                    if conn is not None:
+                        conn.close()
+                        conn = None
+                    if attempt < self.max_retries:
+                        time.sleep(self.retry_delay)
+            else:
+                self.dropped += len(batch)
+
+            with self._idle:
+                self._pending -= len(batch)
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+    def _write(self, conn: sqlite3.Connection, batch: List[Tuple[str, Dict[str, Any]]]):
+        grouped: Dict[str, list] = {}
+        for table, row in batch:
+            columns = TABLES[table]['columns']
+            grouped.setdefault(table, []).append(tuple(
+                to_ms(row.get(c)) if c in TIME_COLUMNS else _sql_value(row.get(c)) for c in columns
+            ))
+        with conn:
+            for table, rows in grouped.items():
+                columns = TABLES[table]['columns']
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    rows
+                )
+        self.written += len(batch)
+        self.batches += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued row is written (True if the queue drained in time)."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pending': self._pending,
+            'written': self.written,
+            'batches': self.batches,
+            'errors': self.errors,
+            'dropped': self.dropped
+        }
+
+
+def encode_cursor(time_ms: int, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{time_ms}:{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Raises ValueError for a malformed cursor."""
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    time_ms, row_id = raw.split(":")
+    return int(time_ms), int(row_id)
+
+
+class TradeJournalReader:
+    """
+    Keyset-paginated queries (newest first).
+
+    Each page is one index range scan starting after the cursor's (time, id),
+    so page cost does not grow with table size or page depth.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or journal_path())
+        self._local = threading.local()
+
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if not self.path.exists():
+                return None
+            conn = self._local.conn = connect(self.path, readonly=True)
+        return conn
+
+    def page(self, table: str, limit: int = 100, cursor: Optional[str] = None,
+             start: Optional[int] = None, end: Optional[int] = None,
+             **filters: Optional[str]) -> Dict[str, Any]:
+        """
+        One page of rows, newest first.
+
+        Args:
+            table: 'trades' (ordered by exit_time) or 'positions' (by entry_time)
+            limit: Page size
+            cursor: next_cursor from the previous page
+            start, end: Time range (epoch ms, inclusive)
+            filters: Exact-match filters (trades: symbol, reason / positions: symbol)
+
+        Returns:
+            dict: columns, rows (times as CSV-style strings), next_cursor (None on the last page)
+        """
+        spec = TABLES[table]
+        time_column = spec['time']
+        columns = spec['columns']
+
+        where, params = [], []
+        for name, value in filters.items():
+            if name not in spec['filters']:
+                raise ValueError(f"unknown filter for {table}: {name}")
+            if value is not None:
+                where.append(f"{name} = ?")
+                params.append(value)
+        if start is not None:
+            where.append(f"{time_column} >= ?")
+            params.append(start)
+        if end is not None:
+            where.append(f"{time_column} <= ?")
+            params.append(end)
+        if cursor:
+            where.append(f"({time_column}, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        sql = f"SELECT id, {', '.join(columns)} FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {time_column} DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        conn = self._conn()
+        fetched = conn.execute(sql, params).fetchall() if conn is not None else []
+
+        has_more = len(fetched) > limit
+        fetched = fetched[:limit]
+        time_index = columns.index(time_column) + 1
+        next_cursor = encode_cursor(fetched[-1][time_index], fetched[-1][0]) if has_more else None
+
+        time_positions = [i for i, c in enumerate(columns) if c in TIME_COLUMNS]
+        rows = []
+        for record in fetched:
+            row = list(record[1:])
+            for i in time_positions:
+                row[i] = format_time(row[i])
+            rows.append(row)
+        return {'columns': columns, 'rows': rows, 'next_cursor': next_cursor}
+
+
+# Shared by the API (read-only connections, one per thread)
+journal_reader = TradeJournalReader()
@@ -5,7 +5,6 @@ import asyncio
 import logging
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 import logging
 from typing import Callable
 
@@ -15,7 +14,8 @@ logger = logging.getLogger(__name__)
 # .config, .websocket.log_manager, .utils.websocket_logger, .api.endpoints 임포트는 환경에 따라 필요
 from .websocket.log_manager import log_manager
 from .utils.websocket_logger import websocket_logger
-from .api.endpoints import trading
+from .api.endpoints import trading, metrics
+from .api.responses import FastJSONResponse, CompressionMiddleware
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -23,7 +23,8 @@ app = FastAPI(
     description="암호화폐 트레이딩 시스템 백엔드 API",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
 # 애플리케이션 이벤트 핸들러
@@ -35,6 +36,17 @@ async def startup_event():
         from .websocket.log_manager import log_manager
         from .utils.websocket_logger import initialize_logger
         
+        # 워커 간 pub/sub 버스 연결 (여러 uvicorn 워커에서 브로드캐스트 공유)
+        from .websocket.pubsub import bus
+        from .websocket.connection_manager import manager
+        from .websocket.market_stream import market_stream
+        await bus.start()
+        log_manager.attach_bus(bus)
+        manager.attach_bus(bus)
+        market_stream.attach_bus(bus)
+        from .services.bot_supervisor import bot_supervisor
+        bot_supervisor.attach_bus(bus)
+        
         # 로그 매니저 시작
         await log_manager.start()
         logger.info("WebSocket log manager started")
@@ -42,9 +54,13 @@ async def startup_event():
         # WebSocket 로거 초기화
         await initialize_logger()
         
+        # 실시간 시장/포지션 스트림 시작 (봇 publish -> /ws/trading 구독자)
+        await market_stream.start()
+        
         # 트레이딩 서비스 초기화
         from .services.trading_bot_service import get_trading_bot_service
         bot_service = get_trading_bot_service()
+        await bot_service.supervisor.start()
         logger.info("Trading bot service initialized")
         
     except Exception as e:
@@ -59,9 +75,19 @@ async def shutdown_event():
         from .utils.websocket_logger import cleanup_logger
         from .websocket.log_manager import log_manager
         
+        # 봇 워커 중지 (실행 중인 워커 종료 대기 후 감시 종료)
+        from .services.bot_supervisor import bot_supervisor
+        await bot_supervisor.stop()
+        
         # WebSocket 로거 정리
         await cleanup_logger()
         
+        # 시장 스트림 / pub-sub 버스 정리
+        from .websocket.market_stream import market_stream
+        from .websocket.pubsub import bus
+        await market_stream.stop()
+        await bus.stop()
+        
         # WebSocket 로그 매니저 정리
         await log_manager.stop()
         logger.info("WebSocket log manager stopped")
@@ -80,6 +106,9 @@ app.add_middleware(
     max_age=600,
 )
 
+# 응답 압축 (Accept-Encoding 에 따라 br/gzip, API_COMPRESS_MIN_SIZE 이상인 JSON/텍스트 응답)
+app.add_middleware(CompressionMiddleware)
+
 # 라우터 등록
 from .api import api_router
 from .websocket import routes as ws_routes
@@ -87,6 +116,7 @@ from .websocket import routes as ws_routes
 app.include_router(trading.router, prefix="/trading", tags=["trading"])
 app.include_router(api_router, prefix="/api")
 app.include_router(ws_routes.router, prefix="/ws") # 웹소켓 라우터 등록
+app.include_router(metrics.router, tags=["metrics"])  # Prometheus 수집 (/metrics)
 
 # CORS 헤더를 추가하는 미들웨어
 @app.middleware("http")
@@ -111,7 +141,7 @@ async def add_cors_headers(request: Request, call_next: Callable):
 # OPTIONS 메서드 핸들러
 @app.options("/{full_path:path}", include_in_schema=False)
 async def options_handler(full_path: str):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=200,
         headers={
             "Access-Control-Allow-Origin": "*",
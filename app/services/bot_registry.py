@@ -0,0 +1,220 @@
+"""
+봇 레지스트리 - /trading/status 가 프로세스 목록을 훑지 않고 봇 상태를 응답하도록 관리
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import logging
+
+from ..config import settings
+from ..trading.heartbeat import process_started_at
+
+logger = logging.getLogger(__name__)
+
+# 하트비트 디렉토리 재검사 주기 (초) - 그 사이 요청은 캐시된 결과로 응답
+SCAN_INTERVAL = 1.0
+# 마지막 사이클 후 check_interval * STALE_FACTOR + STALE_GRACE 초가 지나면 stale
+STALE_FACTOR = 2
+STALE_GRACE = 60
+# 하트비트의 프로세스 생성 시각과 현재 pid 의 생성 시각 허용 차이 (초)
+PID_START_TOLERANCE = 1.0
+
+
+def pid_alive(pid: Optional[int]) -> bool:
+    """프로세스 생존 여부 (시그널 0 전송 - 프로세스 목록 순회 없음)"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def heartbeat_process_alive(state: Dict[str, Any]) -> bool:
+    """
+    하트비트를 쓴 프로세스가 아직 실행 중인지
+
+    pid 만 보면 비정상 종료한 봇의 pid 가 다른 프로세스에 재사용됐을 때 죽은 봇이 실행 중으로 보이므로,
+    하트비트에 기록된 프로세스 생성 시각과 현재 그 pid 의 생성 시각을 비교합니다
+    (어느 쪽이든 알 수 없으면 - 이전 형식 파일, psutil 없음 - pid 생존 여부만 사용).
+    """
+    pid = state.get("pid")
+    if not pid_alive(pid):
+        return False
+    recorded = state.get("pid_started_at")
+    if recorded is None:
+        return True
+    current = process_started_at(pid)
+    return current is None or abs(current - recorded) <= PID_START_TOLERANCE
+
+
+def health_of(status: str, last_cycle_at: Optional[float], started_at: Optional[float],
+              check_interval: Optional[float], now: float) -> str:
+    """
+    봇 건강 상태
+        healthy  : 실행 중이고 최근 사이클이 기한 내
+        starting : 실행 중이지만 아직 첫 사이클 전 (시작 후 기한 내)
+        stale    : 사이클이 기한을 넘겨 멈춘 것으로 보임
+        stopped  : 중지됨 / 프로세스 없음
+    """
+    if status != "running":
+        return "stopped"
+    deadline = (check_interval or 300) * STALE_FACTOR + STALE_GRACE
+    if last_cycle_at is None:
+        return "starting" if started_at and now - started_at < deadline else "stale"
+    return "healthy" if now - last_cycle_at < deadline else "stale"
+
+
+class BotRegistry:
+    """
+    봇 상태 레지스트리
+    
+    - 같은 프로세스의 봇: TradingBotService 가 register/unregister (봇 객체 속성을 그대로 읽음)
+    - 별도 프로세스의 봇: 하트비트 파일 (trading/heartbeat.py) - 디렉토리는 SCAN_INTERVAL 마다 한 번만
+      검사하고 수정 시각이 바뀐 파일만 다시 읽습니다.
+    """
+    
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory if directory else settings.BOT_HEARTBEAT_DIR)
+        self.local: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, Any] = {}  # 경로 -> (mtime, state)
+        self._external: List[Dict[str, Any]] = []
+        self._scanned_at = 0.0
+    
+    # ------------------------------------------------------------------
+    # 같은 프로세스의 봇
+    # ------------------------------------------------------------------
+    
+    def register(self, bot_id: str, bot: Any, **info):
+        """서비스가 시작한 봇 등록 (bot 은 last_cycle_at/cycle/last_error 속성을 가진 LiveTradingBot)"""
+        self.local[bot_id] = {"bot": bot, "started_at": time.time(), "status": "running", **info}
+    
+    def update(self, bot_id: str, **info):
+        if bot_id in self.local:
+            self.local[bot_id].update(info)
+    
+    def unregister(self, bot_id: str):
+        self.local.pop(bot_id, None)
+    
+    # ------------------------------------------------------------------
+    # 별도 프로세스의 봇 (하트비트 파일)
+    # ------------------------------------------------------------------
+    
+    def _scan(self, now: float) -> List[Dict[str, Any]]:
+        if now - self._scanned_at < SCAN_INTERVAL:
+            return self._external
+        self._scanned_at = now
+        
+        files = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            entries = []
+        
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+                cached = self._files.get(entry.path)
+                if cached and cached[0] == mtime:
+                    files[entry.path] = cached
+                    continue
+                with open(entry.path) as f:
+                    files[entry.path] = (mtime, json.load(f))
+            except (OSError, ValueError) as e:
+                logger.debug(f"하트비트 파일 읽기 실패 {entry.path}: {e}")
+        
+        self._files = files
+        self._external = [state for _, state in files.values()]
+        return self._external
+    
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    
+    def bots(self) -> List[Dict[str, Any]]:
+        """모든 봇 상태 (건강 상태 포함)"""
+        now = time.time()
+        result = []
+        
+        for bot_id, entry in self.local.items():
+            bot = entry["bot"]
+            last_cycle_at = getattr(bot, "last_cycle_at", None)
+            check_interval = getattr(bot, "check_interval", None)
+            status = entry["status"]
+            result.append({
+                "bot_id": bot_id,
+                "source": entry.get("source", "service"),
+                "pid": entry.get("pid", os.getpid()),
+                "symbol": getattr(bot, "symbol", entry.get("symbol")),
+                "dry_run": getattr(bot, "dry_run", entry.get("dry_run")),
+                "status": status,
+                "health": health_of(status, last_cycle_at, entry["started_at"], check_interval, now),
+                "started_at": entry["started_at"],
+                "last_cycle_at": last_cycle_at,
+                "cycle": getattr(bot, "cycle", 0),
+                "has_position": getattr(bot, "position", None) is not None,
+                "last_error": getattr(bot, "last_error", None) or entry.get("last_error")
+            })
+        
+        for state in self._scan(now):
+            status = state.get("status", "stopped")
+            if status == "running" and not heartbeat_process_alive(state):
+                status = "stopped"  # 비정상 종료로 파일만 남은 경우 (pid 재사용 포함)
+            result.append({
+                "bot_id": state.get("bot_id"),
+                "source": "heartbeat",
+                "pid": state.get("pid"),
+                "symbol": state.get("symbol"),
+                "dry_run": state.get("dry_run"),
+                "status": status,
+                "health": health_of(status, state.get("last_cycle_at"), state.get("started_at"),
+                                    state.get("check_interval"), now),
+                "started_at": state.get("started_at"),
+                "last_cycle_at": state.get("last_cycle_at"),
+                "cycle": state.get("cycle", 0),
+                "has_position": state.get("has_position", False),
+                "last_error": state.get("last_error")
+            })
+        
+        return result
+    
+    def is_running(self) -> bool:
+        return any(b["status"] == "running" for b in self.bots())
+    
+    def status(self) -> Dict[str, Any]:
+        """
+        /trading/status 응답 본문
+        
+        health: 실행 중인 봇이 없으면 stopped, 하나라도 stale 이면 degraded,
+                첫 사이클 전인 봇이 있으면 starting, 그 외 healthy
+        """
+        bots = self.bots()
+        running = [b for b in bots if b["status"] == "running"]
+        
+        if not running:
+            health = "stopped"
+        elif any(b["health"] == "stale" for b in running):
+            health = "degraded"
+        elif any(b["health"] == "starting" for b in running):
+            health = "starting"
+        else:
+            health = "healthy"
+        
+        return {
+            "is_running": bool(running),
+            "status": "running" if running else "stopped",
+            "health": health,
+            "bots": bots
+        }
+
+
+bot_registry = BotRegistry()
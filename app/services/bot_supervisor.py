@@ -0,0 +1,550 @@
+"""
+봇 워커 감독자 - 봇을 심볼/전략 설정별 자식 프로세스로 실행하고 감시
+
+봇 하나당 프로세스 하나 (trading/bot_worker.py) 이므로 지표 계산이 API 프로세스와 GIL 을 다투지 않습니다.
+워커와는 Pipe 하나로 통신하며, 이벤트 루프가 파이프를 직접 감시(add_reader)해 받은 메시지를 전달합니다.
+    log    -> log_manager (워커 심볼 태그, /ws/logs)
+    kline  -> market_stream.publish_candles (/ws/trading)
+    state  -> market_stream.publish_state
+    status -> 워커 상태 갱신 (봇 레지스트리가 그대로 읽음)
+
+비정상 종료한 워커는 지수 백오프로 재시작하고, 연속 실패가 BOT_RESTART_LIMIT 를 넘으면 failed 로 둡니다.
+워커별 CPU/메모리는 감시 주기마다 psutil 로 측정합니다 (psutil 이 없으면 None).
+
+uvicorn 워커가 여러 개(WEB_WORKERS > 1)면 잠금 파일(BOT_SUPERVISOR_LOCK)을 잡은 프로세스 하나만 리더로
+봇을 실행합니다. 나머지(팔로워)는 시작/중지 요청을 pub/sub 버스로 리더에게 넘기고, 리더가 감시 주기마다
+보내는 상태 스냅샷으로 workers / 봇 레지스트리 / 메트릭을 채웁니다. 리더가 종료되면 팔로워 중 하나가 잠금을 이어받습니다.
+    bot.control : 팔로워 -> 리더  {"id", "from", "op": start|stop, ...}
+    bot.reply   : 리더 -> 팔로워  {"id", "to", "ok" | "error", ...}
+    bot.status  : 리더 -> 팔로워  {"at", "workers": [{"worker", "registry", "metrics"}]}
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows - 여러 uvicorn 워커를 지원하지 않으므로 항상 리더
+    fcntl = None
+
+try:
+    import psutil
+except ImportError:  # 선택 의존성 - 없으면 리소스 사용량 생략
+    psutil = None
+
+from ..config import settings
+from ..trading.bot_worker import run_worker
+from ..utils.websocket_logger import infer_level
+from ..websocket.log_manager import log_manager
+from ..websocket.market_stream import market_stream
+from .bot_registry import bot_registry
+
+logger = logging.getLogger(__name__)
+
+# 워커 생존/재시작/리소스 확인 주기 (초)
+SUPERVISE_INTERVAL = 1.0
+# 재시작 대기 시간 상한 (초) - 1, 2, 4, ... 초로 늘어남
+MAX_RESTART_BACKOFF = 60
+# 이 시간 이상 살아 있으면 연속 실패 횟수 초기화 (초)
+STABLE_AFTER = 600
+# 이벤트 루프 콜백 한 번에 처리할 최대 메시지 수 (나머지는 다음 콜백)
+MAX_MESSAGES_PER_READ = 500
+# 팔로워: 이 시간 동안 리더 스냅샷이 없으면 원격 워커 목록을 비움 (초)
+LEADER_TIMEOUT = 5.0
+# 팔로워: 리더 응답 대기 시간 (초) - 중지 요청은 워커 종료 대기 시간을 더함
+REQUEST_TIMEOUT = 10.0
+
+# uvicorn 프로세스(이벤트 루프, 스레드)를 fork 하지 않도록 spawn 사용
+_mp = multiprocessing.get_context("spawn")
+
+
+class BotWorker:
+    """
+    워커 프로세스 하나의 상태
+
+    봇 레지스트리가 LiveTradingBot 과 같은 속성(symbol, dry_run, cycle, last_cycle_at,
+    check_interval, position, last_error)을 읽으므로 같은 이름으로 둡니다.
+    """
+
+    def __init__(self, worker_id: str, config: Dict[str, Any]):
+        self.worker_id = worker_id
+        self.config = config
+        self.symbol = config["symbol"]
+        self.dry_run = config.get("dry_run", True)
+        self.state = "starting"  # starting | running | restarting | stopping | stopped | failed
+        self.process = None
+        self.conn = None
+        self.pid: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+        self.failures = 0  # 연속 비정상 종료 횟수
+        self.restart_at: Optional[float] = None
+        self.exit_reason: Optional[str] = None
+        self.messages = 0
+
+        # 워커가 보내는 실행 상태
+        self.cycle = 0
+        self.last_cycle_at: Optional[float] = None
+        self.check_interval: Optional[float] = None
+        self.position: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self.exchange_reads: Optional[Dict[str, Any]] = None  # 워커 프로세스의 single-flight 통계
+        self.metrics: Optional[List[tuple]] = None  # 워커 프로세스의 메트릭 스냅샷 (/metrics 전용, to_dict 제외)
+
+        # 리소스 사용량
+        self._ps = None
+        self.cpu_percent: Optional[float] = None
+        self.memory_rss: Optional[int] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "symbol": self.symbol,
+            "config": self.config,
+            "state": self.state,
+            "pid": self.pid,
+            "started_at": self.started_at,
+            "restarts": self.restarts,
+            "exit_reason": self.exit_reason,
+            "cycle": self.cycle,
+            "last_cycle_at": self.last_cycle_at,
+            "check_interval": self.check_interval,
+            "position": self.position,
+            "last_error": self.last_error,
+            "cpu_percent": self.cpu_percent,
+            "memory_rss": self.memory_rss,
+            "exchange_reads": self.exchange_reads,
+            "messages": self.messages
+        }
+
+
+class RemoteWorker:
+    """
+    리더 프로세스가 실행 중인 워커 (팔로워에서 상태 스냅샷으로 만든 읽기 전용 사본)
+
+    BotWorker.to_dict() 필드를 같은 이름의 속성으로 두므로 봇 레지스트리 / 메트릭이 그대로 읽습니다.
+    """
+
+    def __init__(self, data: Dict[str, Any], metrics: Optional[List[tuple]] = None):
+        self._data = data
+        self.__dict__.update(data)
+        self.dry_run = (data.get("config") or {}).get("dry_run", True)
+        self.metrics = metrics
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+
+def _encode_metrics(snapshot: Optional[List[tuple]]) -> Optional[list]:
+    """메트릭 스냅샷을 JSON 으로 보낼 수 있게 변환 (레이블 튜플 키 -> [레이블 값, 값] 목록)"""
+    if snapshot is None:
+        return None
+    return [[name, kind, help, list(labelnames), list(buckets), [[list(k), v] for k, v in samples.items()]]
+            for name, kind, help, labelnames, buckets, samples in snapshot]
+
+
+def _decode_metrics(data: Optional[list]) -> Optional[List[tuple]]:
+    if data is None:
+        return None
+    return [(name, kind, help, tuple(labelnames), tuple(buckets),
+             {tuple(k): tuple(v) if kind == "histogram" else v for k, v in samples})
+            for name, kind, help, labelnames, buckets, samples in data]
+
+
+class BotSupervisor:
+    """봇 워커 프로세스 감독자 (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, publisher=market_stream, restart_limit: Optional[int] = None,
+                 lock_path: Optional[str] = None):
+        self.publisher = publisher
+        self.restart_limit = restart_limit if restart_limit is not None else settings.BOT_RESTART_LIMIT
+        self.lock_path = lock_path if lock_path is not None else settings.BOT_SUPERVISOR_LOCK
+        self.workers: Dict[str, Any] = {}  # 리더: BotWorker, 팔로워: RemoteWorker
+        self.leader = False
+        self.bus = None
+        self._lock_file = None
+        self._requests: Dict[str, asyncio.Future] = {}
+        self._snapshot_at = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+
+    def attach_bus(self, bus):
+        """워커 간 pub/sub 버스 연결 (리더: 요청 처리 / 팔로워: 응답과 상태 수신)"""
+        self.bus = bus
+        bus.subscribe("bot.control", self._on_control)
+        bus.subscribe("bot.reply", self._on_reply)
+        bus.subscribe("bot.status", self._on_status)
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        if self._task is None:
+            self._try_lead()
+            self._task = asyncio.create_task(self._supervise())
+        logger.info(f"Bot supervisor started ({'leader' if self.leader else 'follower'})")
+
+    async def stop(self):
+        """모든 워커 중지 후 감시 종료 (팔로워는 리더의 워커를 건드리지 않음)"""
+        if self.leader:
+            await asyncio.gather(*(self.stop_worker(w) for w in list(self.workers)))
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._release()
+        logger.info("Bot supervisor stopped")
+
+    def _try_lead(self) -> bool:
+        """잠금 파일을 잡으면 리더 (잡지 못하면 다음 감시 주기에 다시 시도)"""
+        if self.leader:
+            return True
+        if fcntl is None:
+            self.leader = True
+            return True
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        self.leader = True
+        # 이전 리더의 스냅샷으로 만든 원격 워커 정리 (리더가 종료되면 그 워커들도 파이프가 끊겨 종료됨)
+        for worker_id in list(self.workers):
+            bot_registry.unregister(worker_id)
+        self.workers = {}
+        logger.info(f"봇 감독 리더 선출 (pid {os.getpid()})")
+        return True
+
+    def _release(self):
+        if self._lock_file is not None:
+            self._lock_file.close()  # 닫으면 잠금 해제
+            self._lock_file = None
+        self.leader = False
+
+    # ------------------------------------------------------------------
+    # 워커 제어
+    # ------------------------------------------------------------------
+
+    async def start_worker(self, worker_id: str, config: Dict[str, Any]):
+        """워커 시작 (같은 ID 의 워커가 살아 있으면 ValueError, 팔로워는 리더에게 요청)"""
+        if self._task is None:
+            await self.start()
+        if not self.leader:
+            reply = await self._request("start", REQUEST_TIMEOUT, worker_id=worker_id, config=config)
+            return RemoteWorker(reply["worker"])
+
+        existing = self.workers.get(worker_id)
+        if existing and existing.state not in ("stopped", "failed"):
+            raise ValueError(f"이미 실행 중인 워커입니다: {worker_id}")
+
+        worker = BotWorker(worker_id, config)
+        self._spawn(worker)
+        self.workers[worker_id] = worker
+        bot_registry.register(worker_id, worker, source="worker", pid=worker.pid,
+                              symbol=worker.symbol, dry_run=worker.dry_run)
+        return worker
+
+    async def stop_worker(self, worker_id: str, timeout: float = 60) -> bool:
+        """
+        워커 중지 요청 후 종료 대기 (이벤트 루프는 막지 않음)
+
+        timeout 안에 끝나지 않으면 terminate -> kill 순으로 강제 종료합니다.
+        """
+        if not self.leader:
+            reply = await self._request("stop", timeout + REQUEST_TIMEOUT, worker_id=worker_id, timeout=timeout)
+            return reply["stopped"]
+
+        worker = self.workers.get(worker_id)
+        if worker is None:
+            return False
+
+        worker.state = "stopping"
+        if worker.alive:
+            try:
+                worker.conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+            await asyncio.to_thread(worker.process.join, timeout)
+            if worker.alive:
+                logger.warning(f"봇 워커 {worker_id} 가 {timeout}초 안에 종료되지 않아 강제 종료합니다")
+                worker.process.terminate()
+                await asyncio.to_thread(worker.process.join, 5)
+                if worker.alive:
+                    worker.process.kill()
+                    await asyncio.to_thread(worker.process.join, 5)
+
+        self._drain(worker)
+        self._close(worker)
+        worker.state = "stopped"
+        self.workers.pop(worker_id, None)
+        bot_registry.unregister(worker_id)
+        return True
+
+    def _spawn(self, worker: BotWorker):
+        parent_conn, child_conn = _mp.Pipe()
+        process = _mp.Process(target=run_worker, args=(worker.config, child_conn),
+                              name=f"bot-worker-{worker.worker_id}", daemon=True)
+        process.start()
+        child_conn.close()  # 부모 쪽 사본을 닫아야 자식 종료 시 EOF 를 받음
+
+        worker.process = process
+        worker.conn = parent_conn
+        worker.pid = process.pid
+        worker.started_at = time.time()
+        worker.state = "running"
+        worker.restart_at = None
+        worker.cycle = 0
+        worker.last_cycle_at = None
+        worker.position = None
+        worker._ps = psutil.Process(process.pid) if psutil else None
+        if worker._ps:
+            worker._ps.cpu_percent(None)  # 첫 호출은 기준점
+
+        self._loop.add_reader(parent_conn.fileno(), self._on_readable, worker)
+        bot_registry.update(worker.worker_id, pid=worker.pid, started_at=worker.started_at, status="running")
+        logger.info(f"봇 워커 시작: {worker.worker_id} (pid {worker.pid})")
+
+    def _close(self, worker: BotWorker):
+        if worker.conn is not None:
+            try:
+                self._loop.remove_reader(worker.conn.fileno())
+            except (OSError, ValueError):
+                pass
+            worker.conn.close()
+            worker.conn = None
+
+    # ------------------------------------------------------------------
+    # IPC 수신 (이벤트 루프)
+    # ------------------------------------------------------------------
+
+    def _on_readable(self, worker: BotWorker):
+        self._drain(worker, MAX_MESSAGES_PER_READ)
+
+    def _drain(self, worker: BotWorker, limit: Optional[int] = None):
+        conn = worker.conn
+        if conn is None:
+            return
+        count = 0
+        try:
+            while conn.poll():
+                self._handle(worker, conn.recv())
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+        except (EOFError, OSError):
+            # 워커 종료 - 파이프 감시 해제 (종료 처리는 감시 루프에서)
+            self._close(worker)
+
+    def _handle(self, worker: BotWorker, message: tuple):
+        worker.messages += 1
+        kind = message[0]
+        if kind == "log":
+            _, level, line = message
+            log_manager.submit(line, level=infer_level(line, level),
+                               source=f"bot_worker.{worker.worker_id}", symbol=worker.symbol)
+        elif kind == "kline":
+            self.publisher.publish_candles(message[1], message[2])
+        elif kind == "state":
+            self.publisher.publish_state(message[1], message[2])
+        elif kind == "status":
+            status = message[1]
+            worker.cycle = status["cycle"]
+            worker.last_cycle_at = status["last_cycle_at"]
+            worker.check_interval = status["check_interval"]
+            worker.position = status["position"]
+            worker.last_error = status["last_error"]
+            worker.exchange_reads = status.get("exchange_reads")
+            worker.metrics = status.get("metrics")
+        elif kind == "exit":
+            worker.exit_reason = message[1]
+
+    # ------------------------------------------------------------------
+    # 프로세스 간 요청 / 상태 공유 (pub/sub 버스)
+    # ------------------------------------------------------------------
+
+    async def _request(self, op: str, wait: float, **args) -> Dict[str, Any]:
+        """팔로워 -> 리더 요청 (리더의 ValueError 는 ValueError 로, 그 외 실패는 RuntimeError)"""
+        if self.bus is None or not self.bus.has_peers:
+            raise RuntimeError("봇을 실행하는 리더 워커에 연결할 수 없습니다 (WEB_WORKERS > 1 이면 PUBSUB_BACKEND=unix 필요)")
+        request_id = uuid.uuid4().hex
+        future = self._loop.create_future()
+        self._requests[request_id] = future
+        try:
+            self.bus.publish("bot.control", {"id": request_id, "from": self.bus.worker_id, "op": op, **args})
+            reply = await asyncio.wait_for(future, wait)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"봇 리더 워커 응답 없음 ({op}, {wait:.0f}초)")
+        finally:
+            self._requests.pop(request_id, None)
+        if "error" in reply:
+            if reply.get("conflict"):
+                raise ValueError(reply["error"])
+            raise RuntimeError(reply["error"])
+        return reply
+
+    def _on_control(self, request: Dict[str, Any]):
+        if self.leader:
+            asyncio.create_task(self._serve(request))
+
+    async def _serve(self, request: Dict[str, Any]):
+        """리더: 팔로워 요청 실행 후 응답과 최신 상태 전송"""
+        reply = {"id": request["id"], "to": request["from"]}
+        try:
+            if request["op"] == "start":
+                worker = await self.start_worker(request["worker_id"], request["config"])
+                reply["worker"] = worker.to_dict()
+            elif request["op"] == "stop":
+                reply["stopped"] = await self.stop_worker(request["worker_id"], timeout=request["timeout"])
+            else:
+                raise RuntimeError(f"알 수 없는 요청: {request['op']}")
+        except ValueError as e:
+            reply.update(error=str(e), conflict=True)
+        except Exception as e:
+            logger.error(f"봇 제어 요청 처리 실패 ({request.get('op')}): {e}", exc_info=True)
+            reply["error"] = f"{type(e).__name__}: {e}"
+        self.bus.publish("bot.reply", reply)
+        self._publish_status()
+
+    def _on_reply(self, reply: Dict[str, Any]):
+        if self.bus is None or reply.get("to") != self.bus.worker_id:
+            return
+        future = self._requests.get(reply["id"])
+        if future is not None and not future.done():
+            future.set_result(reply)
+
+    def _publish_status(self):
+        """리더: 워커 상태 + 레지스트리 항목 + 메트릭 스냅샷을 팔로워에게 전송"""
+        if self.bus is None or not self.bus.has_peers:
+            return
+        workers = []
+        for worker in self.workers.values():
+            entry = bot_registry.local.get(worker.worker_id, {})
+            workers.append({
+                "worker": worker.to_dict(),
+                "registry": {k: entry.get(k) for k in ("status", "started_at", "last_error")},
+                "metrics": _encode_metrics(worker.metrics)
+            })
+        self.bus.publish("bot.status", {"at": time.time(), "workers": workers})
+
+    def _on_status(self, status: Dict[str, Any]):
+        """팔로워: 리더 스냅샷으로 원격 워커 / 봇 레지스트리 갱신"""
+        if self.leader:
+            return
+        self._snapshot_at = time.time()
+        workers = {}
+        for item in status["workers"]:
+            worker = RemoteWorker(item["worker"], _decode_metrics(item["metrics"]))
+            workers[worker.worker_id] = worker
+            registry = {k: v for k, v in item["registry"].items() if v is not None}
+            bot_registry.register(worker.worker_id, worker, source="worker", pid=worker.pid,
+                                  symbol=worker.symbol, dry_run=worker.dry_run, **registry)
+        for worker_id in set(self.workers) - set(workers):
+            bot_registry.unregister(worker_id)
+        self.workers = workers
+
+    # ------------------------------------------------------------------
+    # 감시 루프
+    # ------------------------------------------------------------------
+
+    async def _supervise(self):
+        while True:
+            await asyncio.sleep(SUPERVISE_INTERVAL)
+            if not self.leader:
+                if self._try_lead():
+                    continue
+                if self.workers and time.time() - self._snapshot_at > LEADER_TIMEOUT:
+                    self._on_status({"workers": []})
+                continue
+            now = time.time()
+            for worker in list(self.workers.values()):
+                try:
+                    self._check(worker, now)
+                except Exception as e:
+                    logger.error(f"봇 워커 감시 오류 ({worker.worker_id}): {e}", exc_info=True)
+            self._publish_status()
+
+    def _check(self, worker: BotWorker, now: float):
+        if worker.state == "restarting":
+            if now >= worker.restart_at:
+                worker.restarts += 1
+                self._spawn(worker)
+            return
+
+        if worker.state != "running":
+            return
+
+        if worker.alive:
+            if worker.failures and now - worker.started_at >= STABLE_AFTER:
+                worker.failures = 0
+            self._sample(worker)
+            return
+
+        # 종료됨 - 남은 메시지(마지막 로그, exit) 처리 후 판정
+        worker.process.join(0)
+        self._drain(worker)
+        self._close(worker)
+        worker.cpu_percent = None
+        worker.memory_rss = None
+        exitcode = worker.process.exitcode
+
+        if exitcode == 0:
+            worker.state = "stopped"
+            bot_registry.update(worker.worker_id, status="stopped")
+            logger.info(f"봇 워커 종료: {worker.worker_id}")
+            return
+
+        worker.failures += 1
+        worker.last_error = worker.exit_reason or f"exit code {exitcode}"
+        worker.exit_reason = None
+        log_manager.submit(f"❌ 봇 워커 {worker.worker_id} 비정상 종료: {worker.last_error}",
+                           level="ERROR", source=__name__, symbol=worker.symbol)
+
+        if worker.failures > self.restart_limit:
+            worker.state = "failed"
+            bot_registry.update(worker.worker_id, status="stopped", last_error=worker.last_error)
+            logger.error(f"봇 워커 {worker.worker_id} 재시작 한도 초과 ({self.restart_limit}회) - 중단")
+            return
+
+        backoff = min(2 ** (worker.failures - 1), MAX_RESTART_BACKOFF)
+        worker.state = "restarting"
+        worker.restart_at = now + backoff
+        bot_registry.update(worker.worker_id, status="restarting")
+        logger.warning(f"봇 워커 {worker.worker_id} {backoff}초 후 재시작 ({worker.failures}번째 연속 실패)")
+
+    def _sample(self, worker: BotWorker):
+        if worker._ps is None:
+            return
+        try:
+            worker.cpu_percent = worker._ps.cpu_percent(None)
+            worker.memory_rss = worker._ps.memory_info().rss
+        except psutil.Error:
+            worker.cpu_percent = None
+            worker.memory_rss = None
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "workers": [w.to_dict() for w in self.workers.values()],
+            "running": sum(1 for w in self.workers.values() if w.state == "running")
+        }
+
+
+bot_supervisor = BotSupervisor()
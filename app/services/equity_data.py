@@ -0,0 +1,111 @@
+"""
+자산 곡선 조회 - 거래 저널 CSV (phase1.3 trades/positions 스키마, 백테스트 결과) 의 자산 곡선을 차트용으로 제공
+
+저널별로 다운샘플링 피라미드를 한 번 만들어 두고 (파일 수정 시각이 바뀌면 다시 생성), 요청 구간/점 수는
+피라미드의 구간 캐시로 응답합니다. ETag 는 (저널, 수정 시각, 구간, 점 수) 로 만들므로 304 응답은
+피라미드/본문을 건드리지 않습니다.
+
+본문 생성(CSV 읽기, 정렬, 피라미드 생성)은 수백 ms 가 걸릴 수 있으므로 API 는 스레드에서 body() 를 호출하고,
+피라미드/구간 캐시는 잠금으로 보호합니다. 저널 목록은 디렉토리 수정 시각이 바뀔 때만 다시 훑습니다.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from ..analytics.downsample import SeriesPyramid
+from ..analytics.performance import load_journal, equity_curve
+from ..config import settings
+from .market_data import make_etag
+
+logger = logging.getLogger(__name__)
+
+# 자산 곡선으로 읽을 저널 파일 (이름 = 확장자를 뺀 파일명)
+JOURNAL_PATTERNS = ("*_trades.csv", "*_positions.csv")
+
+
+class EquityCurveStore:
+    """저널별 자산 곡선 피라미드 보관소 (etag 는 이벤트 루프, body 는 스레드에서 호출)"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or settings.JOURNAL_DIR)
+        self._pyramids: Dict[str, Tuple[int, SeriesPyramid]] = {}  # 이름 -> (mtime_ns, 피라미드)
+        self._names: Tuple[Optional[int], List[str]] = (None, [])  # (디렉토리 mtime_ns, 저널 이름)
+        self._lock = threading.Lock()
+
+    def journals(self) -> List[str]:
+        """조회 가능한 저널 이름 (디렉토리 수정 시각이 같으면 이전 목록)"""
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return []
+        cached_mtime, names = self._names
+        if cached_mtime == mtime_ns:
+            return names
+
+        found = set()
+        for pattern in JOURNAL_PATTERNS:
+            found.update(p.stem for p in self.directory.glob(pattern))
+        names = sorted(found)
+        self._names = (mtime_ns, names)
+        return names
+
+    def _path(self, name: str) -> Optional[Path]:
+        # 목록에 있는 이름만 허용 (경로 조작 방지)
+        if name not in self.journals():
+            return None
+        return self.directory / f"{name}.csv"
+
+    def pyramid(self, name: str, mtime_ns: int, path: Path) -> SeriesPyramid:
+        cached = self._pyramids.get(name)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        arrays = load_journal(path)
+        if 'time' not in arrays:
+            raise ValueError(f"저널에 시각 컬럼이 없습니다: {name}")
+        order = np.argsort(arrays['time'], kind='stable')
+        times = arrays['time'][order] // 1_000_000  # ns -> ms
+        equity = equity_curve(arrays['returns'][order])
+        pyramid = SeriesPyramid(np.column_stack([times, equity]), kind="line")
+
+        self._pyramids[name] = (mtime_ns, pyramid)
+        logger.info(f"자산 곡선 피라미드 생성: {name} ({len(pyramid)}점, {len(pyramid.levels)}단계)")
+        return pyramid
+
+    def etag(self, name: str, start: Optional[int] = None, end: Optional[int] = None,
+             points: int = 1000) -> Optional[str]:
+        """응답 ETag (저널이 없으면 None) - 파일 stat 만 하므로 304 판단에 사용"""
+        path = self._path(name)
+        if path is None:
+            return None
+        return make_etag(f"{name}:{os.stat(path).st_mtime_ns}:{start}:{end}:{points}".encode())
+
+    def body(self, name: str, start: Optional[int] = None, end: Optional[int] = None,
+             points: int = 1000) -> bytes:
+        """
+        자산 곡선 JSON 본문 (파일 읽기/피라미드 생성이 있으므로 스레드에서 호출)
+
+        Args:
+            start, end: 구간 (ms, None 이면 처음/끝까지)
+            points: 최대 점 수 (LTTB)
+        """
+        path = self.directory / f"{name}.csv"
+        # 같은 저널 동시 요청이 피라미드를 두 번 만들지 않도록 (생성 후 조회는 구간 캐시라 짧음)
+        with self._lock:
+            pyramid = self.pyramid(name, os.stat(path).st_mtime_ns, path)
+            result, level = pyramid.query(start, end, points)
+        return json.dumps({
+            "journal": name,
+            "columns": ["t", "equity"],
+            "rows": [[int(t), v] for t, v in result.tolist()],
+            "total_points": len(pyramid),
+            "level": level
+        }, separators=(",", ":")).encode()
+
+
+equity_store = EquityCurveStore()
@@ -0,0 +1,130 @@
+"""
+시장 데이터 조회 캐시 - 봇이 발행해 market_stream 에 보관된 캔들/지표 시계열을 REST 로 제공
+
+응답 본문은 (토픽, 형식, since, limit, points) 별로 한 번만 직렬화해 두고, 토픽이 갱신될 때(market_stream.seq 증가)만
+다시 만듭니다. ETag 는 본문 해시이므로 워커/재시작이 달라도 내용이 같으면 같은 값이며, 대시보드가
+If-None-Match 로 폴링하면 캐시 조회 + 문자열 비교만으로 304 를 응답합니다.
+
+형식:
+    rows     : {"columns": ["t", ...], "rows": [[t, ...], ...], "next_since": 마지막 t}
+    columnar : {"columns": [...], "data": {"t": [...], "open": [...], ...}, "next_since": 마지막 t}
+
+points 를 지정하면 캔들은 OHLC 집계, 지표는 LTTB (close 기준) 로 points 개 이하로 줄여서 보냅니다.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import bisect
+import hashlib
+import json
+
+import numpy as np
+
+from ..analytics.downsample import aggregate_ohlc, lttb
+from ..websocket.market_stream import market_stream, MarketStream
+
+# 캔들 행 열 이름 (봇의 publish_candles 형식)
+KLINE_COLUMNS = ("t", "open", "high", "low", "close", "volume")
+# 지표 시계열 행 열 이름 (LiveTradingBot.INDICATOR_COLUMNS 와 같은 순서)
+INDICATOR_COLUMNS = ("t", "close", "ema20", "ema50", "ema200", "rsi14", "atr_pct", "vol_ma20")
+
+FORMATS = ("rows", "columnar")
+
+# 보관할 직렬화 결과 수 (since 값이 클라이언트마다 달라 키가 많아질 수 있음)
+CACHE_SIZE = 512
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더 (여러 값, W/ 약한 태그, * 포함) 와 ETag 비교"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def downsample(rows: List[list], points: int, method: str) -> List[list]:
+    """행 목록을 points 개 이하로 축소 (method: ohlc | lttb, 결측값 None 유지)"""
+    if len(rows) <= points:
+        return rows
+    arr = np.asarray(rows, dtype=float)
+    arr = aggregate_ohlc(arr, points) if method == "ohlc" else lttb(arr, points)
+    return [[int(row[0])] + [None if v != v else v for v in row[1:]] for row in arr.tolist()]
+
+
+def render(rows: List[list], columns: Sequence[str], fmt: str) -> Dict[str, Any]:
+    """행 목록을 응답 형식으로 변환"""
+    body: Dict[str, Any] = {"columns": list(columns)}
+    if fmt == "columnar":
+        body["data"] = {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+    else:
+        body["rows"] = rows
+    body["next_since"] = rows[-1][0] if rows else None
+    return body
+
+
+class MarketDataCache:
+    """토픽 버전(seq) 기준으로 직렬화 결과를 재사용하는 조회 캐시 (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, stream: MarketStream = market_stream, size: int = CACHE_SIZE):
+        self.stream = stream
+        self.size = size
+        self._entries: "OrderedDict[tuple, Tuple[int, str, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, topic: str, columns: Sequence[str], fmt: str = "rows",
+            since: Optional[int] = None, limit: Optional[int] = None,
+            points: Optional[int] = None, method: str = "ohlc") -> Optional[Tuple[str, bytes]]:
+        """
+        (ETag, JSON 본문) 반환 - 토픽에 데이터가 없으면 None
+
+        Args:
+            since: 이 시각(ms) 보다 뒤의 행만 (증분 조회 커서, 이전 응답의 next_since)
+            limit: 최근 limit 행만
+            points: 최대 행 수 (초과 시 method 로 다운샘플링 - ohlc | lttb)
+        """
+        rows = self.stream.state.get(topic)
+        if rows is None:
+            return None
+
+        version = self.stream.seq.get(topic, 0)
+        key = (topic, fmt, since, limit, points)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+        self.misses += 1
+        if since is not None:
+            rows = rows[bisect.bisect_right(rows, since, key=lambda row: row[0]):]
+        if limit:
+            rows = rows[-limit:]
+        if points:
+            rows = downsample(rows, points, method)
+
+        body = json.dumps(render(rows, columns, fmt), separators=(",", ":")).encode()
+        etag = make_etag(body)
+        self._entries[key] = (version, etag, body)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return etag, body
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified
+        }
+
+
+market_data_cache = MarketDataCache()
@@ -0,0 +1,172 @@
+"""
+시그널 진단 서비스 - /trading/signal 용 진입 시그널 진단 (evaluate_entry, 마감 캔들별 1회 평가)
+
+소스:
+    bot      : 봇이 실행 중인 심볼은 봇이 매 사이클 발행한 진단({심볼}.signal 토픽)을 그대로 반환합니다.
+               봇이 실제 매매 판단에 쓴 평가이므로 다시 계산하지 않습니다 (evaluated_at = 봇의 사이클 시각).
+    stream   : 진단은 없지만 market_stream 에 마감 캔들이 있으면 그 캔들로 평가합니다 (거래소 호출 없음).
+    exchange : 그 외 심볼은 DataCollector 로 조회하고 진행 중인 마지막 캔들은 제외합니다.
+               다음 15분봉이 마감되기 전까지 다시 조회하지 않습니다.
+
+stream/exchange 평가 결과는 (1시간봉, 15분봉) 마지막 마감 캔들 시각을 키로 심볼별 1개만 보관하므로, 호출 수와
+관계없이 마감 캔들마다 평가는 한 번입니다. 같은 심볼의 평가가 진행 중이면 동시 요청은 그 평가 하나를 기다려
+결과를 공유합니다. 평가는 요청과 분리된 태스크에서 실행되므로 먼저 온 요청이 취소(클라이언트 연결 끊김 등)되어도
+다른 요청은 결과를 받습니다.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ..config import settings
+from ..trading.strategy import TradingStrategy, entry_payload
+from ..websocket.market_stream import market_stream, MarketStream
+
+logger = logging.getLogger(__name__)
+
+# 평가에 쓰는 타임프레임 (market_stream 토픽 접미사 -> Bybit interval)
+TIMEFRAMES = {'1h': '60', '15m': '15', '5m': '5'}
+# 봇과 같은 평가 창 (마감 캔들 기준 타임프레임별 최근 200개)
+KLINE_LIMIT = 200
+# 거래소 조회 결과 재사용 기한 = 마지막 마감 15분봉 시작 + 30분 (다음 15분봉 마감 시각)
+EXCHANGE_REFRESH_MS = 30 * 60 * 1000
+
+
+class SignalUnavailable(Exception):
+    """평가할 캔들이 없거나 부족함"""
+
+
+def _frame(rows: list) -> pd.DataFrame:
+    """market_stream 캔들 행 [[t(ms), o, h, l, c, v], ...] -> DataCollector 와 같은 DataFrame"""
+    df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'].astype('int64'), unit='ms')
+    return df
+
+
+def _last_time_ms(df: pd.DataFrame) -> int:
+    return int(df['timestamp'].iloc[-1].value // 1_000_000)
+
+
+class SignalService:
+    """심볼별 최신 시그널 진단 메모 (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, stream: MarketStream = market_stream, strategy: Optional[TradingStrategy] = None):
+        self.stream = stream
+        self.strategy = strategy or TradingStrategy()
+        self._memo: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}  # 심볼 -> ((1h, 15m 마감 캔들 ms), 결과)
+        self._exchange_valid_until: Dict[str, float] = {}  # 심볼 -> epoch 초
+        self._inflight: Dict[Tuple[str, Optional[tuple]], asyncio.Task] = {}
+        self._session = None
+        self.requests = 0
+        self.evaluations = 0
+        self.fetches = 0
+
+    # ------------------------------------------------------------------
+    # 캔들 소스
+    # ------------------------------------------------------------------
+
+    def _stream_key(self, symbol: str) -> Optional[tuple]:
+        """DataFrame 을 만들지 않고 market_stream 의 마지막 마감 캔들 시각만으로 키 계산"""
+        h1 = self.stream.state.get(f"{symbol}.kline.1h")
+        m15 = self.stream.state.get(f"{symbol}.kline.15m")
+        if not h1 or not m15 or len(h1) < KLINE_LIMIT:
+            return None
+        return (h1[-1][0], m15[-1][0])
+
+    def _stream_frames(self, symbol: str) -> Dict[str, pd.DataFrame]:
+        rows = {tf: self.stream.state.get(f"{symbol}.kline.{tf}") for tf in TIMEFRAMES}
+        return {tf: _frame(r) for tf, r in rows.items() if r}
+
+    def _fetch_frames(self, symbol: str) -> Dict[str, pd.DataFrame]:
+        """거래소 조회 (스레드에서 실행) - 진행 중인 마지막 캔들 제외"""
+        from ..data.data_collector import DataCollector
+        if self._session is None:
+            from ..utils.exchange_metrics import InstrumentedHTTP
+            self._session = InstrumentedHTTP(testnet=settings.BYBIT_TESTNET)
+
+        collector = DataCollector(self._session, symbol, settings.BYBIT_TESTNET)
+        frames = {}
+        for tf, interval in TIMEFRAMES.items():
+            df = collector.get_klines(interval=interval, limit=KLINE_LIMIT + 1)
+            if df is None or len(df) < 2:
+                raise SignalUnavailable(f"{symbol} {tf} 캔들 조회 실패")
+            frames[tf] = df.iloc[:-1].reset_index(drop=True)
+        return frames
+
+    # ------------------------------------------------------------------
+    # 평가
+    # ------------------------------------------------------------------
+
+    async def get_signal(self, symbol: str) -> Dict[str, Any]:
+        """심볼의 최신 시그널 진단 (봇 발행 결과, 또는 마감 캔들이 바뀌지 않았으면 메모된 결과)"""
+        symbol = symbol.upper()
+        self.requests += 1
+
+        published = self.stream.state.get(f"{symbol}.signal")
+        if published:
+            return {'symbol': symbol, 'source': 'bot', **published}
+
+        memo = self._memo.get(symbol)
+        key = self._stream_key(symbol)
+        if key is not None:
+            if memo and memo[0] == key:
+                return memo[1]
+        elif memo and time.time() < self._exchange_valid_until.get(symbol, 0):
+            # 봇이 없는 심볼 - 다음 15분봉 마감 전까지는 거래소를 다시 조회하지 않음
+            return memo[1]
+
+        flight = (symbol, key)
+        task = self._inflight.get(flight)
+        if task is None:
+            task = asyncio.ensure_future(self._load_and_evaluate(symbol, key))
+            self._inflight[flight] = task
+            task.add_done_callback(lambda t: self._finish(flight, t))
+        # shield: 이 요청이 취소되어도 평가 태스크는 계속 실행되어 다른 요청에 결과 전달
+        return await asyncio.shield(task)
+
+    def _finish(self, flight: tuple, task: asyncio.Task):
+        self._inflight.pop(flight, None)
+        if not task.cancelled():
+            task.exception()  # 기다리는 요청이 모두 취소된 경우 경고 방지
+
+    async def _load_and_evaluate(self, symbol: str, key: Optional[tuple]) -> Dict[str, Any]:
+        if key is not None:
+            frames, source = self._stream_frames(symbol), 'stream'
+        else:
+            self.fetches += 1
+            frames, source = await asyncio.to_thread(self._fetch_frames, symbol), 'exchange'
+            if len(frames['1h']) < KLINE_LIMIT:
+                raise SignalUnavailable(f"{symbol} 1시간봉이 부족합니다 ({len(frames['1h'])}개)")
+            key = (_last_time_ms(frames['1h']), _last_time_ms(frames['15m']))
+            self._exchange_valid_until[symbol] = (key[1] + EXCHANGE_REFRESH_MS) / 1000
+            memo = self._memo.get(symbol)
+            if memo and memo[0] == key:
+                return memo[1]
+
+        result = await asyncio.to_thread(self._evaluate, symbol, frames, source)
+        self.evaluations += 1
+        self._memo[symbol] = (key, result)
+        return result
+
+    def _evaluate(self, symbol: str, frames: Dict[str, pd.DataFrame], source: str) -> Dict[str, Any]:
+        """지표 계산 + evaluate_entry (스레드에서 실행) - 봇의 check_signals 와 같은 계산"""
+        df_1h = self.strategy.calculate_indicators(frames['1h'])
+        df_15m = self.strategy.calculate_indicators(frames['15m'])
+        df_5m = self.strategy.calculate_indicators(frames['5m']) if '5m' in frames else df_15m
+        evaluation = self.strategy.evaluate_entry(df_1h, df_15m, df_5m)
+        payload = entry_payload(evaluation, df_1h, df_15m, datetime.utcnow().isoformat() + "Z")
+        return {'symbol': symbol, 'source': source, **payload}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'symbols': len(self._memo),
+            'requests': self.requests,
+            'evaluations': self.evaluations,
+            'exchange_fetches': self.fetches
+        }
+
+
+signal_service = SignalService()
@@ -0,0 +1,173 @@
+# bot_worker.py - 자식 프로세스에서 실행되는 봇 워커 (API 의 BotSupervisor 가 생성)
+#
+# 봇 하나가 프로세스 하나를 차지하므로 지표 계산(pandas)이 API 프로세스와 GIL 을 다투지 않습니다.
+# 부모와는 multiprocessing Pipe 하나로 통신하며, 메시지는 짧은 튜플입니다 (pickle 직렬화).
+#
+#   자식 -> 부모
+#     ("log", level, line)         : print 출력 한 줄 (level 은 stdout INFO / stderr ERROR, 세부 레벨은 부모가 추정)
+#     ("kline", topic, candles)    : publisher.publish_candles
+#     ("state", topic, state)      : publisher.publish_state (지표/시그널/포지션)
+#     ("status", status)           : 사이클마다 실행 상태 + 포지션 스냅샷 + 거래소 조회 공유 통계
+#                                    + 메트릭 스냅샷 (Heartbeat 자리)
+#     ("exit", reason)             : run() 종료 (stopped | error 메시지)
+#   부모 -> 자식
+#     ("stop",)                    : 봇 중지 요청 (대기 중이면 즉시, 사이클 중이면 사이클 완료 후)
+
+import importlib
+import os
+import sys
+import threading
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from data.single_flight import exchange_reads
+from data.trade_journal import TradeJournal
+from utils.metrics import metrics
+
+DEFAULT_BOT_CLASS = "trading.live_trading_bot:LiveTradingBot"
+
+
+class PipeChannel:
+    """
+    부모로 가는 메시지 채널 (봇 스레드 / 명령 스레드에서 함께 쓰므로 잠금)
+
+    부모가 사라져 파이프가 끊기면 이후 메시지는 버리고 봇을 중지합니다.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.closed = False
+        self.on_broken = None
+
+    def send(self, message):
+        if self.closed:
+            return
+        try:
+            with self.lock:
+                self.conn.send(message)
+        except (OSError, ValueError):
+            self.closed = True
+            if self.on_broken:
+                self.on_broken()
+
+    # publisher 인터페이스 (market_stream 과 동일)
+    def publish_candles(self, topic, candles):
+        self.send(("kline", topic, candles))
+
+    def publish_state(self, topic, state):
+        self.send(("state", topic, state))
+
+
+class PipeHeartbeat:
+    """Heartbeat 대신 상태를 부모에게 전송 (파일 기록 없음)"""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def beat(self, bot, status="running"):
+        position = bot.position
+        if position is not None:
+            position = {k: v for k, v in position.items() if k != 'signal'}
+        self.channel.send(("status", {
+            'pid': os.getpid(),
+            'status': status,
+            'env': bot.env_name,
+            'last_cycle_at': bot.last_cycle_at,
+            'cycle': bot.cycle,
+            'check_interval': bot.check_interval,
+            'last_error': bot.last_error,
+            'position': position,
+            'exchange_reads': exchange_reads.get_stats(),
+            # API 의 /metrics 가 worker 레이블을 붙여 출력
+            'metrics': metrics.collect()
+        }))
+
+    def clear(self):
+        pass
+
+
+class PipeStdOut:
+    """print 출력을 줄 단위로 부모에게 전송"""
+
+    def __init__(self, channel, default_level="INFO"):
+        self.channel = channel
+        self.default_level = default_level
+        self._buffer = ""
+
+    def write(self, message):
+        self._buffer += message
+        if "\n" not in self._buffer:
+            return len(message)
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                self.channel.send(("log", self.default_level, line))
+        return len(message)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+    def writable(self):
+        return True
+
+
+def _listen(conn, bot):
+    """부모 명령 수신 (파이프가 닫히면 부모 종료로 보고 봇 중지)"""
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == "stop":
+                bot.stop()
+                return
+    except (EOFError, OSError):
+        bot.stop()
+
+
+def run_worker(config, conn):
+    """
+    워커 프로세스 진입점
+
+    Args:
+        config: {"symbol", "leverage", "dry_run", "testnet", "bot_class"}
+                bot_class 는 "모듈:클래스" 경로 (기본값 LiveTradingBot, 전략별 봇 클래스 지정용)
+        conn: 부모와 연결된 multiprocessing Connection (양방향)
+    """
+    channel = PipeChannel(conn)
+    sys.stdout = PipeStdOut(channel)
+    sys.stderr = PipeStdOut(channel, default_level="ERROR")
+
+    reason = "stopped"
+    try:
+        module_name, class_name = config.get("bot_class", DEFAULT_BOT_CLASS).split(":")
+        bot_class = getattr(importlib.import_module(module_name), class_name)
+        bot = bot_class(
+            testnet=config.get("testnet", True),
+            dry_run=config.get("dry_run", True),
+            symbol=config.get("symbol"),
+            leverage=config.get("leverage"),
+            publisher=channel,
+            heartbeat=PipeHeartbeat(channel)
+        )
+        # 청산 내역은 워커가 직접 저널 DB 에 기록 (API 는 읽기 전용으로 조회)
+        bot.journal = TradeJournal()
+        metrics.callback("trade_journal_pending", "gauge", "저널 기록 대기 건수",
+                         lambda: bot.journal.get_stats()['pending'])
+        metrics.callback("trade_journal_dropped_total", "counter", "기록 실패로 버린 저널 건수",
+                         lambda: bot.journal.get_stats()['dropped'])
+        channel.on_broken = bot.stop
+        threading.Thread(target=_listen, args=(conn, bot), name="bot-worker-control", daemon=True).start()
+        bot.run()
+    except Exception as e:
+        reason = f"{type(e).__name__}: {e}"
+        print(f"❌ 봇 워커 오류: {reason}", flush=True)
+
+    channel.send(("exit", reason))
+    # 비정상 종료 코드면 부모가 재시작
+    sys.exit(0 if reason == "stopped" else 1)
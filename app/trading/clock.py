@@ -0,0 +1,47 @@
+# clock.py - 봇 시간 소스 (실시간 / 리플레이용 가속 시계)
+
+import time
+from datetime import datetime, timedelta
+
+
+class SystemClock:
+    """실제 시간 시계 (기본값)"""
+    
+    def now(self):
+        """현재 시각"""
+        return datetime.now()
+    
+    def sleep(self, seconds):
+        """실제로 대기"""
+        time.sleep(seconds)
+    
+    def wait(self, seconds, event):
+        """실제로 대기하되 event 가 설정되면 즉시 반환 (봇 중지 요청)"""
+        event.wait(seconds)
+
+
+class ReplayClock:
+    """
+    리플레이용 시계 - sleep 은 대기하지 않고 시각만 앞으로 이동
+    
+    기록된 캔들/틱을 실시간보다 수천 배 빠르게 재생할 때 사용합니다.
+    """
+    
+    def __init__(self, start):
+        """
+        Args:
+            start: 리플레이 시작 시각 (datetime)
+        """
+        self.current = start
+    
+    def now(self):
+        """현재 (가상) 시각"""
+        return self.current
+    
+    def sleep(self, seconds):
+        """가상 시각을 seconds 만큼 진행"""
+        self.current += timedelta(seconds=seconds)
+    
+    def wait(self, seconds, event):
+        """중지 요청과 무관하게 가상 시각만 진행"""
+        self.sleep(seconds)
@@ -0,0 +1,79 @@
+# heartbeat.py - 별도 프로세스로 실행되는 봇의 상태 파일 (API 의 봇 레지스트리가 읽음)
+
+import json
+import os
+import time
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:  # 선택 의존성 - 없으면 읽는 쪽은 pid 생존 여부만 확인
+    psutil = None
+
+# 기본 상태 파일 디렉토리 (프로젝트 루트/.run/bots, BOT_HEARTBEAT_DIR 로 변경)
+# 봇 프로세스는 app 패키지 없이 실행되므로 환경 변수를 직접 읽음 (API 쪽은 settings.BOT_HEARTBEAT_DIR)
+DEFAULT_DIR = Path(__file__).resolve().parent.parent.parent / ".run" / "bots"
+
+
+def heartbeat_dir():
+    return Path(os.getenv('BOT_HEARTBEAT_DIR', str(DEFAULT_DIR)))
+
+
+def process_started_at(pid):
+    """프로세스 생성 시각 (epoch 초, 알 수 없으면 None) - 종료된 봇의 pid 가 재사용된 경우를 구분"""
+    if psutil is None or not pid:
+        return None
+    try:
+        return psutil.Process(pid).create_time()
+    except psutil.Error:
+        return None
+
+
+class Heartbeat:
+    """
+    봇 상태를 사이클마다 JSON 파일로 기록 (임시 파일에 쓴 뒤 os.replace 로 교체)
+    
+    파일: {heartbeat_dir}/{bot_id}.json
+    내용: pid, pid_started_at(프로세스 생성 시각), symbol, env, dry_run, status, started_at, last_cycle_at, cycle,
+          check_interval, has_position, last_error
+    """
+    
+    def __init__(self, bot_id, directory=None):
+        self.bot_id = bot_id
+        self.directory = Path(directory) if directory else heartbeat_dir()
+        self.path = self.directory / f"{bot_id}.json"
+        self.started_at = time.time()
+        self.pid_started_at = process_started_at(os.getpid())
+    
+    def beat(self, bot, status="running"):
+        """봇 상태 기록 (기록 실패는 매매에 영향을 주지 않음)"""
+        state = {
+            'bot_id': self.bot_id,
+            'pid': os.getpid(),
+            'pid_started_at': self.pid_started_at,
+            'symbol': bot.symbol,
+            'env': bot.env_name,
+            'dry_run': bot.dry_run,
+            'status': status,
+            'started_at': self.started_at,
+            'last_cycle_at': bot.last_cycle_at,
+            'cycle': bot.cycle,
+            'check_interval': bot.check_interval,
+            'has_position': bot.position is not None,
+            'last_error': bot.last_error,
+            'updated_at': time.time()
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"   ⚠️  하트비트 기록 실패: {e}", flush=True)
+    
+    def clear(self):
+        """종료 시 상태 파일 삭제"""
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
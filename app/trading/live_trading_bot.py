@@ -6,10 +6,10 @@
 
 import sys
 import io
-from pybit.unified_trading import HTTP
 from dotenv import load_dotenv
 import os
 import time
+import threading
 from datetime import datetime
 import pandas as pd
 
@@ -26,8 +26,13 @@ if str(ROOT_DIR) not in sys.path:
 
 # 로컬 모듈 - 절대 경로로 임포트
 from data.data_collector import DataCollector
-from trading.strategy import TradingStrategy
+from data.trade_journal import TradeJournal, TRAILING_LABELS
+from utils.exchange_metrics import InstrumentedHTTP
+from utils.metrics import metrics
+from trading.strategy import TradingStrategy, entry_payload
 from trading.order_manager import OrderManager
+from trading.clock import SystemClock
+from trading.heartbeat import Heartbeat
 
 # Windows 콘솔 인코딩 + 버퍼링 비활성화
 os.environ['PYTHONUNBUFFERED'] = '1'
@@ -35,17 +40,37 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', line_buffering=True)
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', line_buffering=True)
 
+# 사이클 1회(데이터 조회 ~ 진입/청산) 소요 시간 - 대기 시간 제외
+cycle_duration = metrics.histogram(
+    "bot_cycle_duration_seconds", "봇 사이클 소요 시간 (대기 제외)",
+    buckets=(0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+)
+
+
 class LiveTradingBot:
     """실시간 자동매매 봇"""
     
-    def __init__(self, testnet=True, dry_run=False):
+    def __init__(self, testnet=True, dry_run=False, session=None, clock=None, publisher=None,
+                 heartbeat=None, symbol=None, leverage=None, journal=None):
         """
         Args:
             testnet: True면 Testnet, False면 Mainnet
             dry_run: True면 실제 주문 안 함 (시그널만 표시)
+            symbol: 거래 심볼 (None이면 TRADING_SYMBOL 환경 변수)
+            leverage: 레버리지 (None이면 LEVERAGE 환경 변수)
+            session: 거래소 세션 (None이면 Bybit HTTP 세션 생성, 리플레이 시 SimulatedExchange 주입)
+            clock: 시간 소스 (None이면 SystemClock, 리플레이 시 ReplayClock 주입)
+            publisher: 실시간 스트림 발행자 (publish_candles/publish_state, 예: market_stream) - None이면 발행 안 함
+            heartbeat: 사이클마다 상태를 기록할 Heartbeat (별도 프로세스 실행 시 API 봇 레지스트리가 읽음)
+            journal: 청산 내역을 기록할 TradeJournal (None이면 기록 안 함, 리플레이 시 생략)
         """
         self.testnet = testnet
         self.dry_run = dry_run
+        self.clock = clock or SystemClock()
+        self.publisher = publisher
+        self.heartbeat = heartbeat
+        self.journal = journal
+        self.stop_event = threading.Event()
         
         # 환경 변수 로드
         load_dotenv()
@@ -61,28 +86,37 @@ class LiveTradingBot:
             self.env_name = "MAINNET"
         
         # 거래 설정
-        self.symbol = os.getenv('TRADING_SYMBOL', 'BTCUSDT')
-        self.leverage = int(os.getenv('LEVERAGE', '2'))
+        self.symbol = symbol or os.getenv('TRADING_SYMBOL', 'BTCUSDT')
+        self.leverage = int(leverage or os.getenv('LEVERAGE', '2'))
         self.check_interval = 300  # 5분마다 체크
         self.max_slippage = 1.5  # 최대 슬리피지 1.5%
         
         # Bybit 세션
-        self.session = HTTP(
-            testnet=testnet,
-            api_key=api_key,
-            api_secret=api_secret,
-            recv_window=60000
-        )
+        if session is not None:
+            self.session = session
+        else:
+            # 엔드포인트별 지연/응답 코드 메트릭을 기록하는 HTTP 세션
+            self.session = InstrumentedHTTP(
+                testnet=testnet,
+                api_key=api_key,
+                api_secret=api_secret,
+                recv_window=60000
+            )
         
         # 모듈 초기화
         self.data_collector = DataCollector(self.session, self.symbol, testnet)
         self.strategy = TradingStrategy()
-        self.order_manager = OrderManager(self.session, self.symbol, self.leverage)
+        self.order_manager = OrderManager(self.session, self.symbol, self.leverage, clock=self.clock)
         
         # 상태
         self.position = None
         self.last_signal_time = None
         
+        # 실행 상태 (봇 레지스트리/하트비트용, 벽시계 기준 epoch 초)
+        self.cycle = 0
+        self.last_cycle_at = None
+        self.last_error = None
+        
         # 통계
         self.total_trades = 0
         self.winning_trades = 0
@@ -156,12 +190,18 @@ class LiveTradingBot:
             df_5m = self.strategy.calculate_indicators(data['5m'])
             
             print("   📈 시그널 분석 중...", flush=True)
-            # 시그널 확인
-            signal = self.strategy.check_entry_signal(df_1h, df_15m, df_5m)
+            # 시그널 확인 (발행 시에는 판단 근거까지 - signal 은 check_entry_signal 과 같음)
+            if not self.publisher:
+                return self.strategy.check_entry_signal(df_1h, df_15m, df_5m)
+            evaluation = self.strategy.evaluate_entry(df_1h, df_15m, df_5m)
+            
+            # 실시간 스트림 발행 (캔들/지표/시그널 평가)
+            self._publish_market(data, df_1h, df_15m, evaluation)
             
-            return signal
+            return evaluation['signal']
             
         except Exception as e:
+            self.last_error = f"시그널 체크 오류: {str(e)}"
             print(f"   ❌ 시그널 체크 오류: {str(e)}", flush=True)
             return None
     
@@ -177,7 +217,7 @@ class LiveTradingBot:
                 return False
             
             signal_price = signal['entry_price']
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            current_time = self.clock.now().strftime("%Y-%m-%d %H:%M:%S")
             
             # Step 2: 슬리피지 체크 (안전장치)
             slippage_pct = abs(current_price - signal_price) / signal_price * 100
@@ -287,7 +327,7 @@ class LiveTradingBot:
             # 포지션 정보 저장
             self.position = {
                 'entry_price': actual_entry,
-                'entry_time': datetime.now(),
+                'entry_time': self.clock.now(),
                 'size': result['qty'],
                 'remaining_size': result['qty'],
                 'tp1_price': actual_tp1,
@@ -300,6 +340,9 @@ class LiveTradingBot:
                 'initial_balance': balance
             }
             
+            if self.publisher:
+                self._publish_position(actual_entry)
+            
             print("\n✅ 진입 완료!", flush=True)
             print("=" * 80, flush=True)
             return True
@@ -332,7 +375,7 @@ class LiveTradingBot:
                 self.position['highest_price'] = current_price
             
             # 보유 시간 계산
-            holding_time = datetime.now() - self.position['entry_time']
+            holding_time = self.clock.now() - self.position['entry_time']
             hours = holding_time.total_seconds() / 3600
             
             print(f"   💰 현재가: ${current_price:,.2f}", flush=True)
@@ -342,6 +385,9 @@ class LiveTradingBot:
             print(f"   📦 남은 수량: {self.position['remaining_size']}", flush=True)
             print(f"   ⏱️  보유 시간: {hours:.1f}시간", flush=True)
             
+            if self.publisher:
+                self._publish_position(current_price)
+            
             should_close = False
             close_qty = None
             reason = ""
@@ -408,6 +454,7 @@ class LiveTradingBot:
                 print(f"   ⏳ 청산 조건 미달", flush=True)
                     
         except Exception as e:
+            self.last_error = f"모니터링 오류: {str(e)}"
             print(f"❌ 모니터링 오류: {str(e)}", flush=True)
             import traceback
             traceback.print_exc()
@@ -416,7 +463,7 @@ class LiveTradingBot:
         """청산 실행 + 상세 로그"""
         entry_price = self.position['entry_price']
         entry_time = self.position['entry_time']
-        exit_time = datetime.now()
+        exit_time = self.clock.now()
         
         # 손익 계산
         pnl_pct = ((current_price - entry_price) / entry_price) * 100
@@ -484,6 +531,10 @@ class LiveTradingBot:
                 # 수량 업데이트
                 self.position['remaining_size'] -= close_qty
                 
+                # 거래 저널 기록 (대기열에 넣기만 하므로 청산 경로를 지연시키지 않음)
+                if self.journal:
+                    self._journal_exit(exit_type, close_qty, current_price, exit_time, pnl_amount)
+                
                 # 전량 청산이면 포지션 제거 + 통계 출력
                 if self.position['remaining_size'] <= 0.001:
                     print(f"\n📊 거래 통계:", flush=True)
@@ -493,6 +544,9 @@ class LiveTradingBot:
                     
                     self.position = None
                     print(f"\n✅ 모든 포지션 청산 완료", flush=True)
+                
+                if self.publisher:
+                    self._publish_position(current_price)
             else:
                 print(f"❌ 청산 실패!", flush=True)
         else:
@@ -501,20 +555,172 @@ class LiveTradingBot:
         
         print(f"{'='*80}", flush=True)
     
-    def run(self):
-        """메인 루프"""
+    # 거래 저널 엔진 이름 (phase1.3 CSV 의 engine 컬럼, 백테스트는 P1.3)
+    JOURNAL_ENGINE = 'LIVE'
+    
+    def _journal_exit(self, exit_type, close_qty, current_price, exit_time, pnl_amount):
+        """청산 1건 (전량 청산이면 포지션 합계도) 을 phase1.3 trades/positions 스키마로 기록"""
+        try:
+            pos = self.position
+            signal = pos['signal']
+            entry_price = pos['entry_price']
+            portion = close_qty / pos['size']
+            net_ret = current_price / entry_price - 1
+            
+            reason = exit_type
+            trailing_pct = None
+            if exit_type == "TRAILING":
+                reason = TRAILING_LABELS.get(signal['vol_regime'], "TRAIL-고변동")
+                trailing_pct = 1 - pos['trailing_stop'] / pos['highest_price']
+            
+            common = {
+                'engine': self.JOURNAL_ENGINE,
+                'entry_time': pos['entry_time'],
+                'size': 1.0,
+                'regime': signal['market_regime'],
+                'quality': signal['quality'],
+                'vol_regime': signal['vol_regime'],
+                'atr_ratio': signal['atr_ratio'],
+                'symbol': self.symbol,
+                'env': self.env_name,
+                'entry_price': entry_price
+            }
+            self.journal.record_trade({
+                **common,
+                'exit_time': exit_time,
+                'portion': portion,
+                'net_ret_1x': net_ret,
+                'reason': reason,
+                'tp1_pct': signal['tp1_pct'] / 100,
+                'trailing_pct': trailing_pct,
+                'qty': close_qty,
+                'exit_price': current_price,
+                'pnl': pnl_amount
+            })
+            
+            pos['net_pos_1x'] = pos.get('net_pos_1x', 0.0) + portion * net_ret
+            pos['realized_pnl'] = pos.get('realized_pnl', 0.0) + pnl_amount
+            if pos['remaining_size'] <= 0.001:
+                self.journal.record_position({
+                    **common,
+                    'net_pos_1x': pos['net_pos_1x'],
+                    'exit_time': exit_time,
+                    'qty': pos['size'],
+                    'pnl': pos['realized_pnl']
+                })
+        except Exception as e:
+            print(f"   ⚠️  거래 저널 기록 오류: {str(e)}", flush=True)
+    
+    # ------------------------------------------------------------------
+    # 실시간 스트림 발행 (publisher 는 대기하지 않으며, 발행 오류는 매매에 영향을 주지 않음)
+    # ------------------------------------------------------------------
+    
+    KLINE_PUBLISH_SIZE = 200
+    # 지표 시계열 열 순서 ([t(ms), *INDICATOR_COLUMNS]) - API 의 /api/market/{symbol}/indicators 와 같아야 함
+    INDICATOR_COLUMNS = ('close', 'ema20', 'ema50', 'ema200', 'rsi14', 'atr_pct', 'vol_ma20')
+    
+    def _publish_market(self, data, df_1h, df_15m, evaluation):
+        """마감 캔들, 1시간봉 지표 스냅샷/시계열, 시그널 평가 결과 발행"""
+        try:
+            for tf, df in data.items():
+                # Bybit 최신 캔들은 아직 진행 중이므로 제외
+                closed = df.iloc[-self.KLINE_PUBLISH_SIZE - 1:-1]
+                times = closed['timestamp'].values.astype('datetime64[ms]').astype('int64')
+                values = closed[['open', 'high', 'low', 'close', 'volume']].values.tolist()
+                candles = [[int(t)] + v for t, v in zip(times, values)]
+                self.publisher.publish_candles(f"{self.symbol}.kline.{tf}", candles)
+            
+            # 마감된 1시간봉의 지표 시계열 (캔들과 같은 행 형식, 워밍업 구간의 NaN 은 None)
+            closed = df_1h.iloc[-self.KLINE_PUBLISH_SIZE - 1:-1]
+            times = closed['timestamp'].values.astype('datetime64[ms]').astype('int64')
+            values = closed[list(self.INDICATOR_COLUMNS)].values.tolist()
+            rows = [[int(t)] + [None if v != v else v for v in row] for t, row in zip(times, values)]
+            self.publisher.publish_candles(f"{self.symbol}.indicator_series.1h", rows)
+            
+            last = df_1h.iloc[-1]
+            candle_time = last['timestamp'].isoformat()
+            self.publisher.publish_state(f"{self.symbol}.indicators.1h", {
+                'candle_time': candle_time,
+                'close': float(last['close']),
+                'ema20': float(last['ema20']),
+                'ema50': float(last['ema50']),
+                'ema200': float(last['ema200']),
+                'rsi14': float(last['rsi14']),
+                'atr_pct': float(last['atr_pct']),
+                'vol_ma20': float(last['vol_ma20'])
+            })
+            
+            # 매매 판단에 쓴 평가 그대로 (진행 중인 캔들 포함 창) - /trading/signal 이 이 결과를 응답
+            self.publisher.publish_state(f"{self.symbol}.signal",
+                                         entry_payload(evaluation, df_1h, df_15m, self.clock.now().isoformat()))
+            
+        except Exception as e:
+            print(f"   ⚠️  스트림 발행 오류: {str(e)}", flush=True)
+    
+    def _publish_position(self, current_price):
+        """포지션/손익 상태 발행 (포지션이 없으면 closed)"""
+        try:
+            if not self.position:
+                state = {'status': 'closed', 'total_trades': self.total_trades,
+                         'total_profit': self.total_profit}
+            else:
+                pos = self.position
+                entry_price = pos['entry_price']
+                state = {
+                    'status': 'open',
+                    'side': 'Buy',
+                    'entry_price': entry_price,
+                    'entry_time': pos['entry_time'].isoformat(),
+                    'current_price': current_price,
+                    'highest_price': pos['highest_price'],
+                    'size': pos['size'],
+                    'remaining_size': pos['remaining_size'],
+                    'pnl_pct': (current_price - entry_price) / entry_price * 100,
+                    'unrealized_pnl': pos['remaining_size'] * (current_price - entry_price),
+                    'tp1_price': pos['tp1_price'],
+                    'tp2_price': pos['tp2_price'],
+                    'sl_price': pos['sl_price'],
+                    'trailing_stop': pos['trailing_stop'],
+                    'tp1_hit': pos['tp1_hit']
+                }
+            self.publisher.publish_state(f"{self.symbol}.position", state)
+            
+        except Exception as e:
+            print(f"   ⚠️  스트림 발행 오류: {str(e)}", flush=True)
+    
+    def stop(self):
+        """
+        중지 요청 (다른 스레드에서 호출 가능)
+        
+        대기 중이면 즉시 깨어나고, 사이클 실행 중이면 해당 사이클이 끝난 뒤 종료합니다.
+        """
+        self.stop_event.set()
+    
+    def run(self, max_cycles=None):
+        """
+        메인 루프
+        
+        Args:
+            max_cycles: 지정 시 해당 횟수만큼 사이클 실행 후 종료 (리플레이/테스트용)
+        
+        Ctrl+C 또는 stop() 호출 시 통계를 출력하고 종료합니다.
+        """
         if not self.initialize():
             return
         
+        if self.heartbeat:
+            self.heartbeat.beat(self)
+        
         print(f"\n🚀 봇 시작! (Ctrl+C로 중지)", flush=True)
         print(f"⏰ {self.check_interval}초마다 시그널 체크\n", flush=True)
         
         cycle = 0
         
         try:
-            while True:
+            while not self.stop_event.is_set() and (max_cycles is None or cycle < max_cycles):
                 cycle += 1
-                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                cycle_started = time.perf_counter()
+                now = self.clock.now().strftime("%Y-%m-%d %H:%M:%S")
                 
                 print(f"\n{'='*80}", flush=True)
                 print(f"🔄 사이클 #{cycle} - {now}", flush=True)
@@ -536,33 +742,54 @@ class LiveTradingBot:
                     else:
                         print(f"   ⏳ 시그널 없음", flush=True)
                 
+                # 사이클 완료 기록
+                cycle_duration.observe(time.perf_counter() - cycle_started)
+                self.cycle = cycle
+                self.last_cycle_at = time.time()
+                if self.heartbeat:
+                    self.heartbeat.beat(self)
+                
                 # 대기
                 print(f"\n⏰ {self.check_interval}초 대기 중...", flush=True)
-                time.sleep(self.check_interval)
+                self.clock.wait(self.check_interval, self.stop_event)
+            
+            if self.stop_event.is_set():
+                self._print_shutdown()
                 
         except KeyboardInterrupt:
-            print(f"\n\n{'='*80}", flush=True)
-            print(f"⏸️  봇 중지 요청", flush=True)
-            print(f"{'='*80}", flush=True)
-            
-            # 통계 출력
-            if self.total_trades > 0:
-                print(f"\n📊 최종 거래 통계:", flush=True)
-                print(f"   - 총 거래: {self.total_trades}회", flush=True)
-                print(f"   - 승률: {self.winning_trades}/{self.total_trades} ({(self.winning_trades/self.total_trades*100):.1f}%)", flush=True)
-                print(f"   - 누적 손익: ${self.total_profit:,.2f}", flush=True)
-            
-            # 포지션 있으면 알림
-            if self.position:
-                print(f"\n⚠️  포지션이 남아있습니다!", flush=True)
-                pos = self.order_manager.get_position()
-                if pos:
-                    print(f"   - 방향: {pos['side']}", flush=True)
-                    print(f"   - 수량: {pos['size']}", flush=True)
-                    print(f"   - 진입가: ${pos['entry_price']:,.2f}", flush=True)
-                    print(f"   - 미실현 손익: {pos['unrealized_pnl']:+,.2f} USDT", flush=True)
-            
-            print(f"\n👋 봇 종료", flush=True)
+            self._print_shutdown()
+        
+        finally:
+            if self.heartbeat:
+                self.heartbeat.clear()
+            # 대기 중인 저널 기록을 마저 씀 (기록 스레드는 데몬이라 프로세스와 함께 종료됨)
+            if self.journal:
+                self.journal.flush()
+    
+    def _print_shutdown(self):
+        """중지 시 통계/잔여 포지션 출력"""
+        print(f"\n\n{'='*80}", flush=True)
+        print(f"⏸️  봇 중지 요청", flush=True)
+        print(f"{'='*80}", flush=True)
+        
+        # 통계 출력
+        if self.total_trades > 0:
+            print(f"\n📊 최종 거래 통계:", flush=True)
+            print(f"   - 총 거래: {self.total_trades}회", flush=True)
+            print(f"   - 승률: {self.winning_trades}/{self.total_trades} ({(self.winning_trades/self.total_trades*100):.1f}%)", flush=True)
+            print(f"   - 누적 손익: ${self.total_profit:,.2f}", flush=True)
+        
+        # 포지션 있으면 알림
+        if self.position:
+            print(f"\n⚠️  포지션이 남아있습니다!", flush=True)
+            pos = self.order_manager.get_position()
+            if pos:
+                print(f"   - 방향: {pos['side']}", flush=True)
+                print(f"   - 수량: {pos['size']}", flush=True)
+                print(f"   - 진입가: ${pos['entry_price']:,.2f}", flush=True)
+                print(f"   - 미실현 손익: {pos['unrealized_pnl']:+,.2f} USDT", flush=True)
+        
+        print(f"\n👋 봇 종료", flush=True)
 
 if __name__ == "__main__":
     # DRY RUN 모드 (시그널만 표시)
@@ -571,4 +798,9 @@ if __name__ == "__main__":
     # 실제 거래 모드
     #bot = LiveTradingBot(testnet=True, dry_run=False)
     
+    # API 의 /trading/status 가 이 프로세스의 상태를 알 수 있도록 하트비트 기록
+    bot.heartbeat = Heartbeat(bot.symbol)
+    # 청산 내역 기록 (API 의 /api/analytics/trades 로 조회)
+    bot.journal = TradeJournal()
+    
     bot.run()
\ No newline at end of file
@@ -4,15 +4,29 @@ from pybit.unified_trading import HTTP
 import time
 from datetime import datetime
 
+from data.single_flight import exchange_reads, session_key
+from utils.metrics import metrics
+
+# 시장가 주문 전송부터 체결 확인까지 (체결 대기 sleep 포함)
+order_fill_latency = metrics.histogram(
+    "order_fill_latency_seconds", "시장가 주문 전송부터 체결 확인까지 걸린 시간",
+    ("side",), (0.5, 1.0, 2.0, 2.5, 3.0, 4.0, 5.0, 10.0, 30.0)
+)
+orders_total = metrics.counter(
+    "orders_total", "시장가 주문 결과 (status: Filled / 주문 상태 / rejected / error)", ("side", "status")
+)
+
 class OrderManager:
     """주문 실행 및 포지션 관리"""
     
-    def __init__(self, session, symbol='ETHUSDT', leverage=2):
+    def __init__(self, session, symbol='ETHUSDT', leverage=2, clock=None):
         self.session = session
         self.symbol = symbol
         self.leverage = leverage
         self.category = 'linear'
         self.position = None
+        # 체결 대기용 sleep (리플레이 시 가상 시계 사용)
+        self.sleep = clock.sleep if clock else time.sleep
         
     def set_leverage(self):
         """레버리지 설정"""
@@ -62,7 +76,18 @@ class OrderManager:
             return 0
     
     def get_current_price(self):
-        """현재가 조회"""
+        """
+        현재가 조회
+        
+        동시에 들어온 같은 심볼 조회는 (다른 프로세스 포함) 거래소 호출 한 번을 공유하고,
+        성공한 값은 짧은 시간(EXCHANGE_READ_TTL) 동안 재사용합니다 (실패 값 0 은 캐시하지 않음).
+        """
+        namespace = session_key(self.session)
+        key = None if namespace is None else (namespace, 'ticker', self.category, self.symbol)
+        return exchange_reads.do(key, self._fetch_current_price, cache_if=lambda price: price > 0)
+    
+    def _fetch_current_price(self):
+        """현재가 거래소 조회 (공유 없음)"""
         try:
             result = self.session.get_tickers(
                 category=self.category,
@@ -165,6 +190,7 @@ class OrderManager:
             print(f"   - 수량: {qty_formatted}")
             print(f"   - 타입: Market")
             
+            started = time.perf_counter()
             order = self.session.place_order(
                 category=self.category,
                 symbol=self.symbol,
@@ -178,19 +204,26 @@ class OrderManager:
             
             if order['retCode'] != 0:
                 print(f"   주문 실패: {order['retMsg']}")
+                orders_total.labels(side, "rejected").inc()
                 return None
             
             order_id = order['result']['orderId']
             print(f"   주문 접수: {order_id}")
             
             # 체결 확인
-            time.sleep(2)
+            self.sleep(2)
             order_info = self.check_order(order_id)
             
+            status = order_info['status'] if order_info else "unknown"
+            if status == 'Filled':
+                order_fill_latency.labels(side).observe(time.perf_counter() - started)
+            orders_total.labels(side, status).inc()
+            
             return order_info
             
         except Exception as e:
             print(f"   주문 오류: {str(e)}")
+            orders_total.labels(side, "error").inc()
             return None
     
     def place_limit_order(self, side, quantity, price, reduce_only=False):
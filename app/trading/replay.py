@@ -0,0 +1,255 @@
+# replay.py - 가속 시계 리플레이 (기록된 캔들/틱으로 실제 LiveTradingBot 루프 재생)
+#
+# SimulatedExchange 는 봇이 사용하는 pybit HTTP 메서드를 같은 응답 형식으로 흉내 내고,
+# ReplayClock 의 가상 시각 기준으로 "이미 마감된" 캔들과 현재가만 보여줍니다.
+# run / monitor_position / _execute_exit 를 수정 없이 그대로 실행하므로 회귀/성능 테스트에 사용합니다.
+
+import contextlib
+import io
+import itertools
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from .clock import ReplayClock
+from .live_trading_bot import LiveTradingBot
+
+# Bybit kline interval -> 분
+INTERVAL_MINUTES = {'1': 1, '3': 3, '5': 5, '15': 15, '30': 30, '60': 60, '120': 120, '240': 240, 'D': 1440}
+
+
+def _ok(result):
+    return {'retCode': 0, 'retMsg': 'OK', 'result': result}
+
+
+class SimulatedExchange:
+    """기록된 시장 데이터로 동작하는 모의 거래소 (pybit HTTP 세션 대체)"""
+    
+    def __init__(self, candles, clock, ticks=None, initial_balance=10000.0,
+                 fee_rate=0.00055, min_qty=0.01, qty_step=0.01):
+        """
+        Args:
+            candles: 기준 캔들 DataFrame (timestamp, open, high, low, close, volume[, turnover]).
+                     더 큰 interval 은 이 캔들을 리샘플링해서 만듭니다.
+            clock: ReplayClock (가상 현재 시각)
+            ticks: 선택. 체결가 시계열 DataFrame (timestamp, price). 없으면 마지막 마감 캔들 종가 사용
+            initial_balance: 초기 USDT 잔액
+            fee_rate: 체결 수수료율 (taker)
+            min_qty, qty_step: 상품 주문 수량 규칙
+        """
+        self.clock = clock
+        self.balance = initial_balance
+        self.fee_rate = fee_rate
+        self.min_qty = min_qty
+        self.qty_step = qty_step
+        
+        base = candles.assign(
+            timestamp=pd.to_datetime(candles['timestamp'], utc=True).dt.tz_localize(None)
+        ).sort_values('timestamp').reset_index(drop=True)
+        if 'turnover' not in base.columns:
+            base = base.assign(turnover=base['close'] * base['volume'])
+        self.base_minutes = int((base['timestamp'].iloc[1] - base['timestamp'].iloc[0]).total_seconds() // 60)
+        self._base = base
+        self._frames = {}
+        
+        if ticks is not None:
+            ticks = ticks.sort_values('timestamp')
+            tick_times = pd.to_datetime(ticks['timestamp'], utc=True).dt.tz_localize(None)
+            self._tick_times = tick_times.to_numpy(dtype='datetime64[ns]')
+            self._tick_prices = ticks['price'].to_numpy(dtype=float)
+        else:
+            self._tick_times = None
+        
+        # 포지션/주문 상태
+        self.position_size = 0.0
+        self.position_price = 0.0
+        self.orders = {}
+        self._order_ids = itertools.count(1)
+        self.fills = []
+    
+    def _now(self):
+        return np.datetime64(_naive_utc(self.clock.now()), 'ns')
+    
+    def _frame(self, interval):
+        """interval 별 캔들 배열 (리샘플링 결과는 캐시)"""
+        if interval not in self._frames:
+            minutes = INTERVAL_MINUTES[interval]
+            if minutes < self.base_minutes:
+                raise ValueError(f"기준 캔들({self.base_minutes}분)보다 작은 interval: {interval}")
+            
+            df = self._base
+            if minutes != self.base_minutes:
+                df = (df.set_index('timestamp')
+                        .resample(f'{minutes}min', label='left', closed='left')
+                        .agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last',
+                              'volume': 'sum', 'turnover': 'sum'})
+                        .dropna()
+                        .reset_index())
+            
+            starts = df['timestamp'].to_numpy(dtype='datetime64[ns]')
+            rows = np.column_stack([
+                (starts.astype('int64') // 1_000_000).astype(str),
+                df[['open', 'high', 'low', 'close', 'volume', 'turnover']].to_numpy().astype(str)
+            ])
+            self._frames[interval] = (starts + np.timedelta64(minutes, 'm'), rows, df['close'].to_numpy(dtype=float))
+        return self._frames[interval]
+    
+    def _closed_count(self, interval):
+        """가상 현재 시각 기준으로 마감된 캔들 수"""
+        close_times, _, _ = self._frame(interval)
+        return int(np.searchsorted(close_times, self._now(), side='right'))
+    
+    def last_price(self):
+        """가상 현재 시각의 체결가"""
+        now = self._now()
+        if self._tick_times is not None:
+            i = np.searchsorted(self._tick_times, now, side='right')
+            if i > 0:
+                return float(self._tick_prices[i - 1])
+        
+        n = self._closed_count(str(self.base_minutes))
+        _, _, closes = self._frame(str(self.base_minutes))
+        return float(closes[max(n - 1, 0)])
+    
+    # ------------------------------------------------------------------
+    # pybit HTTP 호환 메서드
+    # ------------------------------------------------------------------
+    
+    def get_kline(self, category, symbol, interval, limit=200, **kwargs):
+        """마감된 캔들을 최신순(Bybit 응답 순서)으로 반환"""
+        n = self._closed_count(interval)
+        _, rows, _ = self._frame(interval)
+        recent = rows[max(0, n - limit):n][::-1]
+        return _ok({'category': category, 'symbol': symbol, 'list': recent.tolist()})
+    
+    def get_tickers(self, category, symbol, **kwargs):
+        return _ok({'category': category, 'list': [{'symbol': symbol, 'lastPrice': str(self.last_price())}]})
+    
+    def get_wallet_balance(self, accountType="UNIFIED", **kwargs):
+        equity = self.balance + self.position_size * (self.last_price() - self.position_price)
+        return _ok({'list': [{'coin': [{
+            'coin': 'USDT',
+            'equity': str(equity),
+            'availableToWithdraw': str(self.balance)
+        }]}]})
+    
+    def set_leverage(self, **kwargs):
+        return _ok({})
+    
+    def get_instruments_info(self, category, symbol, **kwargs):
+        return _ok({'list': [{
+            'symbol': symbol,
+            'lotSizeFilter': {'minOrderQty': str(self.min_qty), 'qtyStep': str(self.qty_step)}
+        }]})
+    
+    def place_order(self, category, symbol, side, orderType, qty, price=None, reduceOnly=False, **kwargs):
+        """시장가 주문은 현재가로 즉시 체결, 지정가 주문은 접수만 함"""
+        order_id = f"sim-{next(self._order_ids)}"
+        qty = float(qty)
+        
+        if orderType != 'Market':
+            self.orders[order_id] = {'orderStatus': 'New', 'cumExecQty': '0', 'avgPrice': '0'}
+            return _ok({'orderId': order_id})
+        
+        fill_price = self.last_price()
+        if side == 'Sell' and reduceOnly:
+            qty = min(qty, self.position_size)
+        
+        fee = qty * fill_price * self.fee_rate
+        if side == 'Buy':
+            new_size = self.position_size + qty
+            self.position_price = (self.position_price * self.position_size + fill_price * qty) / new_size
+            self.position_size = new_size
+        else:
+            self.balance += qty * (fill_price - self.position_price)
+            self.position_size -= qty
+            if self.position_size <= 1e-12:
+                self.position_size = 0.0
+                self.position_price = 0.0
+        self.balance -= fee
+        
+        self.orders[order_id] = {'orderStatus': 'Filled', 'cumExecQty': str(qty), 'avgPrice': str(fill_price)}
+        self.fills.append({
+            'time': self.clock.now(), 'order_id': order_id, 'side': side,
+            'qty': qty, 'price': fill_price, 'fee': fee
+        })
+        return _ok({'orderId': order_id})
+    
+    def get_order_history(self, category, symbol, orderId, **kwargs):
+        order = self.orders.get(orderId)
+        if not order:
+            return _ok({'list': []})
+        return _ok({'list': [dict(order, orderId=orderId)]})
+    
+    def get_positions(self, category, symbol, **kwargs):
+        if self.position_size <= 0:
+            return _ok({'list': [{'symbol': symbol, 'size': '0'}]})
+        
+        unrealized = self.position_size * (self.last_price() - self.position_price)
+        return _ok({'list': [{
+            'symbol': symbol,
+            'side': 'Buy',
+            'size': str(self.position_size),
+            'avgPrice': str(self.position_price),
+            'unrealisedPnl': str(unrealized),
+            'leverage': '2'
+        }]})
+    
+    def cancel_all_orders(self, **kwargs):
+        for order in self.orders.values():
+            if order['orderStatus'] == 'New':
+                order['orderStatus'] = 'Cancelled'
+        return _ok({})
+
+
+def _naive_utc(value):
+    """시각을 tz 정보 없는 UTC datetime 으로 변환 (ReplayClock/캔들 비교 기준)"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return ts.to_pydatetime()
+
+
+def replay(candles, start=None, end=None, ticks=None, initial_balance=10000.0,
+           dry_run=False, quiet=True, bot_class=LiveTradingBot):
+    """
+    기록된 데이터로 LiveTradingBot 실행 루프를 가속 재생
+    
+    Args:
+        candles: 기준 캔들 DataFrame (5분봉 이하 권장 - 5m/15m/1h/4h/D 로 리샘플링)
+        start: 리플레이 시작 시각 (기본값: 1시간봉 200개가 쌓인 시점)
+        end: 리플레이 종료 시각 (기본값: 데이터 끝)
+        ticks: 선택. 체결가 시계열 (timestamp, price)
+        initial_balance: 모의 거래소 초기 잔액
+        dry_run: True면 주문 없이 시그널만 (포지션이 생기지 않음)
+        quiet: True면 봇의 print 출력을 버림 (출력이 재생 시간 대부분을 차지)
+        bot_class: 실행할 봇 클래스
+        
+    Returns:
+        dict: 'bot', 'exchange', 'cycles', 'start', 'end'
+    """
+    timestamps = pd.to_datetime(candles['timestamp'], utc=True).dt.tz_localize(None)
+    if start is None:
+        start = timestamps.min() + timedelta(hours=200)
+    if end is None:
+        end = timestamps.max()
+    start = _naive_utc(start)
+    end = _naive_utc(end)
+    
+    clock = ReplayClock(start)
+    exchange = SimulatedExchange(candles, clock, ticks=ticks, initial_balance=initial_balance)
+    bot = bot_class(dry_run=dry_run, session=exchange, clock=clock)
+    cycles = int((end - start).total_seconds() // bot.check_interval) + 1
+    
+    output = io.StringIO() if quiet else None
+    with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+        bot.run(max_cycles=cycles)
+    
+    return {
+        'bot': bot,
+        'exchange': exchange,
+        'cycles': cycles,
+        'start': start,
+        'end': clock.now()
+    }
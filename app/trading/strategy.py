@@ -3,6 +3,50 @@
 import pandas as pd
 import numpy as np
 
+# 시그널 진단에 포함할 1시간봉 지표
+DIAGNOSTIC_INDICATORS = ('close', 'ema20', 'ema50', 'ema200', 'rsi14', 'atr_pct', 'vol_ma20')
+
+
+def _plain(value):
+    """numpy 스칼라/Timestamp 를 JSON 기본 타입으로 (NaN 은 None)"""
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def entry_payload(evaluation, df_1h, df_15m, evaluated_at):
+    """
+    evaluate_entry 결과를 발행/응답용 dict 로 변환 (봇의 {심볼}.signal 토픽과 /trading/signal 이 같은 형식)
+
+    Args:
+        evaluation: evaluate_entry 결과
+        df_1h, df_15m: 평가에 쓴 지표 DataFrame (마지막 행 = 평가 시점 캔들)
+        evaluated_at: 평가 시각 (ISO 문자열)
+    """
+    last = df_1h.iloc[-1]
+    return _plain({
+        'evaluated_at': evaluated_at,
+        'candle_time': last['timestamp'],
+        'candle_time_15m': df_15m['timestamp'].iloc[-1],
+        'candles': len(df_1h),
+        'has_signal': evaluation['signal'] is not None,
+        'signal': evaluation['signal'],
+        'checks': evaluation['checks'],
+        'quality': evaluation['quality'],
+        'regimes': evaluation['regimes'],
+        'targets': evaluation['targets'],
+        'indicators': {col: last[col] for col in DIAGNOSTIC_INDICATORS}
+    })
+
+
 class TradingStrategy:
     """Phase 1.3 변동성 적응형 전략 (백테스팅 동일 버전)"""
     
@@ -10,6 +54,40 @@ class TradingStrategy:
         self.base_leverage = 2.0
         self.min_quality_score = 60  # 60점으로 복구
         
+        # 청산 파라미터 (트레일링 스톱)
+        self.trailing_activation_pct = 0.05  # 5% 이상 수익 시 트레일링 시작
+        self.trailing_pcts = {
+            "ULTRA_LOW": 0.02,
+            "LOW": 0.02,
+            "NORMAL": 0.03,
+            "HIGH": 0.05,
+            "ULTRA_HIGH": 0.05
+        }
+    
+    def get_params(self):
+        """
+        전략 파라미터를 단계별로 반환 (백테스트 캐시 키 생성용)
+        
+        Returns:
+            dict: 'indicators' (지표 계산), 'entry' (진입 시그널), 'exit' (청산) 파라미터
+        """
+        return {
+            'indicators': {
+                'ema': [20, 50, 200],
+                'rsi': 14,
+                'atr': 14,
+                'vol_ma': 20
+            },
+            'entry': {
+                'base_leverage': self.base_leverage,
+                'min_quality_score': self.min_quality_score
+            },
+            'exit': {
+                'trailing_activation_pct': self.trailing_activation_pct,
+                'trailing_pcts': dict(self.trailing_pcts)
+            }
+        }
+        
     def ema(self, series, period):
         """EMA 계산"""
         return series.ewm(span=period, adjust=False).mean()
@@ -133,7 +211,11 @@ class TradingStrategy:
     
     def calculate_signal_quality(self, df_1h, df_15m):
         """시그널 품질 점수"""
-        score = 0
+        return self.calculate_signal_quality_breakdown(df_1h, df_15m)['total']
+    
+    def calculate_signal_quality_breakdown(self, df_1h, df_15m):
+        """시그널 품질 점수 항목별 (추세/모멘텀/RSI/거래량 각 최대 25점, total 은 100점 상한)"""
+        parts = {'trend': 0, 'momentum': 0, 'rsi': 0, 'volume': 0}
         
         # 추세 점수
         ema20 = df_1h['ema20'].iloc[-1]
@@ -143,30 +225,36 @@ class TradingStrategy:
         if ema20 > ema50 > ema200:
             gap1 = (ema20 - ema50) / ema50
             gap2 = (ema50 - ema200) / ema200
-            trend_score = min(25, (gap1 + gap2) * 1000)
-            score += trend_score
+            parts['trend'] = min(25, (gap1 + gap2) * 1000)
         
         # 모멘텀 점수
         if len(df_1h) >= 5:
             recent_returns = df_1h['returns'].iloc[-5:]
             positive_ratio = (recent_returns > 0).mean()
-            score += positive_ratio * 25
+            parts['momentum'] = positive_ratio * 25
         
         # RSI 점수
         rsi = df_1h['rsi14'].iloc[-1]
         if 30 <= rsi <= 70:
-            score += 25
+            parts['rsi'] = 25
         elif 40 <= rsi <= 60:
-            score += 15
+            parts['rsi'] = 15
         
         # 거래량 점수
         vol_ratio = df_1h['volume'].iloc[-1] / df_1h['vol_ma20'].iloc[-1]
         if vol_ratio > 1.2:
-            score += 25
+            parts['volume'] = 25
         elif vol_ratio > 1.0:
-            score += 15
+            parts['volume'] = 15
         
-        return min(100, score)
+        # 원래 계산과 같은 순서로 합산 (백테스트 결과와 비트 단위 일치)
+        score = 0
+        score += parts['trend']
+        score += parts['momentum']
+        score += parts['rsi']
+        score += parts['volume']
+        parts['total'] = min(100, score)
+        return parts
     
     def check_entry_signal(self, df_1h, df_15m, df_5m):
         """진입 시그널 확인"""
@@ -224,21 +312,65 @@ class TradingStrategy:
         
         return signal
     
+    def evaluate_entry(self, df_1h, df_15m, df_5m):
+        """
+        진입 시그널 진단 - check_entry_signal 결과와 판단 근거 (품질 항목, regime, 타겟)
+        
+        시그널이 없을 때도 어느 조건에서 걸렸는지 볼 수 있도록 모든 항목을 계산합니다.
+        
+        Returns:
+            dict: signal (check_entry_signal 결과 또는 None), checks, quality, regimes, targets
+        """
+        signal = self.check_entry_signal(df_1h, df_15m, df_5m)
+        
+        ema_aligned = bool(df_1h['ema20'].iloc[-1] > df_1h['ema50'].iloc[-1] > df_1h['ema200'].iloc[-1])
+        vol_regime, atr_ratio = self.detect_volatility_regime(df_1h)
+        market_regime = self.detect_market_regime(df_1h)
+        
+        atr_pct = df_1h['atr_pct'].iloc[-1]
+        atr_spike = bool(atr_pct > df_1h['atr_pct'].iloc[-30:].mean() * 1.5)
+        min_quality = 75 if atr_spike or vol_regime == "ULTRA_HIGH" else self.min_quality_score
+        
+        quality = self.calculate_signal_quality_breakdown(df_1h, df_15m)
+        tp1_pct, tp2_pct, sl_pct = self.calculate_targets(df_1h, vol_regime)
+        entry_price = df_1h['close'].iloc[-1]
+        
+        return {
+            'signal': signal,
+            'checks': {
+                'enough_candles': len(df_1h) >= 200,
+                'ema_aligned': ema_aligned,
+                'atr_spike': atr_spike,
+                'min_quality': min_quality,
+                'quality_passed': quality['total'] >= min_quality
+            },
+            'quality': quality,
+            'regimes': {
+                'volatility': vol_regime,
+                'atr_ratio': atr_ratio,
+                'market': market_regime
+            },
+            'targets': {
+                'entry_price': entry_price,
+                'tp1_price': entry_price * (1 + tp1_pct),
+                'tp2_price': entry_price * (1 + tp2_pct),
+                'sl_price': entry_price * (1 - sl_pct),
+                'tp1_pct': tp1_pct * 100,
+                'tp2_pct': tp2_pct * 100,
+                'sl_pct': sl_pct * 100
+            }
+        }
+    
     def calculate_trailing_stop(self, entry_price, current_price, vol_regime):
         """트레일링 스톱 계산 (백테스팅과 동일)"""
         profit_pct = (current_price - entry_price) / entry_price
         
         # 5% 이상 수익 시 트레일링 시작
-        if profit_pct < 0.05:
+        if profit_pct < self.trailing_activation_pct:
             return None
         
-        # 변동성별 트레일링 간격
-        if vol_regime in ["LOW", "ULTRA_LOW"]:
-            trailing_pct = 0.02  # 2%
-        elif vol_regime == "NORMAL":
-            trailing_pct = 0.03  # 3%
-        else:  # HIGH, ULTRA_HIGH
-            trailing_pct = 0.05  # 5%
+        # 변동성별 트레일링 간격 (LOW 2%, NORMAL 3%, HIGH 5%)
+        trailing_pct = self.trailing_pcts.get(vol_regime, self.trailing_pcts["HIGH"])
         
         trailing_price = current_price * (1 - trailing_pct)
         
@@ -0,0 +1,55 @@
+"""
+거래소 호출 메트릭 - 엔드포인트별 지연 시간과 응답 코드를 기록하는 pybit HTTP 세션
+
+모든 REST 호출이 거치는 HTTP._submit_request 를 감싸므로 DataCollector / OrderManager 코드는 바뀌지 않고,
+HTTP 의 하위 클래스라 거래소 조회 공유(single_flight.session_key)도 그대로 동작합니다.
+리플레이의 SimulatedExchange 는 이 클래스를 쓰지 않으므로 가상 호출은 기록되지 않습니다.
+
+endpoint 레이블: 호스트를 뺀 경로 (예: /v5/market/kline)
+code 레이블: 성공 "0", Bybit 오류 retCode (예: "110043"), HTTP 실패 "http_{상태}", 그 외 예외 클래스 이름
+"""
+import time
+
+from pybit.exceptions import FailedRequestError, InvalidRequestError
+from pybit.unified_trading import HTTP
+
+from .metrics import metrics
+
+EXCHANGE_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+exchange_latency = metrics.histogram(
+    "exchange_request_duration_seconds", "거래소 REST 호출 지연 시간 (pybit 재시도 포함)",
+    ("endpoint",), EXCHANGE_BUCKETS
+)
+exchange_requests = metrics.counter(
+    "exchange_requests_total", "거래소 REST 호출 수 (code: 0 성공 / retCode / http_상태 / 예외 이름)",
+    ("endpoint", "code")
+)
+
+
+class InstrumentedHTTP(HTTP):
+    """호출마다 exchange_request_duration_seconds / exchange_requests_total 을 기록하는 HTTP 세션"""
+
+    def _submit_request(self, method=None, path=None, query=None, auth=False):
+        started = time.perf_counter()
+        code = "0"
+        try:
+            response = super()._submit_request(method=method, path=path, query=query, auth=auth)
+            if isinstance(response, dict):
+                code = str(response.get("retCode", 0))
+            return response
+        except InvalidRequestError as e:
+            code = str(e.status_code)
+            raise
+        except FailedRequestError as e:
+            code = f"http_{e.status_code}"
+            raise
+        except Exception as e:
+            code = type(e).__name__
+            raise
+        finally:
+            # pybit 는 path 에 호스트를 붙여 넘김
+            if path and path.startswith(self.endpoint):
+                path = path[len(self.endpoint):]
+            exchange_latency.labels(path).observe(time.perf_counter() - started)
+            exchange_requests.labels(path, code).inc()
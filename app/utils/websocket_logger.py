@@ -4,12 +4,56 @@
 import sys
 import asyncio
 import logging
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
 from ..websocket.log_manager import log_manager
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 줄바꿈 없이 쌓일 수 있는 최대 문자 수 (초과 시 그대로 한 줄로 전송)
+MAX_PARTIAL_LINE = 64 * 1024
+
+# 로그 컨텍스트 (스레드별) - 심볼 등 print 문에서 알 수 없는 정보를 로그 레코드에 붙입니다
+_context = threading.local()
+
+
+def set_log_symbol(symbol: Optional[str]):
+    """현재 스레드에서 출력되는 로그에 붙일 심볼 설정 (None이면 해제)"""
+    _context.symbol = symbol
+
+
+@contextmanager
+def log_symbol(symbol: Optional[str]):
+    """with 블록 동안 현재 스레드의 로그 심볼 지정"""
+    previous = getattr(_context, "symbol", None)
+    _context.symbol = symbol
+    try:
+        yield
+    finally:
+        _context.symbol = previous
+
+
+def infer_level(line: str, default: str = "INFO") -> str:
+    """출력 문자열의 표식으로 로그 레벨 추정 (이 저장소의 print 로그 관례: ❌ 오류, ⚠️ 경고)"""
+    if "❌" in line or "Traceback" in line:
+        return "ERROR"
+    if "⚠️" in line or "⚠" in line:
+        return "WARNING"
+    return default
+
+
+def _caller_module() -> str:
+    """print 를 호출한 모듈 이름 (write → print 호출자 프레임)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        name = frame.f_globals.get("__name__", "")
+        if name != __name__ and not name.startswith(("logging", "traceback")):
+            return name
+        frame = frame.f_back
+    return "unknown"
+
 class WebSocketLogger:
     """표준 출력을 WebSocket으로 리다이렉트하는 클래스"""
     
@@ -23,6 +67,8 @@ class WebSocketLogger:
     def start_redirect(self):
         """표준 출력을 WebSocket으로 리다이렉트 시작"""
         if not self.is_redirected:
+            self.original_stdout = sys.stdout
+            self.original_stderr = sys.stderr
             sys.stdout = self.websocket_stdout
             sys.stderr = self.websocket_stderr
             self.is_redirected = True
@@ -30,26 +76,93 @@ class WebSocketLogger:
     def stop_redirect(self):
         """표준 출력 복원"""
         if self.is_redirected:
+            self.websocket_stdout.flush_pending()
+            self.websocket_stderr.flush_pending()
             sys.stdout = self.original_stdout
             sys.stderr = self.original_stderr
             self.is_redirected = False
 
+class _LineBuffer:
+    """스레드 하나의 줄바꿈 전 부분 출력"""
+    __slots__ = ("text", "thread")
+    
+    def __init__(self, thread: threading.Thread):
+        self.text = ""
+        self.thread = thread
+
 class WebSocketStdOut:
-    """WebSocket으로 출력하는 표준 출력 클래스"""
+    """
+    WebSocket으로 출력하는 표준 출력 클래스
+    
+    어느 스레드에서 print 해도 안전합니다. 스레드별 버퍼에 부분 출력을 모았다가
+    완성된 줄만 log_manager.submit() 으로 넘깁니다 (이벤트 루프가 없어도 동작).
+    """
+    
+    encoding = "utf-8"
+    errors = "replace"
+    default_level = "INFO"
+    
+    def __init__(self):
+        self._local = threading.local()
+        # 스레드별 버퍼 목록 (리다이렉트 종료 시 끝난 스레드의 것까지 남은 부분 출력을 보내기 위해 보관)
+        self._buffers: List["_LineBuffer"] = []
+        self._buffers_lock = threading.Lock()
+    
+    def _submit(self, line: str, source: str):
+        log_manager.submit(
+            line,
+            level=infer_level(line, self.default_level),
+            source=source,
+            symbol=getattr(_context, "symbol", None)
+        )
     
     def write(self, message: str):
-        """메시지를 WebSocket으로 전송"""
-        if message.strip():
-            asyncio.create_task(log_manager.broadcast_log(message))
+        """메시지를 줄 단위로 WebSocket 로그 대기열에 전달 (레벨/소스 모듈/심볼 태그 포함)"""
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = self._local.cell = _LineBuffer(threading.current_thread())
+            with self._buffers_lock:
+                # 새 스레드가 등록될 때만 비어 있는 끝난 스레드의 버퍼 정리
+                self._buffers = [c for c in self._buffers if c.text or c.thread.is_alive()]
+                self._buffers.append(cell)
+        buffer = cell.text + message
+        
+        if "\n" in buffer:
+            *lines, buffer = buffer.split("\n")
+            source = _caller_module()
+            for line in lines:
+                if line.strip():
+                    self._submit(line, source)
+        
+        if len(buffer) > MAX_PARTIAL_LINE:
+            self._submit(buffer, _caller_module())
+            buffer = ""
+        
+        cell.text = buffer
         return len(message)
     
     def flush(self):
-        """버퍼 플러시 (필수 메서드)"""
+        """버퍼 플러시 (필수 메서드) - 줄바꿈 없이 남은 부분 출력은 다음 줄과 합쳐지도록 유지"""
         pass
+    
+    def flush_pending(self):
+        """모든 스레드에 남은 부분 출력(줄바꿈 없이 끝난 print)을 로그로 보냄 - 리다이렉트 종료 시 호출"""
+        with self._buffers_lock:
+            cells = list(self._buffers)
+        for cell in cells:
+            text, cell.text = cell.text, ""
+            if text.strip():
+                self._submit(text, "stdout")
+    
+    def isatty(self):
+        return False
+    
+    def writable(self):
+        return True
 
 class WebSocketStdErr(WebSocketStdOut):
-    """에러 메시지를 WebSocket으로 출력하는 클래스"""
-    pass
+    """에러 메시지를 WebSocket으로 출력하는 클래스 (표식이 없으면 ERROR 레벨)"""
+    default_level = "ERROR"
 
 # 전역 인스턴스 생성
 websocket_logger = WebSocketLogger()
@@ -1,71 +1,278 @@
 """
 WebSocket 연결 관리자 (connection_manager.py)
 """
-from typing import Dict, List, Any
+from typing import Dict, Any, Optional
+from collections import OrderedDict
 from fastapi import WebSocket
+import asyncio
+import itertools
 import json
 from datetime import datetime
 import logging
 import uuid # client_id를 생성할 경우 필요
 
+from ..config import settings
+from .subscriptions import SubscriptionIndex
+from .encoding import Frame, send_encoded
+from .pubsub import MessageBus
+
 logger = logging.getLogger(__name__)
 
+# 느린 클라이언트 처리 정책
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+class ClientConnection:
+    """
+    클라이언트별 전송 대기열과 전용 writer 태스크
+    
+    broadcast 는 대기열에 넣기만 하고 즉시 반환하며, 실제 send_text 는 클라이언트마다
+    자신의 writer 태스크에서 수행합니다. 따라서 느린 클라이언트가 다른 클라이언트나
+    발행자(봇)를 지연시키지 않습니다.
+    
+    대기열에는 Frame 이 들어가며, 클라이언트의 인코딩(json/msgpack/packed)으로 꺼낼 때 인코딩됩니다
+    (형식별 1회, 같은 형식의 클라이언트끼리 공유).
+    """
+    
+    def __init__(self, client_id: str, websocket: WebSocket, manager: "ConnectionManager",
+                 encoding: str = "json"):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.manager = manager
+        self.encoding = encoding
+        # 키 -> 메시지 Frame (coalesce 정책에서는 키가 (토픽, 메시지 종류)라 같은 토픽의 대기 delta 를 최신값으로 교체)
+        self.pending: "OrderedDict[Any, Frame]" = OrderedDict()
+        self.dropped = 0
+        self.sent = 0
+        self.overflowed = False
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+    
+    def stop(self):
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._task = None
+    
+    def enqueue(self, symbol: Optional[str], payload: Frame):
+        """
+        메시지를 대기열에 추가 (대기하지 않음)
+        
+        symbol 이 None 인 제어 메시지(pong, error)는 coalesce 정책에서도 합쳐지지 않습니다.
+        
+        snapshot 은 이후 delta 의 기준이므로 delta 때문에 버려지지 않습니다 - coalesce 에서 snapshot 과 delta 는
+        서로 다른 키이고, 대기열이 가득 차면 가장 오래된 snapshot 이 아닌 메시지를 버립니다
+        (대기 메시지가 모두 snapshot 이면 들어온 delta 를 버림).
+        """
+        if self.overflowed:
+            return
+        
+        policy = self.manager.slow_consumer_policy
+        is_snapshot = payload.message.get("type") == "snapshot"
+        if policy == "coalesce" and symbol is not None:
+            key = (symbol, payload.message.get("type"))
+        else:
+            key = next(self._seq)
+        
+        if key in self.pending:
+            # coalesce: 아직 전송되지 않은 같은 토픽/종류 메시지는 최신 메시지로 대체
+            del self.pending[key]
+            self.dropped += 1
+        elif len(self.pending) >= self.manager.queue_size:
+            if policy == "disconnect":
+                self.overflowed = True
+                self.pending.clear()
+                self._wakeup.set()
+                return
+            victim = next((k for k, frame in self.pending.items()
+                           if frame.message.get("type") != "snapshot"), None)
+            self.dropped += 1
+            if victim is None and not is_snapshot:
+                return
+            if victim is None:
+                self.pending.popitem(last=False)
+            else:
+                del self.pending[victim]
+        
+        self.pending[key] = payload
+        self._wakeup.set()
+    
+    async def _writer(self):
+        """대기열을 비우며 클라이언트에게 전송"""
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                
+                if self.overflowed:
+                    logger.warning(f"느린 클라이언트 연결 종료 (대기열 초과): {self.client_id}")
+                    try:
+                        await self.websocket.close(code=1008)
+                    except Exception:
+                        pass
+                    self.manager.disconnect(self.client_id, self.websocket)
+                    return
+                
+                while self.pending:
+                    _, payload = self.pending.popitem(last=False)
+                    await send_encoded(self.websocket, payload.encode(self.encoding))
+                    self.sent += 1
+                    
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error sending to {self.client_id}: {e}")
+            self.manager.disconnect(self.client_id, self.websocket)
+
+
 class ConnectionManager:
     """WebSocket 연결을 관리하고 메시지를 브로드캐스팅하는 클래스"""
     
-    def __init__(self):
+    def __init__(self, queue_size: int = 256, slow_consumer_policy: str = "drop_oldest"):
+        """
+        Args:
+            queue_size: 클라이언트별 전송 대기열 최대 길이
+            slow_consumer_policy: 대기열이 가득 찼을 때 처리 방식
+                - drop_oldest: 가장 오래된 메시지 버림
+                - coalesce: 토픽/메시지 종류별 최신 메시지만 유지 (가득 차면 가장 오래된 메시지 버림)
+                - disconnect: 연결 종료
+        """
+        if slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"지원하지 않는 정책: {slow_consumer_policy}")
+        
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
         self.active_connections: Dict[str, WebSocket] = {}
-        self.subscriptions: Dict[str, List[str]] = {}
+        self.clients: Dict[str, ClientConnection] = {}
+        self.subscriptions = SubscriptionIndex()
+        self.bus: Optional[MessageBus] = None
 
-    async def connect(self, websocket: WebSocket, client_id: str):
-        """새로운 WebSocket 연결을 등록합니다. (Accept 호출 제거)"""
+    def attach_bus(self, bus: MessageBus):
+        """워커 간 pub/sub 버스 연결 - broadcast 가 다른 워커의 구독자에게도 전달됨"""
+        self.bus = bus
+        bus.subscribe("trading", lambda item: self.publish(item[0], "trading_update", item[1]))
+
+    async def connect(self, websocket: WebSocket, client_id: str, encoding: str = "json"):
+        """
+        새로운 WebSocket 연결을 등록합니다. (Accept 호출 제거)
+        
+        같은 client_id 로 이미 연결된 클라이언트가 있으면 (재연결) 이전 연결의 writer 와 구독을 정리하고
+        이전 소켓을 닫은 뒤 새 연결로 교체합니다.
+        """
         # 🟢 수정 완료: 라우터에서 accept()를 처리하도록 accept() 호출 제거
+        old = self.clients.pop(client_id, None)
+        if old:
+            old.stop()
+            del self.active_connections[client_id]
+            self.subscriptions.remove_client(client_id)
+            logger.info(f"같은 client_id 로 재연결 - 이전 연결 교체: {client_id}")
+            try:
+                await old.websocket.close(code=1000)
+            except Exception:
+                pass
+        
+        client = ClientConnection(client_id, websocket, self, encoding=encoding)
         self.active_connections[client_id] = websocket
+        self.clients[client_id] = client
+        client.start()
         logger.info(f"새 클라이언트 연결 등록: {client_id}")
 
-    def disconnect(self, client_id: str):
-        """WebSocket 연결을 해제하고 관련된 모든 구독을 정리합니다."""
+    def disconnect(self, client_id: str, websocket: Optional[WebSocket] = None):
+        """
+        WebSocket 연결을 해제하고 관련된 모든 구독을 정리합니다.
+        
+        websocket 을 넘기면 그 소켓이 현재 등록된 연결일 때만 해제합니다 (교체된 이전 연결의 정리가
+        같은 client_id 의 새 연결을 해제하지 않도록).
+        """
+        if websocket is not None and self.active_connections.get(client_id) is not websocket:
+            return
         if client_id in self.active_connections:
             del self.active_connections[client_id]
-            # 모든 구독에서 클라이언트 제거
-            for symbol, clients in list(self.subscriptions.items()):
-                if client_id in clients:
-                    clients.remove(client_id)
-                if not clients:
-                    del self.subscriptions[symbol]
+            client = self.clients.pop(client_id, None)
+            if client:
+                client.stop()
+            # 클라이언트가 구독한 토픽에서만 제거 (전체 심볼 순회 없음)
+            self.subscriptions.remove_client(client_id)
             logger.info(f"클라이언트 연결 종료 및 등록 해제: {client_id}")
 
     async def subscribe(self, client_id: str, symbol: str):
-        """클라이언트를 특정 심볼의 구독자로 등록합니다."""
-        if symbol not in self.subscriptions:
-            self.subscriptions[symbol] = []
-        if client_id not in self.subscriptions[symbol]:
-            self.subscriptions[symbol].append(client_id)
+        """
+        클라이언트를 특정 심볼/토픽의 구독자로 등록합니다.
+        
+        토픽 패턴(ETHUSDT.kline.*, ETHUSDT.#)도 사용할 수 있습니다.
+        """
+        if self.subscriptions.subscribe(client_id, symbol):
             logger.info(f"클라이언트 {client_id}가 {symbol} 구독 시작")
 
+    async def unsubscribe(self, client_id: str, symbol: str):
+        """클라이언트의 특정 심볼/토픽 구독을 해제합니다."""
+        if self.subscriptions.unsubscribe(client_id, symbol):
+            logger.info(f"클라이언트 {client_id}가 {symbol} 구독 해제")
+
     async def broadcast(self, symbol: str, message: Dict[str, Any]) -> None:
-        """특정 심볼을 구독한 모든 클라이언트에게 메시지를 전송합니다."""
-        if symbol not in self.subscriptions:
-            return
-            
-        message_str = json.dumps({
-            "type": "trading_update",
+        """
+        특정 심볼을 구독한 모든 클라이언트에게 메시지를 전송합니다.
+        
+        메시지는 형식별로 한 번만 직렬화해 각 클라이언트 대기열에 넣고 바로 반환합니다 (전송 완료를 기다리지 않음).
+        """
+        self.publish(symbol, "trading_update", message)
+        if self.bus is not None and self.bus.has_peers:
+            self.bus.publish("trading", [symbol, message])
+
+    def _frame(self, symbol: str, message_type: str, data: Any, seq: Optional[int] = None) -> Frame:
+        message = {
+            "type": message_type,
             "symbol": symbol,
             "timestamp": datetime.utcnow().isoformat() + "Z",
-            "data": message
-        })
-        
-        disconnected_clients = []
+            "data": data
+        }
+        if seq is not None:
+            message["seq"] = seq
+        return Frame(message)
+
+    def publish(self, symbol: str, message_type: str, data: Any, seq: Optional[int] = None) -> None:
+        """토픽 구독자에게 메시지 전송 (형식별 한 번만 직렬화, 대기하지 않음 - 이벤트 루프에서 호출)"""
+        subscribers = self.subscriptions.subscribers(symbol)
+        if not subscribers:
+            return
         
-        for client_id in self.subscriptions[symbol]:
-            try:
-                if client_id in self.active_connections:
-                    await self.active_connections[client_id].send_text(message_str)
-            except Exception as e:
-                logger.error(f"Error sending to {client_id}: {e}")
-                disconnected_clients.append(client_id)
+        frame = self._frame(symbol, message_type, data, seq)
+        for client_id in subscribers:
+            client = self.clients.get(client_id)
+            if client:
+                client.enqueue(symbol, frame)
+
+    def send(self, client_id: str, symbol: str, message_type: str, data: Any, seq: Optional[int] = None) -> None:
+        """특정 클라이언트에게만 메시지 전송 (구독 스냅샷 등)"""
+        client = self.clients.get(client_id)
+        if client:
+            client.enqueue(symbol, self._frame(symbol, message_type, data, seq))
+
+    def send_direct(self, client_id: str, message: Dict[str, Any]) -> None:
+        """
+        특정 클라이언트에게 토픽이 없는 제어 메시지 전송 (pong, error)
         
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
+        소켓에 직접 보내지 않고 클라이언트 대기열에 넣으므로 writer 태스크만 소켓에 전송합니다.
+        """
+        client = self.clients.get(client_id)
+        if client:
+            client.enqueue(None, Frame(message))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """클라이언트별 전송/드롭 통계"""
+        return {
+            "clients": len(self.clients),
+            "policy": self.slow_consumer_policy,
+            "queue_size": self.queue_size,
+            "pending": sum(len(c.pending) for c in self.clients.values()),
+            "dropped": sum(c.dropped for c in self.clients.values()),
+            "sent": sum(c.sent for c in self.clients.values())
+        }
 
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager(
+    queue_size=settings.WS_SEND_QUEUE_SIZE,
+    slow_consumer_policy=settings.WS_SLOW_CONSUMER_POLICY
+)
@@ -0,0 +1,94 @@
+"""
+WebSocket 메시지 인코딩 (encoding.py)
+
+클라이언트는 연결 시 ?encoding= 으로 형식을 선택합니다.
+    json    : 텍스트 JSON (기본값, 기존 형식)
+    msgpack : MessagePack 바이너리 프레임 - 메시지 timestamp 는 epoch ms 정수
+    packed  : msgpack + 캔들 배열([[t, o, h, l, c, v], ...])을 열 단위 packed 배열로 변환
+              data = {"n": 행 수, "t": int64 LE bytes, "ohlcv": float64 LE bytes (n x 5, 행 우선)}
+
+메시지는 Frame 에 담겨 형식별로 처음 필요할 때 한 번만 인코딩되고, 같은 형식의 클라이언트가 결과를 공유합니다.
+msgpack 이 설치되어 있지 않으면 바이너리 요청은 json 으로 대체됩니다.
+permessage-deflate 압축은 서버(uvicorn ws_per_message_deflate)와 클라이언트가 협상하며, 연결마다 따로 압축됩니다.
+"""
+from typing import Any, Dict, Union
+import json
+import time
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+ENCODINGS = ("json", "msgpack", "packed")
+
+
+def negotiate(requested: str = None) -> str:
+    """요청한 인코딩 중 사용 가능한 형식 (알 수 없거나 msgpack 미설치 시 json)"""
+    encoding = (requested or "json").lower()
+    if encoding not in ENCODINGS or (encoding != "json" and msgpack is None):
+        return "json"
+    return encoding
+
+
+def _is_ohlcv(data: Any) -> bool:
+    return isinstance(data, list) and bool(data) and isinstance(data[0], list) and len(data[0]) == 6
+
+
+def pack_ohlcv(candles: list) -> Dict[str, Any]:
+    """[[t, o, h, l, c, v], ...] -> 열 단위 packed 배열"""
+    arr = np.asarray(candles, dtype=np.float64)
+    return {
+        "n": len(arr),
+        "t": arr[:, 0].astype("<i8").tobytes(),
+        "ohlcv": np.ascontiguousarray(arr[:, 1:], dtype="<f8").tobytes()
+    }
+
+
+def unpack_ohlcv(packed: Dict[str, Any]) -> np.ndarray:
+    """pack_ohlcv 역변환 - (n, 6) float64 배열 (클라이언트/벤치마크용)"""
+    n = packed["n"]
+    t = np.frombuffer(packed["t"], dtype="<i8").astype(np.float64)
+    ohlcv = np.frombuffer(packed["ohlcv"], dtype="<f8").reshape(n, 5)
+    return np.column_stack([t, ohlcv])
+
+
+def encode(message: Dict[str, Any], encoding: str = "json", created: float = None) -> Union[str, bytes]:
+    """메시지를 형식에 맞게 직렬화 (json -> str, msgpack/packed -> bytes)"""
+    if encoding == "json":
+        return json.dumps(message)
+    
+    if isinstance(message.get("timestamp"), str):
+        message = {**message, "timestamp": int((created or time.time()) * 1000)}
+    
+    if encoding == "packed" and _is_ohlcv(message.get("data")):
+        message = {**message, "data": pack_ohlcv(message["data"]), "packed": "ohlcv"}
+    
+    return msgpack.packb(message, use_bin_type=True)
+
+
+class Frame:
+    """한 번 만든 메시지를 형식별로 한 번만 인코딩해 여러 클라이언트가 공유"""
+    
+    __slots__ = ("message", "created", "_encoded")
+    
+    def __init__(self, message: Dict[str, Any], created: float = None):
+        self.message = message
+        self.created = created or time.time()
+        self._encoded: Dict[str, Union[str, bytes]] = {}
+    
+    def encode(self, encoding: str = "json") -> Union[str, bytes]:
+        data = self._encoded.get(encoding)
+        if data is None:
+            data = self._encoded[encoding] = encode(self.message, encoding, self.created)
+        return data
+
+
+async def send_encoded(websocket, data: Union[str, bytes]):
+    """인코딩 결과 전송 (bytes 는 바이너리 프레임, str 은 텍스트 프레임)"""
+    if isinstance(data, bytes):
+        await websocket.send_bytes(data)
+    else:
+        await websocket.send_text(data)
@@ -0,0 +1,112 @@
+"""
+로그 스트리밍 필터 (log_filter.py)
+
+클라이언트별 필터를 연결/변경 시 한 번만 컴파일하고, 서버에서 직렬화 전에 평가합니다.
+같은 조건의 필터는 같은 key 를 가지므로 매니저가 클라이언트를 묶어 배치당 한 번만 평가/직렬화합니다.
+"""
+import re
+from typing import Any, Dict, Iterable, Optional
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+
+def _check_str(name: str, value) -> Optional[str]:
+    """문자열 조건 확인 (None 허용) - 필터 변경 메시지의 JSON 값은 숫자/목록일 수 있음"""
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{name} 는 문자열이어야 합니다: {value!r}")
+    return value
+
+
+def _as_set(name: str, value) -> Optional[frozenset]:
+    """쉼표 구분 문자열 또는 문자열 목록을 집합으로 변환 (비어 있으면 None = 조건 없음)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    elif not isinstance(value, (list, tuple, set, frozenset)) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{name} 는 쉼표 구분 문자열 또는 문자열 목록이어야 합니다: {value!r}")
+    items = frozenset(v.strip() for v in value if v.strip())
+    return items or None
+
+
+class LogFilter:
+    """
+    로그 레코드 필터
+    
+    모든 조건은 AND 로 결합됩니다.
+        level: 최소 레벨 (INFO 면 INFO/WARNING/ERROR/CRITICAL)
+        source: 소스 모듈 이름 목록 - 접두사 일치 (app.trading 은 app.trading.live_trading_bot 포함)
+        symbol: 심볼 목록 (심볼 정보가 없는 레코드는 제외)
+        contains: 부분 문자열 (대소문자 무시)
+        regex: 정규식 (re.search)
+    """
+    
+    def __init__(self, level: Optional[str] = None, source=None, symbol=None,
+                 contains: Optional[str] = None, regex: Optional[str] = None):
+        """
+        Raises:
+            ValueError: 알 수 없는 레벨, 문자열이 아닌 조건 값
+            re.error: 잘못된 정규식
+        """
+        level = _check_str("level", level)
+        contains = _check_str("contains", contains)
+        regex = _check_str("regex", regex)
+        if level and level.upper() not in LEVELS:
+            raise ValueError(f"알 수 없는 로그 레벨: {level}")
+        
+        self.min_level = LEVELS[level.upper()] if level else 0
+        self.sources = _as_set("source", source)
+        self.symbols = _as_set("symbol", symbol)
+        self.contains = contains.lower() if contains else None
+        self.pattern = re.compile(regex) if regex else None
+        self._source_prefixes = tuple(f"{s}." for s in self.sources) if self.sources else ()
+        
+        self.key = (
+            self.min_level,
+            tuple(sorted(self.sources)) if self.sources else None,
+            tuple(sorted(self.symbols)) if self.symbols else None,
+            self.contains,
+            regex or None
+        )
+    
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> Optional["LogFilter"]:
+        """쿼리 파라미터/메시지 dict 에서 필터 생성 (조건이 없으면 None = 전체 수신)"""
+        f = cls(
+            level=params.get("level"),
+            source=params.get("source"),
+            symbol=params.get("symbol"),
+            contains=params.get("contains"),
+            regex=params.get("regex")
+        )
+        return None if f.is_empty else f
+    
+    @property
+    def is_empty(self) -> bool:
+        return self.key == (0, None, None, None, None)
+    
+    def matches(self, record: Dict[str, Any]) -> bool:
+        """레코드가 조건을 모두 만족하는지 (비용이 낮은 조건부터 평가)"""
+        if LEVELS.get(record.get("level"), 20) < self.min_level:
+            return False
+        
+        if self.symbols is not None and record.get("symbol") not in self.symbols:
+            return False
+        
+        if self.sources is not None:
+            source = record.get("source") or ""
+            if source not in self.sources and not source.startswith(self._source_prefixes):
+                return False
+        
+        message = record["message"]
+        if self.contains is not None and self.contains not in message.lower():
+            return False
+        
+        if self.pattern is not None and not self.pattern.search(message):
+            return False
+        
+        return True
+    
+    def apply(self, records: Iterable[Dict[str, Any]]) -> list:
+        """조건을 만족하는 레코드만 반환"""
+        return [r for r in records if self.matches(r)]
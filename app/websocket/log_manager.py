@@ -1,62 +1,398 @@
 """
 WebSocket을 통한 실시간 로그 전송을 담당하는 모듈 (log_manager.py)
 """
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
+from collections import deque
 from fastapi import WebSocket
 import asyncio
-import json
+import itertools
 from datetime import datetime
 import logging
+import os
 import sys
+import threading
+import time
+
+from ..config import settings
+from .log_filter import LogFilter
+from .encoding import Frame, send_encoded
+from .pubsub import MessageBus
 
 logger = logging.getLogger(__name__)
 
+
+def parse_cursor(value: str, worker_id: str) -> Dict[str, int]:
+    """
+    재연결 커서 파싱 - "워커:seq,워커:seq" (발생 워커별 마지막으로 받은 seq)
+
+    워커 ID 가 없는 정수 하나는 단일 워커 서버의 이전 형식으로 보고 worker_id(현재 워커)의 seq 로 취급합니다.
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    value = value.strip()
+    if value.isdigit():
+        return {worker_id: int(value)}
+    cursor = {}
+    for part in value.split(","):
+        worker, sep, seq = part.strip().rpartition(":")
+        if not sep or not worker or not seq.isdigit():
+            raise ValueError(f"잘못된 cursor 항목: {part!r} (워커:seq 형식)")
+        cursor[worker] = int(seq)
+    return cursor
+
+
+def format_cursor(cursor: Dict[str, int]) -> str:
+    return ",".join(f"{worker}:{seq}" for worker, seq in cursor.items())
+
+
+class LogConnection:
+    """
+    /ws/logs 클라이언트별 전송 대기열과 전용 writer 태스크
+
+    로그 처리 태스크는 인코딩된 프레임을 대기열에 넣기만 하므로 느린 클라이언트가 다른 클라이언트의
+    로그 전달을 지연시키지 않습니다. 대기열이 max_frames 를 넘거나 전송 한 번이 send_timeout 을 넘으면
+    연결을 끊습니다 - 클라이언트는 워커별 마지막 seq 를 cursor 로 재연결해 놓친 로그를 재전송받습니다.
+    """
+
+    def __init__(self, websocket: WebSocket, manager: "LogWebSocketManager", max_frames: int, send_timeout: float):
+        self.websocket = websocket
+        self.manager = manager
+        self.max_frames = max_frames
+        self.send_timeout = send_timeout
+        self.pending: deque = deque()
+        self.sent = 0
+        self.overflowed = False
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+
+    def stop(self):
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._task = None
+
+    def enqueue(self, data):
+        """인코딩된 프레임 추가 (대기하지 않음, 대기열 초과 시 연결 종료 예약)"""
+        if self.overflowed:
+            return
+        if len(self.pending) >= self.max_frames:
+            self.overflowed = True
+            self.pending.clear()
+        else:
+            self.pending.append(data)
+        self._wakeup.set()
+
+    async def _writer(self):
+        try:
+            while not self.overflowed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self.pending and not self.overflowed:
+                    data = self.pending.popleft()
+                    await asyncio.wait_for(send_encoded(self.websocket, data), self.send_timeout)
+                    self.sent += 1
+            reason = f"대기열 초과 ({self.max_frames} 프레임)"
+        except asyncio.CancelledError:
+            return
+        except asyncio.TimeoutError:
+            reason = f"전송 {self.send_timeout}초 초과"
+        except Exception as e:
+            reason = f"전송 오류: {e}"
+
+        logger.warning(f"로그 클라이언트 연결 종료 ({reason})")
+        self.manager.slow_disconnects += 1
+        self.manager.disconnect(self.websocket)
+        try:
+            await asyncio.wait_for(self.websocket.close(code=1008), self.send_timeout)
+        except Exception:
+            pass
+
+
 class LogWebSocketManager:
-    """WebSocket을 통해 실시간 로그를 전송하는 매니저"""
+    """
+    WebSocket을 통해 실시간 로그를 전송하는 매니저
+    
+    로그는 어느 스레드에서든 submit() 으로 넣을 수 있습니다 (deque append + 필요할 때만
+    call_soon_threadsafe 로 이벤트 루프를 깨움). 루프에서는 대기열을 마이크로 배치로 꺼내
+    배치마다 한 번만 JSON 직렬화하고, 같은 프레임을 모든 클라이언트의 전송 대기열(LogConnection)에 넣습니다.
+    실제 전송은 클라이언트별 writer 태스크가 하므로 느리거나 멈춘 클라이언트는 자신만 끊깁니다.
+        - 1줄: {"type": "log", "seq": ..., "timestamp": ..., "message": ...} (기존 형식 + seq)
+        - 여러 줄: {"type": "log_batch", "logs": [{"seq": ..., "timestamp": ..., "message": ...}, ...]}
+    
+    최근 로그는 줄 수/용량 상한이 있는 링 버퍼에 보관하며, 새 클라이언트는 연결 시
+    최근 N줄 / 최근 T초 / 커서 이후 로그를 한 프레임(log_replay)으로 받은 뒤 실시간 로그를 받습니다.
+    
+    클라이언트별 LogFilter(레벨/소스/심볼/문자열/정규식)는 직렬화 전에 서버에서 평가하며,
+    같은 필터를 쓰는 클라이언트끼리 묶어 그룹당 한 번만 필터링하고, 그룹 안에서는 인코딩
+    형식(json/msgpack)별로 한 번만 직렬화합니다.
+    
+    pub/sub 버스가 연결되면 이 워커에서 발생한 로그 배치를 다른 워커로 전달하고, 다른 워커의 로그를
+    받아 로컬 클라이언트에게 보냅니다. seq 는 발생 워커(레코드의 worker 항목)가 매긴 번호를 그대로 쓰므로
+    (worker, seq) 가 어느 워커에서 받든 같은 로그를 가리킵니다. 재연결 커서는 발생 워커별 마지막 seq 이며
+    ("워커:seq,워커:seq"), 다른 워커로 재연결해도 놓친 로그만 재전송됩니다.
+    """
     
-    def __init__(self):
+    def __init__(self, queue_size: int = 10000, batch_size: int = 500, batch_interval: float = 0.05,
+                 history_size: int = 5000, history_max_bytes: int = 4 * 1024 * 1024,
+                 client_queue_size: int = 256, send_timeout: float = 5.0):
+        """
+        Args:
+            queue_size: 로그 대기열 최대 길이 (가득 차면 가장 오래된 로그를 버림)
+            batch_size: 프레임 하나에 담을 최대 로그 줄 수
+            batch_interval: 첫 로그 도착 후 추가 로그를 모으는 시간 (초)
+            history_size: 재전송용으로 보관할 최근 로그 줄 수
+            history_max_bytes: 보관 로그의 최대 용량 (메시지 길이 기준 추정치)
+            client_queue_size: 클라이언트별 전송 대기 프레임 수 상한 (초과 시 연결 종료)
+            send_timeout: 프레임 하나 전송 제한 시간 (초과 시 연결 종료, 초)
+        """
         self.active_connections: List[WebSocket] = []
-        self.log_queue: asyncio.Queue = asyncio.Queue()
+        self.writers: Dict[WebSocket, LogConnection] = {}
+        self.client_queue_size = client_queue_size
+        self.send_timeout = send_timeout
+        self.filters: Dict[WebSocket, LogFilter] = {}
+        self.encodings: Dict[WebSocket, str] = {}
+        self._groups: Optional[List] = None
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
         self._is_running = False
         self._task: Optional[asyncio.Task] = None
+        
+        # 스레드 간 전달 대기열 (append/popleft 는 GIL 하에서 원자적, maxlen 초과 시 오래된 항목 삭제)
+        self._pending: deque = deque(maxlen=queue_size)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._wakeup_scheduled = False
+        self._seq = itertools.count(1)
+        self.worker_id = str(os.getpid())
+        self.bus: Optional[MessageBus] = None
+        
+        # 재전송용 링 버퍼: (seq, epoch 초, record, 추정 크기) - seq 는 발생 워커 기준
+        self.history: deque = deque()
+        self.history_size = history_size
+        self.history_max_bytes = history_max_bytes
+        self._history_bytes = 0
+        
+        # 통계 (received/dropped 는 생산자 스레드에서 갱신되므로 _count_lock 안에서만 변경)
+        self._count_lock = threading.Lock()
+        self.received_count = 0
+        self.dropped_count = 0
+        self.batch_count = 0
+        self.frame_count = 0
+        self.slow_disconnects = 0
 
-    async def connect(self, websocket: WebSocket):
-        """새로운 WebSocket 연결을 등록합니다. (Accept 호출 제거)"""
+    async def connect(self, websocket: WebSocket, replay_lines: int = 0,
+                      since_seconds: Optional[float] = None, cursor: Optional[Dict[str, int]] = None,
+                      log_filter: Optional[LogFilter] = None, encoding: str = "json"):
+        """
+        새로운 WebSocket 연결을 등록합니다. (Accept 호출 제거)
+        
+        등록 전에 보관 중인 로그를 한 프레임으로 재전송합니다. 재전송 중 새로 보관된 로그도
+        이어서 보낸 뒤 등록하므로 누락/중복 없이 실시간 로그로 이어집니다.
+        
+        Args:
+            replay_lines: 재전송할 최근 로그 줄 수 (0이면 재전송 안 함)
+            since_seconds: 지정 시 최근 T초 이내 로그만 재전송
+            cursor: 재연결 시 발생 워커별 마지막으로 받은 seq (parse_cursor 결과) - 지정하면 그 이후 로그만
+                재전송 (다른 조건 무시). 커서에 없는 워커의 로그는 보관 중인 것을 모두 재전송합니다.
+            log_filter: 이 클라이언트에 적용할 필터 (None이면 전체 수신)
+            encoding: 프레임 인코딩 (json/msgpack/packed - encoding.negotiate() 결과)
+        """
         # 🟢 수정 완료: 라우터에서 accept()를 처리하도록 accept() 호출 제거
+        if cursor is not None:
+            position = dict(cursor)
+            records, gap = self._records_after(position)
+        else:
+            records, gap = self._recent_records(replay_lines, since_seconds, log_filter), False
+            # 재전송 여부와 관계없이 현재 보관 중인 로그 이후부터 이어서 전송
+            position = self._position([entry[2] for entry in self.history])
+        
+        while records:
+            position.update(self._position(records))
+            matched = log_filter.apply(records) if log_filter and cursor is not None else records
+            if matched:
+                frame = Frame({
+                    "type": "log_replay",
+                    "cursor": format_cursor(position),
+                    "gap": gap,
+                    "logs": matched
+                })
+                await send_encoded(websocket, frame.encode(encoding))
+            records, gap = self._records_after(position)
+            if log_filter:
+                records = log_filter.apply(records)
+        
         self.active_connections.append(websocket)
+        writer = self.writers[websocket] = LogConnection(websocket, self, self.client_queue_size, self.send_timeout)
+        writer.start()
+        if encoding != "json":
+            self.encodings[websocket] = encoding
+        self.set_filter(websocket, log_filter)
         logger.info("New WebSocket connection registered")
 
+    def set_filter(self, websocket: WebSocket, log_filter: Optional[LogFilter]):
+        """클라이언트 필터 설정/변경 (None이면 전체 수신)"""
+        if log_filter is None or log_filter.is_empty:
+            self.filters.pop(websocket, None)
+        else:
+            self.filters[websocket] = log_filter
+        self._groups = None
+
+    def _recent_records(self, lines: int, since_seconds: Optional[float] = None,
+                        log_filter: Optional[LogFilter] = None) -> List[Dict[str, Any]]:
+        """최근 lines 줄 (since_seconds 지정 시 그 기간 이내, log_filter 지정 시 일치하는 줄만)"""
+        if lines <= 0 and since_seconds is None:
+            return []
+        
+        cutoff = time.time() - since_seconds if since_seconds is not None else None
+        limit = lines if lines > 0 else len(self.history)
+        records = []
+        for seq, ts, record, _ in reversed(self.history):
+            if len(records) >= limit or (cutoff is not None and ts < cutoff):
+                break
+            if log_filter is None or log_filter.matches(record):
+                records.append(record)
+        records.reverse()
+        return records
+
+    @staticmethod
+    def _position(records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """records 의 발생 워커별 마지막 seq"""
+        position = {}
+        for record in records:
+            position[record["worker"]] = record["seq"]
+        return position
+
+    def _records_after(self, cursor: Dict[str, int]):
+        """
+        발생 워커별로 seq 가 cursor 보다 큰 보관 로그 (cursor 에 없는 워커는 전부, 보관 순서대로)
+        
+        Returns:
+            tuple: (records, gap) - gap 은 cursor 이후 로그 일부가 이미 링 버퍼에서 밀려났는지 여부
+        """
+        records = []
+        oldest: Dict[str, int] = {}
+        for seq, _, record, _ in self.history:
+            worker = record["worker"]
+            oldest.setdefault(worker, seq)
+            if seq > cursor.get(worker, 0):
+                records.append(record)
+        gap = any(worker in oldest and oldest[worker] > seq + 1 for worker, seq in cursor.items())
+        return records, gap
+
+    def _remember(self, batch: List[Dict[str, Any]]):
+        """배치를 링 버퍼에 추가하고 줄 수/용량 상한을 넘는 오래된 로그 삭제"""
+        now = time.time()
+        for record in batch:
+            size = len(record["message"]) + 64
+            self.history.append((record["seq"], now, record, size))
+            self._history_bytes += size
+        
+        while self.history and (len(self.history) > self.history_size
+                                or self._history_bytes > self.history_max_bytes):
+            self._history_bytes -= self.history.popleft()[3]
+
     def disconnect(self, websocket: WebSocket):
         """WebSocket 연결을 해제합니다."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+            writer = self.writers.pop(websocket, None)
+            if writer is not None:
+                writer.stop()
+            self.filters.pop(websocket, None)
+            self.encodings.pop(websocket, None)
+            self._groups = None
             logger.info("WebSocket connection closed and unregistered")
 
+    def _on_wakeup(self):
+        """이벤트 루프 스레드에서 실행 - 처리 태스크를 깨움"""
+        self._wakeup_scheduled = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _next_batch(self) -> List[Dict[str, str]]:
+        """첫 로그를 기다린 뒤 batch_interval 동안 쌓인 로그를 batch_size 까지 꺼냄"""
+        while not self._pending:
+            self._wakeup.clear()
+            if self._pending:
+                break
+            await self._wakeup.wait()
+        
+        if self.batch_interval > 0 and len(self._pending) < self.batch_size:
+            await asyncio.sleep(self.batch_interval)
+        
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._pending.popleft())
+            except IndexError:
+                break
+        return batch
+
+    def _connection_groups(self) -> List:
+        """
+        필터 key 별 (필터, {인코딩: 연결 목록}) 묶음 (연결/필터 변경 시에만 다시 계산)
+        
+        필터가 없는 연결은 필터 None 그룹 하나로 묶입니다.
+        """
+        if self._groups is None:
+            groups: Dict[Any, List] = {}
+            for connection in self.active_connections:
+                log_filter = self.filters.get(connection)
+                key = log_filter.key if log_filter else None
+                if key not in groups:
+                    groups[key] = [log_filter, {}]
+                encoding = self.encodings.get(connection, "json")
+                groups[key][1].setdefault(encoding, []).append(connection)
+            self._groups = list(groups.values())
+        return self._groups
+
+    def _encode_batch(self, batch: List[Dict[str, str]]) -> Frame:
+        """배치를 프레임 하나로 묶음 (형식별 직렬화는 배치당 1회)"""
+        if len(batch) == 1:
+            return Frame({"type": "log", **batch[0]})
+        return Frame({
+            "type": "log_batch",
+            "timestamp": batch[-1]["timestamp"],
+            "logs": batch
+        })
+
     async def _process_log_queue(self):
         """로그 큐를 처리하는 내부 메서드"""
         while self._is_running:
             try:
-                message = await self.log_queue.get()
+                batch = await self._next_batch()
+                if not batch:
+                    continue
+                
+                # 이 워커에서 발생한 로그만 다른 워커로 전달 (배치당 1회)
+                if self.bus is not None and self.bus.has_peers:
+                    local = [r for r in batch if r["worker"] == self.worker_id]
+                    if local:
+                        self.bus.publish("logs", local)
+                
+                # 연결된 클라이언트가 없어도 재전송용으로 보관
+                self._remember(batch)
                 if not self.active_connections:
                     continue
-                    
-                log_data = {
-                    "type": "log",
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
-                    "message": message.strip()
-                }
                 
-                disconnected = []
-                for connection in self.active_connections:
-                    try:
-                        await connection.send_json(log_data)
-                    except Exception as e:
-                        logger.error(f"Error sending log to client: {e}")
-                        disconnected.append(connection)
-                        
-                # 연결 해제된 클라이언트 정리
-                for connection in disconnected:
-                    self.disconnect(connection)
+                # 필터 그룹별로 한 번만 필터링/직렬화 - 일치하는 로그가 없는 그룹은 비용 없음
+                # 전송은 클라이언트별 writer 가 하므로 여기서는 대기하지 않음
+                for log_filter, by_encoding in self._connection_groups():
+                    records = log_filter.apply(batch) if log_filter else batch
+                    if not records:
+                        continue
+                    frame = self._encode_batch(records)
+                    for encoding, connections in by_encoding.items():
+                        data = frame.encode(encoding)
+                        for connection in connections:
+                            self.writers[connection].enqueue(data)
+                        self.frame_count += len(connections)
+                self.batch_count += 1
                     
             except asyncio.CancelledError:
                 logger.info("Log processing task was cancelled")
@@ -69,6 +405,10 @@ class LogWebSocketManager:
         """로그 처리 태스크 시작"""
         if not self._is_running:
             self._is_running = True
+            self.worker_id = str(os.getpid())
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            self._wakeup = asyncio.Event()
             self._task = asyncio.create_task(self._process_log_queue())
             logger.info("Log manager started")
     
@@ -83,25 +423,109 @@ class LogWebSocketManager:
                 except asyncio.CancelledError:
                     pass
                 self._task = None
+            for writer in self.writers.values():
+                writer.stop()
+            self._loop = None
+            self._loop_thread_id = None
             logger.info("Log manager stopped")
     
-    async def broadcast_log(self, message: str):
+    def submit(self, message: str, level: str = "INFO", source: Optional[str] = None,
+               symbol: Optional[str] = None):
         """
-        모든 연결된 클라이언트에 로그 메시지를 전송합니다.
+        로그 메시지를 대기열에 추가합니다. 어느 스레드에서나 호출할 수 있고 대기하지 않습니다.
+        
+        대기열이 가득 차면 가장 오래된 로그가 버려지고 dropped_count 가 증가합니다.
         
         Args:
             message: 전송할 로그 메시지
+            level: 로그 레벨 (DEBUG/INFO/WARNING/ERROR/CRITICAL)
+            source: 로그를 남긴 모듈 이름
+            symbol: 관련 거래 심볼
         """
         if not message or not isinstance(message, str):
             return
-            
+        
+        record = {
+            "seq": next(self._seq),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "level": level,
+            "source": source,
+            "symbol": symbol,
+            "worker": self.worker_id,
+            "message": message.strip()
+        }
+        with self._count_lock:
+            if len(self._pending) >= self.queue_size:
+                self.dropped_count += 1
+            self._pending.append(record)
+            self.received_count += 1
+        
+        # 처리 태스크가 이미 깨어날 예정이면 루프를 다시 깨우지 않음 (호출당 비용 최소화)
+        loop = self._loop
+        if loop is None or self._wakeup_scheduled:
+            return
+        self._wakeup_scheduled = True
         try:
-            # 로그 큐에 메시지 추가 (비동기 처리)
-            await self.log_queue.put(message)
-        except Exception as e:
-            logger.error(f"Error adding log to queue: {e}")
+            if threading.get_ident() == self._loop_thread_id:
+                self._on_wakeup()
+            else:
+                loop.call_soon_threadsafe(self._on_wakeup)
+        except RuntimeError:
+            # 루프가 이미 닫힌 경우 (종료 중)
+            self._wakeup_scheduled = False
+
+    def attach_bus(self, bus: MessageBus):
+        """워커 간 pub/sub 버스 연결"""
+        self.bus = bus
+        bus.subscribe("logs", self._on_remote_logs)
+
+    def _on_remote_logs(self, records: List[Dict[str, Any]]):
+        """다른 워커의 로그 배치 수신 (이벤트 루프 스레드) - 발생 워커의 seq 그대로 대기열에 추가"""
+        with self._count_lock:
+            for record in records:
+                if len(self._pending) >= self.queue_size:
+                    self.dropped_count += 1
+                self._pending.append(record)
+            self.received_count += len(records)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def broadcast_log(self, message: str, level: str = "INFO", source: Optional[str] = None,
+                            symbol: Optional[str] = None):
+        """
+        모든 연결된 클라이언트에 로그 메시지를 전송합니다.
+        
+        Args:
+            message: 전송할 로그 메시지
+            level, source, symbol: submit() 참고
+        """
+        self.submit(message, level=level, source=source, symbol=symbol)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """로그 전송 통계"""
+        return {
+            "connections": len(self.active_connections),
+            "queue_size": len(self._pending),
+            "queue_max": self.queue_size,
+            "history": len(self.history),
+            "history_bytes": self._history_bytes,
+            "received": self.received_count,
+            "dropped": self.dropped_count,
+            "batches": self.batch_count,
+            "frames_sent": self.frame_count,
+            "client_pending": sum(len(w.pending) for w in self.writers.values()),
+            "slow_disconnects": self.slow_disconnects
+        }
 
     # start_log_consumer, stop_log_consumer 메서드는 이제 사용되지 않음
     # _process_log_queue와 start/stop 메서드로 대체됨
 
-log_manager = LogWebSocketManager()
\ No newline at end of file
+log_manager = LogWebSocketManager(
+    queue_size=settings.LOG_QUEUE_SIZE,
+    batch_size=settings.LOG_BATCH_SIZE,
+    batch_interval=settings.LOG_BATCH_INTERVAL,
+    history_size=settings.LOG_HISTORY_SIZE,
+    history_max_bytes=settings.LOG_HISTORY_MAX_BYTES,
+    client_queue_size=settings.LOG_CLIENT_QUEUE_SIZE,
+    send_timeout=settings.LOG_SEND_TIMEOUT
+)
@@ -0,0 +1,210 @@
+"""
+실시간 시장/시그널/포지션 스트림 (market_stream.py)
+
+봇이 캔들, 지표, 시그널 평가, 포지션 상태를 publish 하면 /ws/trading 구독자에게 전달합니다.
+    - 구독 시 현재 상태 스냅샷 1회: {"type": "snapshot", "symbol": 토픽, "seq": n, "data": ...}
+    - 이후 변경분만: {"type": "delta", "symbol": 토픽, "seq": n+1, "data": ...}
+
+토픽 (ETHUSDT 예시, 패턴 구독 가능 - ETHUSDT.# / ETHUSDT.kline.*):
+    ETHUSDT.kline.1h      마감된 캔들 [[t(ms), o, h, l, c, v], ...] - delta 는 새로 마감된 캔들만
+    ETHUSDT.indicators.1h 지표 스냅샷 - delta 는 바뀐 항목만
+    ETHUSDT.indicator_series.1h  마감 캔들별 지표 [[t(ms), close, ema20, ema50, ema200, rsi14, atr_pct, vol_ma20], ...]
+    ETHUSDT.signal        봇의 진입 시그널 진단 (signal, checks, quality, regimes, targets, indicators - /trading/signal 과 같은 형식)
+    ETHUSDT.position      포지션/손익 (청산 시 {"status": "closed"})
+
+publish_* 는 어느 스레드에서나 호출할 수 있고 대기하지 않습니다 (deque append + 필요할 때만
+call_soon_threadsafe). 스냅샷/변경분 계산과 직렬화는 이벤트 루프에서 수행하므로 트레이딩 루프를 지연시키지 않습니다.
+봇은 매번 전체 상태를 보내므로 대기열이 넘쳐 일부가 버려져도 다음 publish 에서 상태가 복구됩니다.
+클라이언트는 seq 가 건너뛰면 {"action": "snapshot", "symbol": 토픽} 으로 스냅샷을 다시 요청합니다.
+
+pub/sub 버스가 연결되면 봇이 있는 워커가 발행 내용을 다른 워커로 전달하고, 각 워커는 같은 순서로
+상태를 갱신하므로 워커가 달라도 스냅샷/seq 가 일치합니다.
+"""
+from typing import Any, Dict, List, Optional
+from collections import deque
+import asyncio
+import logging
+import threading
+
+from .connection_manager import manager as default_manager, ConnectionManager
+from .subscriptions import is_pattern, compile_pattern
+from .pubsub import MessageBus
+
+logger = logging.getLogger(__name__)
+
+# 토픽별 보관할 마감 캔들 수 (스냅샷 크기)
+KLINE_SNAPSHOT_SIZE = 500
+
+
+class MarketStream:
+    """토픽별 최신 상태를 보관하고 구독자에게 스냅샷 + 변경분을 전송하는 발행자"""
+    
+    def __init__(self, connection_manager: ConnectionManager, queue_size: int = 1000):
+        """
+        Args:
+            connection_manager: 전송에 사용할 ConnectionManager
+            queue_size: 루프 처리 전 대기 최대 건수 (초과 시 오래된 것부터 버림)
+        """
+        self.manager = connection_manager
+        self.state: Dict[str, Any] = {}
+        self.seq: Dict[str, int] = {}
+        self._pending: deque = deque(maxlen=queue_size)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._wakeup_scheduled = False
+        self.bus: Optional[MessageBus] = None
+        self.published = 0
+        self.deltas = 0
+    
+    # ------------------------------------------------------------------
+    # 루프 연결
+    # ------------------------------------------------------------------
+    
+    async def start(self):
+        """현재 이벤트 루프에 연결 (연결 전 publish 는 무시)"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        logger.info("Market stream started")
+    
+    def attach_bus(self, bus: MessageBus):
+        """워커 간 pub/sub 버스 연결"""
+        self.bus = bus
+        bus.subscribe("market", self._on_remote)
+    
+    def _on_remote(self, items: List[list]):
+        """다른 워커에서 발행된 항목 수신 (이벤트 루프 스레드)"""
+        for kind, topic, data in items:
+            self._pending.append((kind, topic, data, False))
+        if not self._wakeup_scheduled and self._loop is not None:
+            self._wakeup_scheduled = True
+            self._loop.call_soon(self._drain)
+    
+    async def stop(self):
+        self._loop = None
+        self._loop_thread_id = None
+        self._pending.clear()
+        logger.info("Market stream stopped")
+    
+    # ------------------------------------------------------------------
+    # 발행 (봇 스레드)
+    # ------------------------------------------------------------------
+    
+    def publish_candles(self, topic: str, candles: List[list]):
+        """마감된 캔들 목록 (오래된 순, [t(ms), o, h, l, c, v]) 발행"""
+        self._submit("kline", topic, candles)
+    
+    def publish_state(self, topic: str, state: Dict[str, Any]):
+        """상태 dict (지표/시그널/포지션) 전체 발행"""
+        self._submit("state", topic, state)
+    
+    def _submit(self, kind: str, topic: str, data: Any):
+        loop = self._loop
+        if loop is None:
+            return
+        
+        self._pending.append((kind, topic, data, True))
+        self.published += 1
+        
+        if self._wakeup_scheduled:
+            return
+        self._wakeup_scheduled = True
+        try:
+            if threading.get_ident() == self._loop_thread_id:
+                loop.call_soon(self._drain)
+            else:
+                loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            # 루프가 이미 닫힌 경우 (종료 중)
+            self._wakeup_scheduled = False
+    
+    # ------------------------------------------------------------------
+    # 상태 갱신 (이벤트 루프)
+    # ------------------------------------------------------------------
+    
+    def _drain(self):
+        self._wakeup_scheduled = False
+        forward = self.bus is not None and self.bus.has_peers
+        local = []
+        while self._pending:
+            kind, topic, data, is_local = self._pending.popleft()
+            if forward and is_local:
+                local.append((kind, topic, data))
+            try:
+                delta = self._apply_candles(topic, data) if kind == "kline" else self._apply_state(topic, data)
+            except Exception as e:
+                logger.error(f"Market stream 갱신 오류 ({topic}): {e}")
+                continue
+            
+            if delta is None:
+                continue
+            self.seq[topic] = self.seq.get(topic, 0) + 1
+            self.deltas += 1
+            self.manager.publish(topic, "delta", delta, seq=self.seq[topic])
+        
+        # 이 워커에서 발행된 항목만 다른 워커로 전달 (한 번에 묶어서)
+        if local:
+            self.bus.publish("market", local)
+    
+    def _apply_candles(self, topic: str, candles: List[list]) -> Optional[List[list]]:
+        """새로 마감된 캔들만 변경분으로 반환"""
+        if not candles:
+            return None
+        
+        current = self.state.get(topic)
+        if current is None:
+            self.state[topic] = list(candles[-KLINE_SNAPSHOT_SIZE:])
+            return self.state[topic]
+        
+        last_time = current[-1][0] if current else None
+        new = [c for c in candles if last_time is None or c[0] > last_time]
+        if not new:
+            return None
+        
+        current.extend(new)
+        if len(current) > KLINE_SNAPSHOT_SIZE:
+            del current[:len(current) - KLINE_SNAPSHOT_SIZE]
+        return new
+    
+    def _apply_state(self, topic: str, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """바뀐 항목만 변경분으로 반환 (사라진 항목은 None)"""
+        current = self.state.get(topic)
+        self.state[topic] = dict(state)
+        if current is None:
+            return dict(state)
+        
+        delta = {k: v for k, v in state.items() if current.get(k, object()) != v}
+        delta.update({k: None for k in current.keys() - state.keys()})
+        return delta or None
+    
+    # ------------------------------------------------------------------
+    # 구독 (이벤트 루프)
+    # ------------------------------------------------------------------
+    
+    def matching_topics(self, topic: str) -> List[str]:
+        """구독 토픽/패턴과 일치하는, 상태가 있는 토픽"""
+        if is_pattern(topic):
+            regex = compile_pattern(topic)
+            return [t for t in self.state if regex.match(t)]
+        return [topic] if topic in self.state else []
+    
+    async def subscribe(self, client_id: str, topic: str):
+        """구독 등록 후 일치하는 토픽의 스냅샷 전송 (이후 변경분은 스냅샷 뒤에 전달됨)"""
+        await self.manager.subscribe(client_id, topic)
+        self.send_snapshot(client_id, topic)
+    
+    def send_snapshot(self, client_id: str, topic: str):
+        """클라이언트에게 현재 스냅샷 전송 (재동기화 요청 시에도 사용)"""
+        # 등록과 스냅샷 전송 사이에 await 가 없으므로, 대기 중인 변경분은 모두 스냅샷 이후 seq 를 가짐
+        for t in self.matching_topics(topic):
+            self.manager.send(client_id, t, "snapshot", self.state[t], seq=self.seq.get(t, 0))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "topics": len(self.state),
+            "pending": len(self._pending),
+            "published": self.published,
+            "deltas": self.deltas
+        }
+
+
+market_stream = MarketStream(default_manager)
@@ -0,0 +1,279 @@
+"""
+워커 간 WebSocket 브로드캐스트 버스 (pubsub.py)
+
+uvicorn 워커를 여러 개 띄우면 클라이언트가 프로세스별로 나뉘므로, 한 워커에서 발생한 로그/시장 데이터를
+다른 워커의 클라이언트에게도 전달해야 합니다. 매니저들은 로컬 클라이언트에게 직접 보내고, 같은 메시지를
+버스로 한 번 publish 해 다른 워커(peer)에 전달합니다. 받은 워커는 자신의 로컬 클라이언트에게만 보냅니다.
+
+백엔드 (PUBSUB_BACKEND):
+    memory : 단일 프로세스용 (기본값). 같은 hub 를 공유하는 버스끼리만 전달 - 단일 워커에서는 전달할 peer 없음
+    unix   : Unix 소켓 브로커 경유 (PUBSUB_SOCKET). run.py 가 WEB_WORKERS > 1 일 때 부모 프로세스에서 브로커를 띄우며,
+             별도로 `python -m app.websocket.pubsub` 로 실행할 수도 있습니다.
+
+메시지는 한 줄짜리 JSON ({"c": 채널, "w": 워커 ID, "p": 내용}) 이고, publish 는 대기하지 않습니다.
+브로커/peer 가 느리면 해당 peer 로 가는 메시지만 버려집니다 (dropped).
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Set
+import asyncio
+import json
+import logging
+import os
+import threading
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# 한 줄 메시지 최대 크기 (로그 배치 500줄 + 캔들 스냅샷 여유)
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+# peer 별 쓰기 버퍼 상한 (초과 시 해당 peer 로 가는 메시지 버림)
+MAX_PEER_BUFFER = 8 * 1024 * 1024
+RECONNECT_INTERVAL = 1.0
+
+Handler = Callable[[Any], None]
+
+
+class MessageBus(ABC):
+    """
+    버스 공통 인터페이스
+
+    subscribe(channel, handler): 다른 워커에서 온 메시지를 이벤트 루프 스레드에서 handler(payload) 로 전달
+    publish(channel, payload): 다른 워커로 전달 (자신에게는 전달하지 않음, 이벤트 루프 스레드에서 호출)
+    """
+
+    def __init__(self):
+        self.worker_id = f"{os.getpid()}"
+        self.handlers: Dict[str, List[Handler]] = {}
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+
+    def subscribe(self, channel: str, handler: Handler):
+        self.handlers.setdefault(channel, []).append(handler)
+
+    @abstractmethod
+    def publish(self, channel: str, payload: Any):
+        ...
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @property
+    def has_peers(self) -> bool:
+        """전달할 다른 워커가 있을 수 있는지 (없으면 매니저가 publish 자체를 생략)"""
+        return False
+
+    def _deliver(self, channel: str, payload: Any):
+        self.received += 1
+        for handler in self.handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(f"Pub/sub handler 오류 ({channel}): {e}", exc_info=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self).__name__,
+            "worker_id": self.worker_id,
+            "published": self.published,
+            "received": self.received,
+            "dropped": self.dropped
+        }
+
+
+class InMemoryBus(MessageBus):
+    """
+    프로세스 내부 버스
+
+    hub 를 공유하는 버스 인스턴스끼리 메시지를 전달합니다 (각 인스턴스의 이벤트 루프에서 handler 실행).
+    hub 를 지정하지 않으면 peer 가 없으므로 publish 는 아무 일도 하지 않습니다.
+    """
+
+    def __init__(self, hub: Optional[List["InMemoryBus"]] = None, worker_id: Optional[str] = None):
+        super().__init__()
+        self.hub = hub if hub is not None else []
+        if worker_id:
+            self.worker_id = worker_id
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        if self not in self.hub:
+            self.hub.append(self)
+
+    async def stop(self):
+        if self in self.hub:
+            self.hub.remove(self)
+        self._loop = None
+
+    @property
+    def has_peers(self) -> bool:
+        return len(self.hub) > 1
+
+    def publish(self, channel: str, payload: Any):
+        self.published += 1
+        for peer in self.hub:
+            if peer is self or peer._loop is None:
+                continue
+            try:
+                peer._loop.call_soon_threadsafe(peer._deliver, channel, payload)
+            except RuntimeError:
+                self.dropped += 1
+
+
+class UnixSocketBus(MessageBus):
+    """Unix 소켓 브로커에 연결하는 워커 측 버스 (연결이 끊기면 재연결, 끊긴 동안의 메시지는 버림)"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def has_peers(self) -> bool:
+        return self._writer is not None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._close_writer()
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _run(self):
+        """브로커 연결 유지 + 수신 루프"""
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path, limit=MAX_MESSAGE_BYTES)
+                self._writer = writer
+                logger.info(f"Pub/sub 브로커 연결: {self.path} (worker {self.worker_id})")
+
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    message = json.loads(line)
+                    if message.get("w") != self.worker_id:
+                        self._deliver(message["c"], message["p"])
+
+                logger.warning("Pub/sub 브로커 연결 종료 - 재연결 시도")
+            except asyncio.CancelledError:
+                raise
+            except (OSError, ValueError) as e:
+                logger.debug(f"Pub/sub 브로커 연결 실패: {e}")
+            finally:
+                self._close_writer()
+            await asyncio.sleep(RECONNECT_INTERVAL)
+
+    def publish(self, channel: str, payload: Any):
+        writer = self._writer
+        if writer is None or writer.is_closing():
+            self.dropped += 1
+            return
+        if writer.transport.get_write_buffer_size() > MAX_PEER_BUFFER:
+            self.dropped += 1
+            return
+
+        # 봇 상태의 datetime 등은 문자열로 (로컬 전달과 달리 JSON 으로만 보낼 수 있음)
+        line = json.dumps({"c": channel, "w": self.worker_id, "p": payload}, separators=(",", ":"), default=str)
+        writer.write(line.encode() + b"\n")
+        self.published += 1
+
+
+class PubSubBroker:
+    """Unix 소켓 브로커 - 한 peer 에서 받은 줄을 나머지 모든 peer 에게 그대로 전달 (재직렬화 없음)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.peers: Set[asyncio.StreamWriter] = set()
+        self.forwarded = 0
+        self.dropped = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # 이전 실행에서 남은 소켓 파일
+        self._server = await asyncio.start_unix_server(self._handle, self.path, limit=MAX_MESSAGE_BYTES)
+        logger.info(f"Pub/sub 브로커 시작: {self.path}")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self.peers):
+            writer.close()
+        self.peers.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.peers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                for peer in self.peers:
+                    if peer is writer:
+                        continue
+                    if peer.transport.get_write_buffer_size() > MAX_PEER_BUFFER:
+                        self.dropped += 1
+                        continue
+                    peer.write(line)
+                    self.forwarded += 1
+        except (ConnectionError, ValueError, asyncio.CancelledError):
+            pass  # peer 종료 / 브로커 종료
+        finally:
+            self.peers.discard(writer)
+            writer.close()
+
+
+def start_broker_thread(path: str) -> threading.Thread:
+    """현재 프로세스의 백그라운드 스레드에서 브로커 실행 (run.py 부모 프로세스용)"""
+    broker = PubSubBroker(path)
+    thread = threading.Thread(target=lambda: asyncio.run(broker.serve_forever()),
+                              name="pubsub-broker", daemon=True)
+    thread.start()
+    return thread
+
+
+def create_bus(backend: str = "memory", path: Optional[str] = None) -> MessageBus:
+    """설정에 맞는 버스 생성"""
+    if backend == "memory":
+        return InMemoryBus()
+    if backend == "unix":
+        return UnixSocketBus(path or settings.PUBSUB_SOCKET)
+    raise ValueError(f"지원하지 않는 pub/sub 백엔드: {backend}")
+
+
+bus = create_bus(settings.PUBSUB_BACKEND, settings.PUBSUB_SOCKET)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(PubSubBroker(settings.PUBSUB_SOCKET).serve_forever())
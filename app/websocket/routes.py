@@ -4,12 +4,18 @@ WebSocket 라우터 설정 (routes.py)
 import asyncio
 import logging
 import json
+import re
 import uuid
 from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+from ..config import settings
 # 두 매니저 임포트 (파일 경로에 맞게 수정하세요)
-from .log_manager import log_manager 
+from .log_manager import log_manager, parse_cursor
 from .connection_manager import manager 
+from .log_filter import LogFilter
+from .market_stream import market_stream
+from .encoding import negotiate
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -19,14 +25,43 @@ logger = logging.getLogger(__name__)
 # ====================================================================
 
 @router.websocket("/logs")
-async def websocket_logs(websocket: WebSocket):
+async def websocket_logs(
+    websocket: WebSocket,
+    # 연결 시 재전송할 최근 로그 줄 수 / 최근 N초 / 재연결 커서 (발생 워커별 마지막으로 받은 seq - "워커:seq,...")
+    replay: int = Query(default=settings.LOG_REPLAY_LINES),
+    since: Optional[float] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    # 서버 측 필터: 최소 레벨 / 소스 모듈(쉼표 구분) / 심볼(쉼표 구분) / 부분 문자열 / 정규식
+    level: Optional[str] = Query(default=None),
+    source: Optional[str] = Query(default=None),
+    symbol: Optional[str] = Query(default=None),
+    contains: Optional[str] = Query(default=None),
+    regex: Optional[str] = Query(default=None),
+    # 프레임 인코딩: json(기본) | msgpack | packed (바이너리 프레임)
+    encoding: str = Query(default="json")
+):
     """실시간 로그 스트리밍 엔드포인트"""
     try:
         # 1. 연결 수락 (Accept)
         await websocket.accept()
         
-        # 2. log_manager에 연결 등록
-        await log_manager.connect(websocket) 
+        try:
+            log_filter = LogFilter.from_params({
+                "level": level, "source": source, "symbol": symbol,
+                "contains": contains, "regex": regex
+            })
+        except (ValueError, re.error) as e:
+            await websocket.close(code=1008, reason=f"잘못된 필터: {e}")
+            return
+        try:
+            log_cursor = parse_cursor(cursor, log_manager.worker_id) if cursor else None
+        except ValueError as e:
+            await websocket.close(code=1008, reason=str(e))
+            return
+        
+        # 2. log_manager에 연결 등록 (최근 로그 재전송 후 실시간 스트림)
+        await log_manager.connect(websocket, replay_lines=replay, since_seconds=since, cursor=log_cursor,
+                                  log_filter=log_filter, encoding=negotiate(encoding))
         
         # 3. 통신 유지 루프: 클라이언트 메시지(핑) 수신 대기
         while True:
@@ -39,7 +74,19 @@ async def websocket_logs(websocket: WebSocket):
                 if message.get('type') == 'ping':
                     await websocket.send_json({"type": "pong", "timestamp": datetime.utcnow().isoformat() + "Z"})
                     continue 
-                # 기타 클라이언트 메시지 처리...
+                
+                # 필터 변경: {"action": "filter", "level": ..., "source": ..., "symbol": ..., "contains": ..., "regex": ...}
+                if message.get('action') == 'filter':
+                    try:
+                        log_filter = LogFilter.from_params(message)
+                    except (ValueError, re.error) as e:
+                        await websocket.send_json({"type": "filter_error", "message": str(e)})
+                        continue
+                    log_manager.set_filter(websocket, log_filter)
+                    await websocket.send_json({
+                        "type": "filter_ack",
+                        "filter": {k: message.get(k) for k in ("level", "source", "symbol", "contains", "regex")}
+                    })
 
             except asyncio.TimeoutError:
                 logger.warning(f"클라이언트 PING 타임아웃. 연결 종료.")
@@ -68,7 +115,9 @@ async def websocket_logs(websocket: WebSocket):
 async def websocket_trading(
     websocket: WebSocket, 
     # 클라이언트 ID가 없는 경우 새로 생성하도록 설정
-    client_id: str = Query(default=None) 
+    client_id: str = Query(default=None),
+    # 데이터 프레임 인코딩: json(기본) | msgpack | packed (캔들을 열 단위 배열로) - 제어 메시지는 항상 JSON 텍스트
+    encoding: str = Query(default="json")
 ):
     """실시간 트레이딩 데이터 브로드캐스트 및 구독 처리 엔드포인트"""
     
@@ -79,32 +128,56 @@ async def websocket_trading(
         # 1. 연결 수락 (Accept)
         await websocket.accept() 
         
-        # 2. ConnectionManager에 연결 등록
-        await manager.connect(websocket, client_id) 
-        
-        # 3. 클라이언트에게 ID 전송 (클라이언트가 재연결 시 사용할 수 있도록)
+        # 2. 클라이언트에게 ID 전송 (클라이언트가 재연결 시 사용할 수 있도록)
+        #    항상 JSON 이며, writer 태스크가 시작되기 전(등록 전)에 보내는 유일한 직접 전송
+        encoding = negotiate(encoding)
         await websocket.send_json({
             "type": "client_id", 
             "client_id": client_id,
+            "encoding": encoding,
             "message": "클라이언트 ID가 할당되었습니다."
         })
         
+        # 3. ConnectionManager에 연결 등록 - 이후 이 소켓의 전송은 모두 클라이언트 대기열(writer 태스크)로
+        await manager.connect(websocket, client_id, encoding=encoding)
+        
         # 4. 통신 유지 루프: 클라이언트 메시지(구독/핑) 수신 대기
         while True:
             try:
                 data = await websocket.receive_text()
-                message = json.loads(data)
+                try:
+                    message = json.loads(data)
+                except ValueError as e:
+                    manager.send_direct(client_id, {"type": "error", "message": f"잘못된 JSON: {e}"})
+                    continue
                 
-                # 구독 메시지 처리
+                # 구독 메시지 처리 (구독 직후 현재 스냅샷, 이후 변경분 전송)
                 if message.get('action') == 'subscribe' and message.get('symbol'):
-                    await manager.subscribe(client_id, message['symbol'])
+                    await market_stream.subscribe(client_id, message['symbol'])
+                
+                # 스냅샷 재요청 (seq 가 건너뛴 경우 재동기화)
+                elif message.get('action') == 'snapshot' and message.get('symbol'):
+                    market_stream.send_snapshot(client_id, message['symbol'])
+                
+                # 구독 해제 메시지 처리
+                elif message.get('action') == 'unsubscribe' and message.get('symbol'):
+                    await manager.unsubscribe(client_id, message['symbol'])
                 
                 # 핑 메시지 처리 (선택 사항: 클라이언트가 핑을 보내는 경우)
                 elif message.get('type') == 'ping':
-                    await websocket.send_json({"type": "pong"})
+                    manager.send_direct(client_id, {"type": "pong"})
                 
                 else:
                     logger.warning(f"알 수 없는 메시지 수신: {data}")
+            
+            except ValueError as e:
+                # 잘못된 토픽 패턴 (예: a.#.b) - 구독 색인은 그대로, 연결 유지
+                manager.send_direct(client_id, {
+                    "type": "error",
+                    "action": message.get('action'),
+                    "symbol": message.get('symbol'),
+                    "message": str(e)
+                })
                     
             except Exception as e:
                 logger.error(f"Trading WS 루프 오류: {e}")
@@ -118,5 +191,5 @@ async def websocket_trading(
         
     finally:
         # 5. 연결 해제 및 등록 해제
-        manager.disconnect(client_id)
+        manager.disconnect(client_id, websocket)
         logger.info(f"Trading WS 핸들러 종료 및 매니저 등록 해제: {client_id}")
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+WebSocket 구독 색인 (subscriptions.py)
+
+토픽 -> 클라이언트 집합, 클라이언트 -> 토픽 집합을 함께 유지하는 양방향 색인입니다.
+토픽은 점(.)으로 구분된 세그먼트이며 (예: ETHUSDT.kline.1h), 구독 시 와일드카드 패턴을 쓸 수 있습니다.
+    *  : 세그먼트 하나 (ETHUSDT.kline.* -> ETHUSDT.kline.1h, ETHUSDT.kline.5m)
+    #  : 마지막에만 사용, 0개 이상의 세그먼트 (ETHUSDT.# -> ETHUSDT, ETHUSDT.kline.1h, ...)
+"""
+import re
+from typing import Dict, List, Set
+
+# 토픽별 매칭 패턴 캐시 최대 크기 (초과 시 비움)
+MATCH_CACHE_SIZE = 10000
+
+
+def is_pattern(topic: str) -> bool:
+    """와일드카드 패턴 여부"""
+    return "*" in topic or "#" in topic
+
+
+def compile_pattern(pattern: str) -> "re.Pattern":
+    """토픽 패턴을 정규식으로 변환"""
+    segments = pattern.split(".")
+    if "#" in segments[:-1] or any("#" in s and s != "#" for s in segments):
+        raise ValueError(f"'#' 는 마지막 세그먼트로만 사용할 수 있습니다: {pattern}")
+    
+    tail = ""
+    if segments[-1] == "#":
+        segments = segments[:-1]
+        tail = r"(\..+)?" if segments else ".*"
+    
+    body = r"\.".join(r"[^.]+" if s == "*" else re.escape(s) for s in segments)
+    return re.compile(f"^{body}{tail}$")
+
+
+class SubscriptionIndex:
+    """양방향 구독 색인 - 연결/해제/구독이 모두 O(1) (클라이언트가 구독한 토픽 수에만 비례)"""
+    
+    def __init__(self):
+        self.topic_clients: Dict[str, Set[str]] = {}
+        self.client_topics: Dict[str, Set[str]] = {}
+        self.pattern_clients: Dict[str, Set[str]] = {}
+        self._compiled: Dict[str, "re.Pattern"] = {}
+        self._match_cache: Dict[str, List[str]] = {}
+    
+    def __contains__(self, topic: str) -> bool:
+        return bool(self.subscribers(topic))
+    
+    def __len__(self) -> int:
+        return len(self.topic_clients) + len(self.pattern_clients)
+    
+    def subscribe(self, client_id: str, topic: str) -> bool:
+        """
+        구독 추가 (이미 구독 중이면 False)
+        
+        Raises:
+            ValueError: 잘못된 패턴 - 색인은 변경되지 않음
+        """
+        if topic in self.client_topics.get(client_id, ()):
+            return False
+        
+        if is_pattern(topic):
+            if topic not in self.pattern_clients:
+                self._compiled[topic] = compile_pattern(topic)
+                self.pattern_clients[topic] = set()
+                self._match_cache.clear()
+            self.pattern_clients[topic].add(client_id)
+        else:
+            self.topic_clients.setdefault(topic, set()).add(client_id)
+        
+        self.client_topics.setdefault(client_id, set()).add(topic)
+        return True
+    
+    def unsubscribe(self, client_id: str, topic: str) -> bool:
+        """구독 해제 (구독 중이 아니면 False)"""
+        topics = self.client_topics.get(client_id)
+        if not topics or topic not in topics:
+            return False
+        
+        topics.discard(topic)
+        if not topics:
+            del self.client_topics[client_id]
+        
+        index = self.pattern_clients if is_pattern(topic) else self.topic_clients
+        clients = index.get(topic)
+        if clients is not None:
+            clients.discard(client_id)
+            if not clients:
+                del index[topic]
+                if index is self.pattern_clients:
+                    del self._compiled[topic]
+                    self._match_cache.clear()
+        return True
+    
+    def remove_client(self, client_id: str) -> Set[str]:
+        """클라이언트의 모든 구독 해제 후 해제된 토픽 반환"""
+        topics = set(self.client_topics.get(client_id, ()))
+        for topic in topics:
+            self.unsubscribe(client_id, topic)
+        return topics
+    
+    def topics_of(self, client_id: str) -> Set[str]:
+        """클라이언트가 구독한 토픽/패턴"""
+        return self.client_topics.get(client_id, set())
+    
+    def matching_patterns(self, topic: str) -> List[str]:
+        """토픽과 일치하는 구독 패턴 목록 (토픽별 캐시)"""
+        if not self.pattern_clients:
+            return []
+        
+        patterns = self._match_cache.get(topic)
+        if patterns is None:
+            if len(self._match_cache) >= MATCH_CACHE_SIZE:
+                self._match_cache.clear()
+            patterns = [p for p, regex in self._compiled.items() if regex.match(topic)]
+            self._match_cache[topic] = patterns
+        return patterns
+    
+    def subscribers(self, topic: str) -> Set[str]:
+        """토픽을 받아야 하는 클라이언트 (정확히 일치 + 패턴 일치)"""
+        exact = self.topic_clients.get(topic)
+        patterns = self.matching_patterns(topic)
+        if not patterns:
+            return exact or set()
+        
+        result = set(exact) if exact else set()
+        for pattern in patterns:
+            result |= self.pattern_clients[pattern]
+        return result
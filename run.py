@@ -3,15 +3,30 @@ Trading System 실행 스크립트
 
 사용법:
     python run.py
+    WEB_WORKERS=4 PUBSUB_BACKEND=unix python run.py   # 여러 워커 (자동 리로드 없음)
 """
 import uvicorn
 
+from app.config import settings
+from app.websocket.pubsub import start_broker_thread
+
 if __name__ == "__main__":
+    workers = max(1, settings.WEB_WORKERS)
+    
+    if workers > 1:
+        if settings.PUBSUB_BACKEND != "unix":
+            print("⚠️  WEB_WORKERS > 1 이지만 PUBSUB_BACKEND=memory - 브로드캐스트가 워커별로 나뉩니다")
+        else:
+            # 워커들이 연결할 pub/sub 브로커를 부모 프로세스에서 실행
+            start_broker_thread(settings.PUBSUB_SOCKET)
+    
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=workers == 1,  # 자동 리로드는 단일 워커에서만 지원
         reload_dirs=["app"],  # app 디렉토리 변경 시 자동 리로드
-        workers=1
+        workers=workers,
+        # WebSocket permessage-deflate (클라이언트가 제안한 경우에만 사용, 연결별 압축)
+        ws_per_message_deflate=settings.WS_PER_MESSAGE_DEFLATE
     )
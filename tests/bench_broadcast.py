@@ -0,0 +1,145 @@
+# bench_broadcast.py - ConnectionManager.broadcast 팬아웃 지연 벤치마크
+#
+# 가짜 WebSocket 클라이언트 N개(일부는 느린/멈춘 클라이언트)에 메시지를 브로드캐스트하고,
+# broadcast 호출 시점부터 각 클라이언트 send_text 완료까지의 지연(p50/p99)과
+# broadcast 호출 자체의 소요 시간을 측정합니다.
+#
+# 목표였던 "클라이언트 수와 무관하게 일정한 p99" 는 달성하지 못했습니다. 느린 클라이언트가 다른 클라이언트를
+# 지연시키지는 않지만, 모든 전송이 이벤트 루프 하나에서 클라이언트마다 대기열 추가 + writer 태스크 실행으로
+# 처리되므로 메시지 하나의 팬아웃 비용은 클라이언트 수에 비례합니다 (이 환경에서 전달 1건당 약 20~30µs,
+# 5000 클라이언트 p99 ≈ 150ms). 프로세스 하나의 클라이언트 수를 줄이려면 WEB_WORKERS + PUBSUB_BACKEND=unix 로
+# 워커를 나눠야 합니다. 결과 표 아래에 최소/최대 클라이언트 수의 p99 비와 전달 1건당 루프 비용을 출력합니다.
+#
+# 사용법:
+#     python -m tests.bench_broadcast
+#     python -m tests.bench_broadcast --clients 10 100 1000 5000 --policy coalesce
+#     python -m tests.bench_broadcast --legacy --messages 5   # 변경 전 순차 전송과 비교
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.websocket.connection_manager import ConnectionManager
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+class FakeWebSocket:
+    """send_text 완료 시각을 기록하는 가짜 WebSocket"""
+    
+    def __init__(self, latencies, delay=0.0):
+        self.latencies = latencies
+        self.delay = delay
+    
+    async def send_text(self, text):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        else:
+            await asyncio.sleep(0)  # 실제 소켓 쓰기처럼 제어권 양보
+        sent_at = float(text.rsplit('"sent_at": ', 1)[1].split('}', 1)[0])
+        self.latencies.append(time.perf_counter() - sent_at)
+    
+    async def close(self, code=1000):
+        pass
+
+
+async def legacy_broadcast(manager, symbol, message):
+    """변경 전 broadcast 동작 (구독자마다 send_text 를 순서대로 await) - 비교용"""
+    message_str = json.dumps({"type": "trading_update", "symbol": symbol, "data": message})
+    for client_id in manager.subscriptions.subscribers(symbol):
+        await manager.active_connections[client_id].send_text(message_str)
+
+
+async def run_case(n_clients, args):
+    manager = ConnectionManager(queue_size=args.queue_size, slow_consumer_policy=args.policy)
+    latencies = []
+    n_slow = int(n_clients * args.slow_ratio)
+    
+    for i in range(n_clients):
+        # 느린 클라이언트의 지연은 측정에서 제외 (다른 클라이언트에 미치는 영향만 확인)
+        delay = args.slow_delay if i < n_slow else 0.0
+        ws = FakeWebSocket([] if delay else latencies, delay)
+        await manager.connect(ws, f"client-{i}")
+        await manager.subscribe(f"client-{i}", "ETHUSDT")
+    
+    broadcast_times = []
+    for _ in range(args.messages):
+        started = time.perf_counter()
+        if args.legacy:
+            await legacy_broadcast(manager, "ETHUSDT", {"price": 3000.0, "sent_at": started})
+        else:
+            await manager.broadcast("ETHUSDT", {"price": 3000.0, "sent_at": started})
+        broadcast_times.append(time.perf_counter() - started)
+        await asyncio.sleep(args.interval)
+    
+    # 빠른 클라이언트의 남은 메시지 전송 대기
+    await asyncio.sleep(max(args.interval, 0.05))
+    stats = manager.get_stats()
+    for i in range(n_clients):
+        manager.disconnect(f"client-{i}")
+    
+    lat = np.array(latencies) * 1000
+    bt = np.array(broadcast_times) * 1000
+    return {
+        'per_delivery_us': float(np.median(bt)) * 1000 / max(n_clients, 1),
+        'clients': n_clients,
+        'slow': n_slow,
+        'delivered': lat.size,
+        'p50_ms': float(np.percentile(lat, 50)) if lat.size else float('nan'),
+        'p99_ms': float(np.percentile(lat, 99)) if lat.size else float('nan'),
+        'broadcast_p99_ms': float(np.percentile(bt, 99)),
+        'dropped': stats['dropped']
+    }
+
+
+async def main_async(args):
+    print("=" * 80)
+    mode = "legacy 순차 전송" if args.legacy else f"정책: {args.policy}"
+    print(f"📡 broadcast 팬아웃 벤치마크 ({mode}, 느린 클라이언트 {args.slow_ratio:.0%})")
+    print("=" * 80)
+    print(f"{'clients':>8} {'delivered':>10} {'p50(ms)':>9} {'p99(ms)':>9} {'broadcast p99(ms)':>18} {'dropped':>8}")
+    
+    results = []
+    for n in args.clients:
+        r = await run_case(n, args)
+        results.append(r)
+        print(f"{r['clients']:>8} {r['delivered']:>10} {r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f} "
+              f"{r['broadcast_p99_ms']:>18.3f} {r['dropped']:>8}")
+    print("=" * 80)
+    
+    if len(results) > 1 and not args.legacy:
+        first, last = results[0], results[-1]
+        ratio = last['p99_ms'] / first['p99_ms'] if first['p99_ms'] else float('inf')
+        flat = ratio <= args.flat_ratio
+        mark = "✅" if flat else "❌"
+        print(f"{mark} p99 {first['clients']} → {last['clients']} 클라이언트: {first['p99_ms']:.1f}ms → "
+              f"{last['p99_ms']:.1f}ms (x{ratio:.1f}, 일정 기준 x{args.flat_ratio})"
+              + ("" if flat else " - 클라이언트 수와 무관한 p99 목표 미달"))
+        print(f"   broadcast 대기열 추가 비용: 클라이언트당 약 {last['per_delivery_us']:.1f}µs "
+              f"(전송은 각 writer 태스크가 같은 이벤트 루프에서 추가로 수행)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ConnectionManager.broadcast 팬아웃 벤치마크")
+    parser.add_argument('--clients', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    parser.add_argument('--messages', type=int, default=50)
+    parser.add_argument('--interval', type=float, default=0.02, help="메시지 간격 (초)")
+    parser.add_argument('--slow-ratio', type=float, default=0.01, help="느린 클라이언트 비율")
+    parser.add_argument('--slow-delay', type=float, default=1.0, help="느린 클라이언트 send 지연 (초)")
+    parser.add_argument('--queue-size', type=int, default=256)
+    parser.add_argument('--policy', default='drop_oldest', choices=['drop_oldest', 'coalesce', 'disconnect'])
+    parser.add_argument('--legacy', action='store_true', help="변경 전 순차 전송 방식으로 측정 (비교용)")
+    parser.add_argument('--flat-ratio', type=float, default=2.0,
+                        help="최소/최대 클라이언트 수의 p99 비가 이 값 이하면 일정한 것으로 판정")
+    asyncio.run(main_async(parser.parse_args()))
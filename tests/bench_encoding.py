@@ -0,0 +1,136 @@
+# bench_encoding.py - WebSocket 메시지 인코딩 비교 벤치마크 (json / msgpack / packed, permessage-deflate)
+#
+# 캔들 스냅샷, 캔들 delta, 지표/포지션 상태, 로그 배치 메시지를 형식별로 인코딩해
+# 메시지당 바이트 수와 인코딩 CPU 시간을 비교합니다. deflate 열은 permessage-deflate 와 같은
+# raw deflate(zlib wbits=-15)를 연결별 압축 문맥 유지(context takeover)로 적용한 결과입니다.
+# 압축은 연결마다 따로 수행되므로 deflate CPU 는 클라이언트 수에 비례합니다.
+#
+# 사용법:
+#     python -m tests.bench_encoding
+#     python -m tests.bench_encoding --candles 500 --repeat 2000 --clients 1000
+
+import argparse
+import io
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.websocket.encoding import ENCODINGS, Frame, msgpack, encode, unpack_ohlcv
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def make_candles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    t0 = 1_700_000_000_000
+    close = 3000 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    rows = np.column_stack([
+        t0 + np.arange(n) * 3_600_000,
+        close * (1 + rng.normal(0, 0.001, n)),
+        close * 1.004, close * 0.996, close,
+        rng.uniform(100, 5000, n)
+    ])
+    return [[int(r[0])] + [float(x) for x in r[1:]] for r in rows]
+
+
+def make_messages(n_candles):
+    now = datetime.utcnow().isoformat() + "Z"
+    candles = make_candles(n_candles)
+    base = {"symbol": "ETHUSDT.kline.1h", "timestamp": now}
+    return {
+        "kline_snapshot": {"type": "snapshot", **base, "data": candles, "seq": 10},
+        "kline_delta": {"type": "delta", **base, "data": candles[-1:], "seq": 11},
+        "indicators": {"type": "delta", "symbol": "ETHUSDT.indicators.1h", "timestamp": now, "seq": 5,
+                       "data": {"candle_time": "2024-01-10T23:00:00", "close": 3012.5, "ema20": 3001.2,
+                                "ema50": 2987.4, "ema200": 2901.9, "rsi14": 58.3, "atr_pct": 0.0121,
+                                "vol_ma20": 1532.2}},
+        "position": {"type": "delta", "symbol": "ETHUSDT.position", "timestamp": now, "seq": 3,
+                     "data": {"current_price": 3012.5, "pnl_pct": 1.23, "unrealized_pnl": 12.4,
+                              "highest_price": 3020.1}},
+        "log_batch": {"type": "log_batch", "timestamp": now, "logs": [
+            {"seq": i, "timestamp": now, "level": "INFO", "source": "trading.live_trading_bot",
+             "symbol": "ETHUSDT", "message": f"   💰 현재가: ${3000 + i:,.2f}"} for i in range(50)
+        ]}
+    }
+
+
+def measure(message, encoding, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        data = encode(message, encoding)
+    cpu_us = (time.perf_counter() - started) / repeat * 1e6
+    
+    raw = data.encode() if isinstance(data, str) else data
+    # 같은 메시지가 반복 전송되는 연결 (context takeover) - 두 번째 메시지부터의 압축 크기
+    compressor = zlib.compressobj(wbits=-15)
+    compressor.compress(raw)
+    compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    started = time.perf_counter()
+    for _ in range(min(repeat, 200)):
+        deflated = compressor.compress(raw) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    deflate_us = (time.perf_counter() - started) / min(repeat, 200) * 1e6
+    
+    fresh = zlib.compressobj(wbits=-15)
+    first = fresh.compress(raw) + fresh.flush(zlib.Z_SYNC_FLUSH)
+    return len(raw), cpu_us, len(first), len(deflated), deflate_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket 인코딩 바이트/CPU 비교")
+    parser.add_argument("--candles", type=int, default=500, help="스냅샷 캔들 수")
+    parser.add_argument("--repeat", type=int, default=1000, help="인코딩 반복 횟수")
+    parser.add_argument("--clients", type=int, default=1000, help="팬아웃 비용 계산용 클라이언트 수")
+    args = parser.parse_args()
+    
+    if msgpack is None:
+        print("⚠️  msgpack 미설치 - json 만 측정합니다 (pip install msgpack)")
+    encodings = [e for e in ENCODINGS if e == "json" or msgpack is not None]
+    
+    print(f"{'message':<16} {'encoding':<9} {'bytes':>9} {'encode µs':>10} "
+          f"{'deflate(1st)':>13} {'deflate(repeat)':>16} {'deflate µs':>11}")
+    print("-" * 90)
+    results = {}
+    for name, message in make_messages(args.candles).items():
+        for encoding in encodings:
+            size, cpu_us, first, steady, deflate_us = measure(message, encoding, args.repeat)
+            results[(name, encoding)] = (size, cpu_us)
+            print(f"{name:<16} {encoding:<9} {size:>9,} {cpu_us:>10.1f} {first:>13,} {steady:>16,} {deflate_us:>11.1f}")
+        print()
+    
+    # 팬아웃: 클라이언트마다 직렬화(변경 전) vs Frame 공유(형식별 1회)
+    message = make_messages(args.candles)["kline_delta"]
+    started = time.perf_counter()
+    for _ in range(args.clients):
+        encode(message, "json")
+    per_client = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    frame = Frame(message)
+    for i in range(args.clients):
+        frame.encode(encodings[i % len(encodings)])
+    shared = time.perf_counter() - started
+    print(f"팬아웃 {args.clients} 클라이언트 인코딩: 클라이언트별 {per_client * 1000:.2f} ms / "
+          f"Frame 공유 {shared * 1000:.3f} ms")
+    
+    if "packed" in encodings:
+        snapshot = make_messages(args.candles)["kline_snapshot"]
+        decoded = msgpack.unpackb(encode(snapshot, "packed"), raw=False)
+        restored = unpack_ohlcv(decoded["data"])
+        assert np.allclose(restored, np.asarray(snapshot["data"])), "packed 왕복 불일치"
+        json_size = results[("kline_snapshot", "json")][0]
+        packed_size = results[("kline_snapshot", "packed")][0]
+        print(f"캔들 스냅샷 packed/json 크기 비율: {packed_size / json_size:.2%} (왕복 검증 OK)")
+
+
+if __name__ == "__main__":
+    main()
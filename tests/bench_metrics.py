@@ -0,0 +1,85 @@
+# bench_metrics.py - 메트릭 기록 비용 벤치마크
+#
+# 핫 경로에서 쓰는 기록 방식별 이벤트당 시간을 측정합니다 (목표: 이벤트당 1µs 미만).
+#   counter.inc / gauge.set / histogram.observe  : 레이블 없는 메트릭
+#   labels(...).observe                          : 호출마다 레이블 조회 (InstrumentedHTTP 방식)
+#   child.observe                                : labels(...) 결과를 보관해 재사용
+# 마지막으로 워커 여러 개의 스냅샷을 합친 /metrics 출력(render) 시간을 측정합니다.
+#
+# 사용법:
+#     python -m tests.bench_metrics
+#     python -m tests.bench_metrics --events 2000000 --workers 16
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.utils.metrics import MetricsRegistry, render
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def per_event_ns(fn, events):
+    # 반복문 자체 비용을 빼고 기록 비용만 측정
+    started = time.perf_counter()
+    for _ in range(events):
+        pass
+    loop = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(events):
+        fn()
+    return max(time.perf_counter() - started - loop, 0) / events * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메트릭 기록 비용 측정")
+    parser.add_argument("--events", type=int, default=1_000_000, help="방식별 기록 횟수")
+    parser.add_argument("--workers", type=int, default=8, help="render 에 합칠 워커 스냅샷 수")
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "bench")
+    gauge = registry.gauge("bench_gauge", "bench")
+    histogram = registry.histogram("bench_seconds", "bench")
+    labeled = registry.histogram("bench_endpoint_seconds", "bench", ("endpoint",))
+    child = labeled.labels("/v5/market/kline")
+
+    cases = [
+        ("counter.inc()", lambda: counter.inc()),
+        ("gauge.set(v)", lambda: gauge.set(3.0)),
+        ("histogram.observe(v)", lambda: histogram.observe(0.042)),
+        ("labels(e).observe(v)", lambda: labeled.labels("/v5/market/kline").observe(0.042)),
+        ("child.observe(v)", lambda: child.observe(0.042)),
+    ]
+    print(f"{'방식':<24} {'ns/event':>10} {'1µs 미만':>9}")
+    print("-" * 46)
+    for name, fn in cases:
+        ns = per_event_ns(fn, args.events)
+        print(f"{name:<24} {ns:>10.0f} {'✓' if ns < 1000 else '✗':>9}")
+
+    # 워커 스냅샷 규모: 엔드포인트 10개 x 응답 코드 3개
+    for i in range(10):
+        endpoint = f"/v5/endpoint/{i}"
+        labeled.labels(endpoint).observe(0.1)
+        for code in ("0", "10006", "http_502"):
+            registry.counter("bench_requests_total", "bench", ("endpoint", "code")).labels(endpoint, code).inc()
+    snapshot = registry.collect()
+    sources = [({}, snapshot)] + [({"worker": f"W{i}"}, snapshot) for i in range(args.workers)]
+    repeat = 200
+    started = time.perf_counter()
+    for _ in range(repeat):
+        text = render(sources)
+    ms = (time.perf_counter() - started) / repeat * 1e3
+    print()
+    print(f"render: 스냅샷 {len(sources)}개, {text.count(chr(10)):,}줄, {len(text):,} bytes -> {ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
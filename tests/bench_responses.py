@@ -0,0 +1,152 @@
+# bench_responses.py - API 응답 직렬화/압축 비교 벤치마크
+#
+# 기존 경로(dict 반환 -> FastAPI jsonable_encoder -> JSONResponse(json.dumps)) 와
+# FastJSONResponse(orjson, numpy/pandas/datetime 직접 처리) 의 응답당 직렬화 시간을 비교하고,
+# 본문 크기별 gzip/brotli 압축률과 압축 시간을 측정합니다.
+# 기존 경로가 처리하지 못하는 값(np.int64, np.bool_ 등)이 있으면 "실패" 로 표시합니다.
+#
+# 사용법:
+#     python -m tests.bench_responses
+#     python -m tests.bench_responses --candles 1000 --repeat 2000
+
+import argparse
+import gzip
+import io
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.api.responses import FastJSONResponse, CompressionMiddleware, brotli, orjson
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def make_candles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    t0 = 1_700_000_000_000
+    close = 3000 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    rows = np.column_stack([
+        t0 + np.arange(n) * 3_600_000,
+        close * (1 + rng.normal(0, 0.001, n)),
+        close * 1.004, close * 0.996, close,
+        rng.uniform(100, 5000, n)
+    ])
+    return [[int(r[0])] + [float(x) for x in r[1:]] for r in rows]
+
+
+def make_signal():
+    """check_entry_signal / evaluate_entry 결과 형태 (numpy 스칼라 + Timestamp)"""
+    return {
+        'symbol': 'ETHUSDT', 'source': 'stream',
+        'candle_time': pd.Timestamp('2024-01-10 23:00:00'),
+        'has_signal': True,
+        'signal': {'type': 'LONG', 'entry_price': np.float64(3012.5), 'tp1_price': np.float64(3072.75),
+                   'tp2_price': np.float64(3133.0), 'sl_price': np.float64(2982.4), 'quality': np.float64(75.0),
+                   'atr_pct': np.float64(0.0121), 'rsi': np.float64(58.3), 'timestamp': pd.Timestamp('2024-01-10 23:00:00')},
+        'checks': {'enough_candles': True, 'ema_aligned': True, 'atr_spike': False, 'min_quality': 60,
+                   'quality_passed': True},
+        'quality': {'trend': 30, 'momentum': np.float64(20.0), 'rsi': 25, 'volume': 0, 'total': np.float64(75.0)},
+        'regimes': {'volatility': 'NORMAL', 'atr_ratio': np.float64(0.92), 'market': 'TRENDING'},
+        'indicators': {'close': np.float64(3012.5), 'ema20': np.float64(3001.2), 'ema50': np.float64(2987.4),
+                       'ema200': np.float64(2901.9), 'rsi14': np.float64(58.3), 'atr_pct': np.float64(0.0121),
+                       'vol_ma20': np.float64(1532.2)}
+    }
+
+
+def make_payloads(n_candles):
+    now = datetime.utcnow()
+    position = {'side': 'LONG', 'entry_price': np.float64(3012.5), 'size': np.float64(0.15),
+                'entry_time': now, 'tp1_hit': np.bool_(False), 'bars_held': np.int64(7)}
+    return {
+        "signal": make_signal(),
+        "position": position,
+        "bot_status": {"status": "running", "running": 8, "workers": [
+            {"worker_id": f"W{i}", "symbol": "ETHUSDT", "state": "running", "pid": 1000 + i, "cycle": 120,
+             "last_cycle_at": now.isoformat(), "position": {k: v for k, v in position.items() if k != 'bars_held'},
+             "cpu_percent": 1.5, "memory_rss": 85_000_000} for i in range(8)]},
+        "candles": {"columns": ["t", "open", "high", "low", "close", "volume"], "rows": make_candles(n_candles)},
+        "indicator_frame": pd.DataFrame(make_candles(n_candles), columns=["t", "open", "high", "low", "close", "volume"])
+    }
+
+
+def baseline(payload):
+    """기존 경로: jsonable_encoder + JSONResponse.render"""
+    if isinstance(payload, pd.DataFrame):
+        payload = payload.to_dict(orient="records")
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def fast(payload):
+    return FastJSONResponse(payload).body
+
+
+def timed(fn, payload, repeat):
+    try:
+        fn(payload)
+    except Exception as e:
+        return None, f"실패 ({type(e).__name__})"
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = fn(payload)
+    return body, (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 응답 직렬화/압축 비교")
+    parser.add_argument("--candles", type=int, default=500, help="캔들 응답 행 수")
+    parser.add_argument("--repeat", type=int, default=1000, help="반복 횟수")
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("⚠️  orjson 미설치 - FastJSONResponse 가 표준 json 으로 동작합니다 (pip install orjson)")
+    if brotli is None:
+        print("⚠️  brotli 미설치 - gzip 만 측정합니다 (pip install brotli)")
+
+    print(f"{'payload':<16} {'bytes':>9} {'기존 µs':>14} {'fast µs':>9} {'배율':>6}")
+    print("-" * 60)
+    bodies = {}
+    for name, payload in make_payloads(args.candles).items():
+        base_body, base_us = timed(baseline, payload, args.repeat)
+        fast_body, fast_us = timed(fast, payload, args.repeat)
+        bodies[name] = fast_body
+        if base_body is not None:
+            assert json.loads(base_body) == json.loads(fast_body), f"{name} 직렬화 결과 불일치"
+            print(f"{name:<16} {len(fast_body):>9,} {base_us:>14.1f} {fast_us:>9.1f} {base_us / fast_us:>5.1f}x")
+        else:
+            print(f"{name:<16} {len(fast_body):>9,} {base_us:>14} {fast_us:>9.1f} {'-':>6}")
+
+    print()
+    middleware = CompressionMiddleware(None)
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    print(f"{'payload':<16} {'encoding':<9} {'bytes':>9} {'compressed':>11} {'ratio':>7} {'µs':>9}")
+    print("-" * 66)
+    repeat = max(args.repeat // 10, 10)
+    for name, body in bodies.items():
+        if len(body) < middleware.minimum_size:
+            print(f"{name:<16} {'-':<9} {len(body):>9,} {'(압축 안 함: API_COMPRESS_MIN_SIZE 미만)':>11}")
+            continue
+        for encoding in encodings:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                compressed = middleware.compress(body, encoding)
+            us = (time.perf_counter() - started) / repeat * 1e6
+            if encoding == "gzip":
+                assert gzip.decompress(compressed) == body
+            print(f"{name:<16} {encoding:<9} {len(body):>9,} {len(compressed):>11,} "
+                  f"{len(compressed) / len(body):>6.1%} {us:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
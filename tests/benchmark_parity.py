@@ -0,0 +1,287 @@
+# benchmark_parity.py - TradingStrategy 리팩토링 회귀 검증 (phase1.3 CSV 대비 동작/성능)
+#
+# 저장된 1시간봉 캔들로 BacktestEngine 을 단계별로 실행해 시그널/거래를 재생성하고,
+# 기준 포지션/거래와 허용 오차 내에서 비교합니다 (진입 시각을 1:1 로 매칭).
+# 단계별 실행 시간과 최대 메모리를 기록해 기준값(tests/benchmarks/parity_baseline.json)보다
+# 임계값 이상 느려지거나 메모리를 더 쓰면 실패합니다.
+#
+# 기준:
+#     기본값 : 저장소에 포함된 tests/fixtures/parity_candles_1h.csv (합성 1시간봉 2000개, 시드 고정
+#              레짐 전환 랜덤워크)와 그 결과 tests/fixtures/parity_{trades,positions}.csv.
+#              실제 시세가 아니므로 phase1.3 수익률이 아닌 엔진 동작이 바뀌지 않았는지를 확인합니다.
+#     --candles : phase1.3 구간을 포함한 실제 ETHUSDT 1시간봉 CSV 를 주면 phase1.3_train_* / phase1.3_test_* 와 비교
+#                 (실제 캔들 CSV 는 저장소에 포함되지 않음, timestamp/open/high/low/close/volume 컬럼)
+#
+# 사용법:
+#     python -m tests.benchmark_parity
+#     python -m tests.benchmark_parity --update-reference      # 의도한 엔진 변경 후 픽스처 결과 갱신
+#     python -m tests.benchmark_parity --update-baseline       # 성능 기준 갱신 (측정한 캔들 파일 기준)
+#     python -m tests.benchmark_parity --candles data/ETHUSDT_1h.csv
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.backtest import BacktestEngine, ENGINE_VERSION
+from app.analytics import analyze_journal
+
+# Windows 콘솔 인코딩 문제 해결
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+FIXTURE_DIR = ROOT_DIR / 'tests' / 'fixtures'
+FIXTURE_CANDLES = FIXTURE_DIR / 'parity_candles_1h.csv'
+DEFAULT_CANDLES = os.getenv('PARITY_CANDLES', str(FIXTURE_CANDLES))
+BASELINE_PATH = ROOT_DIR / 'tests' / 'benchmarks' / 'parity_baseline.json'
+SPLITS = ('train', 'test')
+
+
+def load_candles(path):
+    """캔들 CSV 로드 (timestamp 는 UTC 기준)"""
+    df = pd.read_csv(path)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+    return df.sort_values('timestamp').reset_index(drop=True)
+
+
+def is_fixture(candles_path):
+    return Path(candles_path).resolve() == FIXTURE_CANDLES.resolve()
+
+
+def reference_paths(split):
+    """구간별 기준 CSV 경로 (fixture 구간은 저장소 픽스처, 나머지는 phase1.3 결과)"""
+    if split == 'fixture':
+        return FIXTURE_DIR / 'parity_trades.csv', FIXTURE_DIR / 'parity_positions.csv'
+    return ROOT_DIR / f'phase1.3_{split}_trades.csv', ROOT_DIR / f'phase1.3_{split}_positions.csv'
+
+
+def load_reference(split):
+    """기준 결과 로드"""
+    trades_path, positions_path = reference_paths(split)
+    trades = pd.read_csv(trades_path)
+    positions = pd.read_csv(positions_path)
+    for df, cols in ((trades, ['entry_time', 'exit_time']), (positions, ['entry_time'])):
+        for col in cols:
+            df[col] = pd.to_datetime(df[col], utc=True)
+    return trades, positions
+
+
+def match_entries(ref_entries, gen_entries, tolerance):
+    """
+    진입 시각 1:1 매칭 - 허용 오차 내 쌍을 시각 차이가 작은 순서로 확정하며,
+    기준/생성 포지션은 각각 한 번만 매칭됩니다 (생성 포지션 하나가 여러 기준에 매칭되지 않음)
+    
+    Returns:
+        list: (기준 인덱스, 생성 인덱스) 쌍
+    """
+    if len(ref_entries) == 0 or len(gen_entries) == 0:
+        return []
+    diff = np.abs(gen_entries[None, :] - ref_entries[:, None])
+    candidates = np.argwhere(diff <= tolerance)
+    order = np.argsort(diff[candidates[:, 0], candidates[:, 1]], kind='stable')
+    
+    used_ref, used_gen, pairs = set(), set(), []
+    for i, j in candidates[order]:
+        if i in used_ref or j in used_gen:
+            continue
+        used_ref.add(i)
+        used_gen.add(j)
+        pairs.append((int(i), int(j)))
+    return sorted(pairs)
+
+
+def run_stage(timings, name, func, measure_memory=True):
+    """
+    단계 실행 + 실행 시간/최대 메모리 기록
+    
+    tracemalloc 은 할당이 많은 pandas 코드를 몇 배 느리게 만들므로, 시간은 추적 없이 측정하고
+    메모리는 같은 단계를 한 번 더 실행해 측정합니다.
+    """
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    
+    peak = 0
+    if measure_memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    
+    timings[name] = {'seconds': elapsed, 'peak_mb': peak / 1024 / 1024}
+    print(f"   ⏱️  {name:<12} {elapsed:8.3f}s  {peak / 1024 / 1024:8.1f}MB", flush=True)
+    return result
+
+
+def compare_split(split, positions, trades, args):
+    """
+    한 구간(train/test)의 재생성 결과를 기준 CSV 와 비교
+    
+    Returns:
+        list: 실패 메시지 (비어 있으면 통과)
+    """
+    ref_trades, ref_positions = load_reference(split)
+    start = ref_trades['entry_time'].min() - pd.Timedelta(hours=args.time_tolerance_hours)
+    end = ref_trades['exit_time'].max() + pd.Timedelta(hours=args.time_tolerance_hours)
+    
+    entry_times = pd.to_datetime(positions['entry_time'], utc=True)
+    gen_positions = positions[(entry_times >= start) & (entry_times <= end)].reset_index(drop=True)
+    gen_entries = pd.to_datetime(gen_positions['entry_time'], utc=True).to_numpy(dtype='datetime64[ns]')
+    exit_times = pd.to_datetime(trades['exit_time'], utc=True)
+    gen_trades = trades[(exit_times >= start) & (exit_times <= end)]
+    
+    # 진입 시각 1:1 매칭 (허용 오차 내, 가까운 쌍부터)
+    tolerance = np.timedelta64(int(args.time_tolerance_hours * 3600), 's')
+    ref_entries = ref_positions['entry_time'].to_numpy(dtype='datetime64[ns]')
+    pairs = match_entries(ref_entries, gen_entries, tolerance)
+    matched = len(pairs)
+    pnl_mismatch = sum(
+        abs(gen_positions['net_pos_1x'].iloc[j] - ref_positions['net_pos_1x'].iloc[i]) > args.pnl_tolerance
+        for i, j in pairs
+    )
+    
+    recall = matched / len(ref_entries) if len(ref_entries) else 1.0
+    precision = matched / len(gen_entries) if len(gen_entries) else 0.0
+    
+    ref_summary = analyze_journal(ref_positions)['summary']
+    gen_summary = analyze_journal(gen_positions)['summary'] if len(gen_positions) else {
+        'trades': 0, 'win_rate': 0.0, 'total_return': 0.0
+    }
+    
+    print(f"\n📊 [{split}] 기준 {len(ref_positions)}건 / 재생성 {len(gen_positions)}건 (거래 {len(gen_trades)}건)")
+    print(f"   - 진입 일치: {matched}건 (recall {recall:.1%}, precision {precision:.1%})")
+    print(f"   - 손익 불일치 (>{args.pnl_tolerance}): {pnl_mismatch}건")
+    print(f"   - 승률: {ref_summary['win_rate']:.1%} → {gen_summary['win_rate']:.1%}")
+    print(f"   - 누적 수익(1x 합): {ref_summary['total_return']:+.3f} → {gen_summary['total_return']:+.3f}")
+    
+    failures = []
+    if recall < args.min_match_ratio:
+        failures.append(f"[{split}] 진입 recall {recall:.1%} < {args.min_match_ratio:.0%}")
+    if precision < args.min_match_ratio:
+        failures.append(f"[{split}] 진입 precision {precision:.1%} < {args.min_match_ratio:.0%}")
+    if matched and pnl_mismatch / matched > 1 - args.min_match_ratio:
+        failures.append(f"[{split}] 손익 불일치 {pnl_mismatch}/{matched}건")
+    if abs(gen_summary['win_rate'] - ref_summary['win_rate']) > args.win_rate_tolerance:
+        failures.append(f"[{split}] 승률 차이 > {args.win_rate_tolerance:.0%}")
+    if abs(gen_summary['total_return'] - ref_summary['total_return']) > args.return_tolerance:
+        failures.append(f"[{split}] 누적 수익 차이 > {args.return_tolerance}")
+    return failures
+
+
+# 비율 임계값과 함께 넘어야 하는 절대 차이 (픽스처처럼 수 ms 단계의 측정 잡음으로 실패하지 않도록)
+PERF_MIN_DELTA = {'seconds': 0.05, 'peak_mb': 1.0}
+
+
+def compare_performance(timings, baseline, threshold):
+    """기준 대비 단계별 실행 시간/메모리 회귀 확인"""
+    failures = []
+    for stage, current in timings.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            if not current[metric]:
+                continue
+            limit = base[metric] * (1 + threshold)
+            if current[metric] > limit and current[metric] - base[metric] > PERF_MIN_DELTA[metric]:
+                failures.append(
+                    f"[{stage}] {metric} {current[metric]:.3f} > 기준 {base[metric]:.3f} (+{threshold:.0%})"
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="phase1.3 CSV 대비 전략 동작/성능 회귀 검증")
+    parser.add_argument('--candles', default=DEFAULT_CANDLES, help="1시간봉 캔들 CSV 경로")
+    parser.add_argument('--fee-rate', type=float, default=0.0, help="편도 수수료율")
+    parser.add_argument('--time-tolerance-hours', type=float, default=1.0)
+    parser.add_argument('--pnl-tolerance', type=float, default=0.01, help="포지션별 net_pos_1x 허용 차이")
+    parser.add_argument('--min-match-ratio', type=float, default=0.8)
+    parser.add_argument('--win-rate-tolerance', type=float, default=0.1)
+    parser.add_argument('--return-tolerance', type=float, default=0.15)
+    parser.add_argument('--perf-threshold', type=float, default=0.25, help="성능 회귀 허용 비율")
+    parser.add_argument('--update-baseline', action='store_true', help="현재 측정값을 성능 기준으로 저장")
+    parser.add_argument('--update-reference', action='store_true',
+                        help="픽스처 캔들의 현재 결과를 기준 포지션/거래로 저장 (의도한 엔진 변경 후)")
+    parser.add_argument('--no-memory', action='store_true', help="메모리 측정 생략 (단계 재실행 없음)")
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print(f"🧪 Phase 1.3 패리티 벤치마크 (엔진 {ENGINE_VERSION})")
+    print("=" * 80)
+    
+    if not Path(args.candles).exists():
+        print(f"❌ 캔들 파일이 없습니다: {args.candles}")
+        print("   --candles 또는 PARITY_CANDLES 환경 변수로 1시간봉 CSV 를 지정하세요")
+        return 2
+    
+    engine = BacktestEngine(fee_rate=args.fee_rate)
+    timings = {}
+    
+    print(f"\n📁 캔들: {args.candles}")
+    memory = not args.no_memory
+    candles = run_stage(timings, 'load', lambda: load_candles(args.candles), memory)
+    indicators = run_stage(timings, 'indicators', lambda: engine.compute_indicators(candles), memory)
+    signals = run_stage(timings, 'signals', lambda: engine.generate_signals(indicators), memory)
+    trades, positions = run_stage(
+        timings, 'trades', lambda: engine.simulate_trades(indicators, signals), memory
+    )
+    run_stage(timings, 'analytics', lambda: analyze_journal(positions), memory)
+    
+    fixture = is_fixture(args.candles)
+    if args.update_reference:
+        if not fixture:
+            print("❌ --update-reference 는 픽스처 캔들에서만 사용할 수 있습니다 (phase1.3 결과는 고정)")
+            return 2
+        trades_path, positions_path = reference_paths('fixture')
+        trades.to_csv(trades_path, index=False)
+        positions.to_csv(positions_path, index=False)
+        print(f"\n💾 픽스처 기준 저장: {trades_path.name}, {positions_path.name}")
+    
+    failures = []
+    for split in (('fixture',) if fixture else SPLITS):
+        failures += compare_split(split, positions, trades, args)
+    
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps({
+            'engine_version': ENGINE_VERSION,
+            'candles': Path(args.candles).name,
+            'stages': timings
+        }, indent=2))
+        print(f"\n💾 성능 기준 저장: {BASELINE_PATH}")
+    elif BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text())
+        if baseline.get('candles') == Path(args.candles).name:
+            failures += compare_performance(timings, baseline.get('stages', {}), args.perf_threshold)
+        else:
+            print(f"\n⚠️  성능 기준은 {baseline.get('candles')} 기준이라 비교하지 않습니다 (--update-baseline 으로 갱신)")
+    else:
+        print("\n⚠️  성능 기준 없음 (--update-baseline 으로 생성)")
+    
+    print("\n" + "=" * 80)
+    if failures:
+        print("❌ 회귀 발견:")
+        for failure in failures:
+            print(f"   - {failure}")
+        print("=" * 80)
+        return 1
+    
+    print("✅ 동작/성능 회귀 없음")
+    print("=" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
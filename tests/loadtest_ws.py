@@ -0,0 +1,328 @@
+# loadtest_ws.py - /ws/logs, /ws/trading 부하 테스트 (단일 리눅스 머신, 헤드리스)
+#
+# 로컬 앱 인스턴스를 서브프로세스로 띄우고 (합성 로그/브로드캐스트 발생 태스크 포함),
+# 비동기 클라이언트 수천 개를 접속시켜 다음을 측정합니다.
+#     - 연결 수립 시간 (/ws/trading 은 client_id 수신까지)
+#     - 전달 지연 p50/p95/p99 (서버가 메시지에 넣은 발생 시각 기준, 같은 머신이라 시계 공유)
+#     - 누락 메시지 (발생 번호의 빈틈) 와 ping/pong 왕복 시간
+#     - 서버 RSS (0.5초 간격 샘플링, psutil)
+# 클라이언트도 같은 머신의 단일 이벤트 루프에서 돌기 때문에 지연에는 클라이언트 처리 시간이 포함됩니다.
+#
+# 사용법:
+#     python -m tests.loadtest_ws --log-clients 1000 --trading-clients 1000 --duration 30
+#     python -m tests.loadtest_ws --log-rate 200 --broadcast-rate 50 --encoding msgpack
+#     python -m tests.loadtest_ws --url ws://127.0.0.1:8000 --no-spawn   # 이미 실행 중인 서버 (합성 트래픽 없음)
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import psutil
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+LOAD_TOPIC = "LOAD.tick"
+LOG_PREFIX = "loadtest"
+
+
+# ----------------------------------------------------------------------
+# 서버 측 (--serve): 앱 + 합성 트래픽
+# ----------------------------------------------------------------------
+
+def serve(args):
+    """앱을 실행하고 시작 시 합성 로그/브로드캐스트 발생 태스크를 붙임"""
+    import uvicorn
+    from app.main import app
+    from app.websocket.log_manager import log_manager
+    from app.websocket.connection_manager import manager
+
+    async def generate(rate, emit):
+        if rate <= 0:
+            return
+        interval = 1.0 / rate
+        n = 0
+        next_at = time.perf_counter()
+        while True:
+            n += 1
+            await emit(n)
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+    async def emit_log(n):
+        log_manager.submit(f"{LOG_PREFIX} {n} {time.time():.6f}")
+
+    async def emit_broadcast(n):
+        await manager.broadcast(LOAD_TOPIC, {"n": n, "t": time.time()})
+
+    @app.on_event("startup")
+    async def start_generators():
+        asyncio.create_task(generate(args.log_rate, emit_log))
+        asyncio.create_task(generate(args.broadcast_rate, emit_broadcast))
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning",
+                ws_per_message_deflate=args.deflate, backlog=4096)
+
+
+# ----------------------------------------------------------------------
+# 클라이언트 측
+# ----------------------------------------------------------------------
+
+class Stats:
+    def __init__(self):
+        self.setup = []
+        self.latency = {"logs": [], "trading": []}
+        self.pong = []
+        self.received = {"logs": 0, "trading": 0}
+        self.gaps = {"logs": 0, "trading": 0}
+        self.failed = 0
+        self.closed = 0
+        self.connected = 0
+
+
+def decode(raw):
+    if isinstance(raw, bytes):
+        import msgpack
+        return msgpack.unpackb(raw, raw=False)
+    return json.loads(raw)
+
+
+def log_records(message):
+    if message.get("type") == "log":
+        return [message]
+    if message.get("type") in ("log_batch", "log_replay"):
+        return message.get("logs", [])
+    return []
+
+
+async def run_client(kind, index, args, stats, stop):
+    import websockets
+
+    query = f"encoding={args.encoding}"
+    url = f"{args.url}/ws/logs?replay=0&{query}" if kind == "logs" else f"{args.url}/ws/trading?{query}"
+    started = time.perf_counter()
+    last_n = None
+    ping_sent = []
+
+    try:
+        async with websockets.connect(url, max_size=None, open_timeout=60,
+                                      compression="deflate" if args.deflate else None) as ws:
+            if kind == "trading":
+                decode(await ws.recv())  # client_id
+                await ws.send(json.dumps({"action": "subscribe", "symbol": LOAD_TOPIC}))
+            stats.setup.append(time.perf_counter() - started)
+            stats.connected += 1
+
+            async def pinger():
+                while True:
+                    await asyncio.sleep(args.ping_interval)
+                    ping_sent.append(time.perf_counter())
+                    await ws.send(json.dumps({"type": "ping"}))
+
+            ping_task = asyncio.create_task(pinger())
+            try:
+                while not stop.is_set():
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                    except asyncio.TimeoutError:
+                        continue
+                    now = time.time()
+                    message = decode(raw)
+
+                    if message.get("type") == "pong":
+                        if ping_sent:
+                            stats.pong.append(time.perf_counter() - ping_sent.pop(0))
+                        continue
+
+                    if kind == "logs":
+                        items = []
+                        for record in log_records(message):
+                            parts = record.get("message", "").split()
+                            if len(parts) == 3 and parts[0] == LOG_PREFIX:
+                                items.append((int(parts[1]), float(parts[2])))
+                    elif message.get("type") == "trading_update":
+                        data = message["data"]
+                        items = [(data["n"], data["t"])]
+                    else:
+                        items = []
+
+                    for n, sent_at in items:
+                        stats.received[kind] += 1
+                        stats.latency[kind].append(now - sent_at)
+                        if last_n is not None and n > last_n + 1:
+                            stats.gaps[kind] += n - last_n - 1
+                        last_n = n
+            finally:
+                ping_task.cancel()
+    except Exception:
+        if index == 0 or args.verbose:
+            import traceback
+            traceback.print_exc()
+        stats.failed += 1
+        return
+    stats.closed += 1
+
+
+async def sample_rss(pid, samples, stop):
+    try:
+        process = psutil.Process(pid)
+    except psutil.Error:
+        return
+    while not stop.is_set():
+        try:
+            samples.append(process.memory_info().rss)
+        except psutil.Error:
+            return
+        await asyncio.sleep(0.5)
+
+
+def percentiles(values, scale=1000.0):
+    if not values:
+        return "n/a"
+    arr = np.asarray(values) * scale
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return f"p50 {p50:8.2f}  p95 {p95:8.2f}  p99 {p99:8.2f}  max {arr.max():8.2f} ms"
+
+
+async def wait_for_server(url, timeout=30.0):
+    import websockets
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            async with websockets.connect(f"{url}/ws/logs?replay=0"):
+                return True
+        except Exception:
+            await asyncio.sleep(0.3)
+    return False
+
+
+async def main_async(args, server_pid):
+    stats = Stats()
+    stop = asyncio.Event()
+    rss = []
+
+    if not await wait_for_server(args.url):
+        print("❌ 서버에 연결할 수 없습니다")
+        return 1
+
+    rss_task = asyncio.create_task(sample_rss(server_pid, rss, stop)) if server_pid else None
+    rss_idle = psutil.Process(server_pid).memory_info().rss if server_pid else None
+
+    # 연결 폭주로 accept 대기열이 넘치지 않도록 ramp-up 단위로 접속
+    tasks = []
+    kinds = ["logs"] * args.log_clients + ["trading"] * args.trading_clients
+    ramp_started = time.perf_counter()
+    for i, kind in enumerate(kinds):
+        tasks.append(asyncio.create_task(run_client(kind, i, args, stats, stop)))
+        if (i + 1) % args.ramp_batch == 0:
+            await asyncio.sleep(args.ramp_delay)
+
+    while stats.connected + stats.failed < len(kinds) and time.perf_counter() - ramp_started < 120:
+        await asyncio.sleep(0.1)
+    ramp_time = time.perf_counter() - ramp_started
+
+    # 워밍업 이후 측정 구간만 집계
+    await asyncio.sleep(args.warmup)
+    for values in (stats.latency["logs"], stats.latency["trading"], stats.pong):
+        values.clear()
+    stats.received = {"logs": 0, "trading": 0}
+    stats.gaps = {"logs": 0, "trading": 0}
+
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if rss_task:
+        await rss_task
+
+    print("=" * 90)
+    print(f"🔌 WebSocket 부하 테스트 - logs {args.log_clients} / trading {args.trading_clients} 클라이언트, "
+          f"인코딩 {args.encoding}{' + deflate' if args.deflate else ''}")
+    print(f"   로그 {args.log_rate}/s, 브로드캐스트 {args.broadcast_rate}/s, 측정 {args.duration}s")
+    print("=" * 90)
+    print(f"연결: 성공 {stats.connected} / 실패 {stats.failed} (ramp-up {ramp_time:.1f}s)")
+    print(f"연결 수립:       {percentiles(stats.setup)}")
+    print(f"ping/pong RTT:   {percentiles(stats.pong)}")
+    for kind, rate, clients in (("logs", args.log_rate, args.log_clients),
+                                ("trading", args.broadcast_rate, args.trading_clients)):
+        if not clients:
+            continue
+        expected = int(rate * args.duration * clients)
+        print(f"{kind:<8} 지연:   {percentiles(stats.latency[kind])}")
+        print(f"{kind:<8} 수신 {stats.received[kind]:,} / 예상 약 {expected:,}, 누락(빈틈) {stats.gaps[kind]:,}")
+    if rss:
+        print(f"서버 RSS: 유휴 {rss_idle / 2**20:.1f} MB, 최대 {max(rss) / 2**20:.1f} MB "
+              f"(클라이언트당 약 {(max(rss) - rss_idle) / max(1, stats.connected) / 1024:.1f} KB)")
+    print("=" * 90)
+    return 0 if stats.failed == 0 else 1
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/ws/logs, /ws/trading 부하 테스트")
+    parser.add_argument('--log-clients', type=int, default=500)
+    parser.add_argument('--trading-clients', type=int, default=500)
+    parser.add_argument('--log-rate', type=float, default=50.0, help="초당 합성 로그 줄 수")
+    parser.add_argument('--broadcast-rate', type=float, default=20.0, help="초당 합성 브로드캐스트 수")
+    parser.add_argument('--duration', type=float, default=20.0, help="측정 시간 (초)")
+    parser.add_argument('--warmup', type=float, default=2.0, help="연결 완료 후 측정 전 대기 (초)")
+    parser.add_argument('--ping-interval', type=float, default=10.0)
+    parser.add_argument('--ramp-batch', type=int, default=100, help="한 번에 여는 연결 수")
+    parser.add_argument('--ramp-delay', type=float, default=0.05)
+    parser.add_argument('--encoding', default='json', choices=['json', 'msgpack', 'packed'])
+    parser.add_argument('--deflate', action='store_true', help="permessage-deflate 사용")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--url', default=None, help="대상 서버 (기본: 서브프로세스로 띄운 ws://127.0.0.1:PORT)")
+    parser.add_argument('--no-spawn', action='store_true', help="서버를 띄우지 않고 --url 대상 측정")
+    parser.add_argument('--server-pid', type=int, default=None, help="--no-spawn 시 RSS 를 측정할 서버 PID")
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return 0
+
+    args.url = args.url or f"ws://127.0.0.1:{args.port}"
+    limit = raise_fd_limit()
+    needed = args.log_clients + args.trading_clients
+    if limit < needed * 2 + 100:
+        print(f"⚠️  파일 디스크립터 한도 {limit} - 클라이언트+서버 소켓에 부족할 수 있습니다 (ulimit -n)")
+
+    server = None
+    server_pid = args.server_pid
+    if not args.no_spawn:
+        cmd = [sys.executable, "-m", "tests.loadtest_ws", "--serve", "--port", str(args.port),
+               "--log-rate", str(args.log_rate), "--broadcast-rate", str(args.broadcast_rate)]
+        if args.deflate:
+            cmd.append("--deflate")
+        server = subprocess.Popen(cmd, cwd=ROOT_DIR, env={**os.environ, "PYTHONUNBUFFERED": "1"})
+        server_pid = server.pid
+
+    try:
+        return asyncio.run(main_async(args, server_pid))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
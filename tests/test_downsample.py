@@ -0,0 +1,44 @@
+# test_downsample.py - 차트 다운샘플링 (app/analytics/downsample.py) 테스트
+#
+# 사용법:
+#     python -m pytest tests/test_downsample.py -q
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.analytics.downsample import SeriesPyramid, minmax_reduce
+
+
+def make_equity(n, seed=0):
+    rng = np.random.default_rng(seed)
+    times = np.arange(n, dtype=float)
+    equity = np.cumprod(1 + rng.normal(0, 0.002, n)) - 1
+    return np.column_stack([times, equity])
+
+
+def test_minmax_reduce_keeps_endpoints():
+    points = make_equity(10_007)
+    reduced = minmax_reduce(points, 100)
+    assert np.array_equal(reduced[0], points[0])
+    assert np.array_equal(reduced[-1], points[-1])
+    assert np.all(np.diff(reduced[:, 0]) > 0)
+
+
+def test_pyramid_levels_and_query_keep_endpoints():
+    points = make_equity(200_000)
+    pyramid = SeriesPyramid(points, kind="line")
+    for level in pyramid.levels:
+        assert np.array_equal(level[0], points[0])
+        assert np.array_equal(level[-1], points[-1])
+
+    result, level = pyramid.query(None, None, 1000)
+    assert level > 0
+    assert len(result) <= 1000
+    assert np.array_equal(result[0], points[0])
+    assert np.array_equal(result[-1], points[-1])